@@ -37,14 +37,17 @@ class BaseAgent(ABC):
     async def call_api(self, fn, *args, retries: int = 2, delay: float = 0.5):
         """
         공통 API 호출 유틸 (비동기 지원, 재시도 포함).
-        :param fn: 호출할 함수
+        동기 함수는 이벤트 루프를 막지 않도록 스레드에서 실행한다.
+        :param fn: 호출할 함수 (동기 함수 또는 코루틴 함수)
         :param args: 함수 인자들
         :param retries: 최대 재시도 횟수
         :param delay: 실패 시 대기 시간 (초)
         """
         for attempt in range(retries + 1):
             try:
-                return fn(*args)
+                if asyncio.iscoroutinefunction(fn):
+                    return await fn(*args)
+                return await asyncio.to_thread(fn, *args)
             except Exception as e:
                 logger.warning(f"[{self.name}] API 호출 실패 ({attempt + 1}/{retries}): {e}")
                 await asyncio.sleep(delay)
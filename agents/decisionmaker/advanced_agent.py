@@ -1,17 +1,17 @@
 from agents.base_agent import BaseAgent
 from datetime import datetime, timedelta
-from utils.cache_manager import CacheManager
-import yfinance as yf
+from utils.cache_manager import cache_manager
+from api.market_data import market_data
+from api.yfinance_api import history_store
+from core.history_store import adjust_ohlcv
 import pandas as pd
 import numpy as np
-import time
-import random
 
 
 class AdvancedAgent(BaseAgent):
     def __init__(self, test_mode=False):
         super().__init__("AdvancedAgent")
-        self.cache_manager = CacheManager()
+        self.cache_manager = cache_manager  # 프로세스 공용 캐시
         self.test_mode = test_mode
 
     async def handle(self, context: dict) -> dict:
@@ -19,14 +19,15 @@ class AdvancedAgent(BaseAgent):
         analysis_type = intent.get("type", "")
         symbols = self._get_filtered_symbols()
 
+        # 다운로드가 포함된 계산은 이벤트 루프 밖에서 실행
         if analysis_type == "correlation":
-            return self.calculate_correlation(symbols, intent.get("days", 60))
+            return await market_data.run(self.calculate_correlation, symbols, intent.get("days", 60))
         elif analysis_type == "volatility":
-            return self.calculate_volatility(symbols, intent.get("days", 60))
+            return await market_data.run(self.calculate_volatility, symbols, intent.get("days", 60))
         elif analysis_type == "momentum":
-            return self.calculate_momentum(symbols, intent.get("periods", [5, 10, 20]))
+            return await market_data.run(self.calculate_momentum, symbols, intent.get("periods", [5, 10, 20]))
         elif analysis_type == "portfolio":
-            return self.portfolio_optimization(symbols, intent.get("target_return", 0.1))
+            return await market_data.run(self.portfolio_optimization, symbols, intent.get("target_return", 0.1))
         else:
             return {
                 "success": False,
@@ -47,13 +48,12 @@ class AdvancedAgent(BaseAgent):
             end_date = datetime.today().date()
             start_date = end_date - timedelta(days=days + 50)
 
-            if not self.test_mode:
-                time.sleep(random.uniform(0.1, 0.3))
-
-            df = yf.download(symbol, start=start_date, end=end_date, progress=False)
+            # 일봉 저장소에서 읽음 (다른 분석·지표가 받아 둔 구간은 다시 받지 않음)
+            df = history_store.get_history(symbol, start_date, end_date)
             if df.empty:
                 return None
-            return df
+            # 수익률·변동성은 배당·액면분할이 반영된 수정주가로 계산
+            return adjust_ohlcv(df)
         except:
             return None
 
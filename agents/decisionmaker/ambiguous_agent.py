@@ -1,16 +1,16 @@
 import asyncio
-import time
-import random
 from datetime import datetime, timedelta
 from agents.base_agent import BaseAgent
-from utils.cache_manager import CacheManager
-import yfinance as yf
+from utils.cache_manager import cache_manager
+from api.market_data import market_data
+from api.yfinance_api import history_store
+from core.history_store import adjust_ohlcv
 
 
 class AmbiguousAgent(BaseAgent):
     def __init__(self, test_mode=False):
         super().__init__("AmbiguousAgent")
-        self.cache_manager = CacheManager()
+        self.cache_manager = cache_manager  # 프로세스 공용 캐시
         self.test_mode = test_mode
 
     async def handle(self, context: dict) -> dict:
@@ -32,6 +32,13 @@ class AmbiguousAgent(BaseAgent):
                 "message": "스크리닝 요청이 명확합니다."
             }
         
+        # 시장 전체 집계 질문도 모호하지 않음
+        if intent.get("task") == "market_overview":
+            return {
+                "clarification_needed": False,
+                "message": "시장 집계 요청이 명확합니다."
+            }
+
         # 특별한 패턴이 있는 경우만 모호함으로 판단
         ambiguous_patterns = [
             "어떤", "무엇", "어떻게", "어디", "언제", "누가",
@@ -66,11 +73,11 @@ class AmbiguousAgent(BaseAgent):
 
         symbols = self._get_filtered_symbols()
 
-        results = []
-        for symbol in symbols:
-            perf = self._calculate_recent_performance(symbol, days)
-            if perf and perf["performance"] >= threshold:
-                results.append(perf)
+        # 종목별 조회를 스레드 풀에서 동시에 실행
+        perfs = await asyncio.gather(*[
+            market_data.run(self._calculate_recent_performance, symbol, days) for symbol in symbols
+        ])
+        results = [perf for perf in perfs if perf and perf["performance"] >= threshold]
 
         results.sort(key=lambda x: x["performance"], reverse=True)
 
@@ -91,11 +98,10 @@ class AmbiguousAgent(BaseAgent):
 
         symbols = self._get_filtered_symbols()
 
-        results = []
-        for symbol in symbols:
-            drop = self._calculate_peak_drop(symbol, days)
-            if drop and drop["drop_ratio"] <= threshold:
-                results.append(drop)
+        drops = await asyncio.gather(*[
+            market_data.run(self._calculate_peak_drop, symbol, days) for symbol in symbols
+        ])
+        results = [drop for drop in drops if drop and drop["drop_ratio"] <= threshold]
 
         results.sort(key=lambda x: x["drop_ratio"])
 
@@ -124,12 +130,9 @@ class AmbiguousAgent(BaseAgent):
             if cached:
                 return cached
 
-            if not self.test_mode:
-                time.sleep(random.uniform(0.1, 0.3))
-
             end = datetime.today().date()
             start = end - timedelta(days=days + 10)
-            df = yf.download(symbol, start=start, end=end, progress=False)
+            df = adjust_ohlcv(history_store.get_history(symbol, start, end))
 
             if df.empty or len(df) < 2:
                 return None
@@ -158,12 +161,9 @@ class AmbiguousAgent(BaseAgent):
             if cached:
                 return cached
 
-            if not self.test_mode:
-                time.sleep(random.uniform(0.1, 0.3))
-
             end = datetime.today().date()
             start = end - timedelta(days=days + 30)
-            df = yf.download(symbol, start=start, end=end, progress=False)
+            df = adjust_ohlcv(history_store.get_history(symbol, start, end))
 
             if df.empty or len(df) < 10:
                 return None
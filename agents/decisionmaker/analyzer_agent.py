@@ -1,7 +1,9 @@
 from agents.base_agent import BaseAgent
 from datetime import datetime, timedelta
-import yfinance as yf
-from api.yfinance_api import get_price_data, get_volume_data, get_rsi_data
+from api.yfinance_api import get_volume_data, history_store, indicator_window
+from api.market_data import market_data
+from core.history_store import HistoryLoader
+from core.trading_calendar import krx_calendar
 
 class AnalyzerAgent(BaseAgent):
     def __init__(self):
@@ -26,7 +28,7 @@ class AnalyzerAgent(BaseAgent):
         # 1. 단순 주가 조회
         if intent.get("task") == "simple_inquiry":
             try:
-                price = get_price_data(yf_code, date)
+                price = await market_data.get_price(yf_code, date)
 
                 if price is None:
                     return {
@@ -52,7 +54,7 @@ class AnalyzerAgent(BaseAgent):
 
         # 2. RSI 판단
         elif "rsi" in condition:
-            rsi = get_rsi_data(yf_code, date)
+            rsi = await market_data.get_rsi(yf_code, date)
             if rsi is None:
                 return {
                     "judgment": None,
@@ -74,9 +76,8 @@ class AnalyzerAgent(BaseAgent):
 
         # 3. 거래량 변화율 판단
         elif "volume_change" in condition:
-            today_volume = get_volume_data(yf_code, date)
             yesterday = self.get_previous_date(date)
-            y_volume = get_volume_data(yf_code, yesterday)
+            y_volume, today_volume = await market_data.run(self._load_volume_pair, yf_code, yesterday, date)
 
             if today_volume is None or y_volume is None or y_volume == 0:
                 return {
@@ -107,7 +108,20 @@ class AnalyzerAgent(BaseAgent):
             "explanation": "지원하지 않는 조건입니다."
         }
 
+    def _load_volume_pair(self, yf_code: str, prev_date: str, date: str) -> tuple:
+        """인접한 두 날짜의 거래량을 한 번의 일봉 조회로 가져옴"""
+        loader = HistoryLoader(history_store)
+        loader.require(yf_code, *indicator_window("volume", prev_date))
+        loader.require(yf_code, *indicator_window("volume", date))
+
+        return (
+            get_volume_data(yf_code, prev_date, loader=loader),
+            get_volume_data(yf_code, date, loader=loader)
+        )
+
     def get_previous_date(self, date_str: str) -> str:
-        d = datetime.strptime(date_str, "%Y-%m-%d")
-        prev = d - timedelta(days=1)
+        """지정일(휴장일이면 다음 거래일)의 직전 거래일"""
+        d = datetime.strptime(date_str, "%Y-%m-%d").date()
+        current = krx_calendar.next_trading_day(d, inclusive=True) or d
+        prev = krx_calendar.previous_trading_day(current) or (d - timedelta(days=1))
         return prev.strftime("%Y-%m-%d")
\ No newline at end of file
@@ -0,0 +1,106 @@
+from agents.base_agent import BaseAgent
+from api.market_data import market_data
+
+# 상위 N개 질문의 정렬 기준별 표시 이름과 단위
+SORT_LABELS = {
+    "change_pct": ("등락률", "%"),
+    "volume": ("거래량", "주"),
+    "close": ("종가", "원"),
+    "value": ("거래대금", "원"),
+}
+
+# (정렬 기준, 오름차순 여부)별 요약 문구
+SORT_PHRASES = {
+    ("change_pct", False): "상승률이 높은",
+    ("change_pct", True): "하락률이 높은",
+    ("volume", False): "거래량이 많은",
+    ("volume", True): "거래량이 적은",
+    ("close", False): "가격이 비싼",
+    ("close", True): "가격이 싼",
+    ("value", False): "거래대금이 많은",
+    ("value", True): "거래대금이 적은",
+}
+
+
+class MarketAgent(BaseAgent):
+    """
+    시장 전체 집계 질문 처리 에이전트.
+    상승/하락/거래 종목 수, 거래대금 합계, 상위 N개 종목을
+    일자별 전 종목 스냅샷 한 번의 배열 연산으로 계산한다 (종목별 조회 없음).
+    """
+
+    def __init__(self):
+        super().__init__("MarketAgent")
+
+    async def handle(self, context: dict) -> dict:
+        intent = context.get("intent", {})
+        if intent.get("task") != "market_overview":
+            return {}
+
+        date_str = intent.get("date")
+        if not date_str:
+            return {"error": "[MarketAgent] 날짜 정보가 없습니다."}
+
+        try:
+            snapshot = await market_data.get_market_snapshot(date_str)
+        except Exception as e:
+            return {"error": f"[MarketAgent] 스냅샷 조회 실패: {str(e)}"}
+
+        market = intent.get("market")
+        label = market or "전체 시장"
+        day = snapshot.date.strftime("%Y-%m-%d")
+
+        if len(snapshot) == 0:
+            return self._judgment(intent, day, None, f"{day} {label} 시세 데이터를 가져올 수 없습니다.")
+
+        metric = intent.get("metric")
+        if metric == "advancers":
+            count = snapshot.advancers(market)
+            return self._judgment(intent, day, count, f"{day} {label}에서 상승한 종목은 {count:,}개입니다.")
+
+        if metric == "decliners":
+            count = snapshot.decliners(market)
+            return self._judgment(intent, day, count, f"{day} {label}에서 하락한 종목은 {count:,}개입니다.")
+
+        if metric == "traded":
+            count = snapshot.traded(market)
+            return self._judgment(intent, day, count, f"{day} {label}에서 거래된 종목은 {count:,}개입니다.")
+
+        if metric == "total_value":
+            total = snapshot.total("value", market)
+            return self._judgment(
+                intent, day, total,
+                f"{day} {label} 거래대금은 약 {total / 1e8:,.0f}억원입니다. (종가 x 거래량 기준)"
+            )
+
+        if metric == "top":
+            sort_by = intent.get("sort_by", "change_pct")
+            ascending = intent.get("ascending", False)
+            limit = intent.get("limit", 10)
+            rows = snapshot.top(sort_by, limit, market=market, ascending=ascending)
+
+            name, unit = SORT_LABELS.get(sort_by, (sort_by, ""))
+            lines = [
+                f"{i + 1}. {row['name']} ({row['code']}) - {name} {row[sort_by]:,.2f}{unit}"
+                if sort_by == "change_pct" else
+                f"{i + 1}. {row['name']} ({row['code']}) - {name} {row[sort_by]:,.0f}{unit}"
+                for i, row in enumerate(rows)
+            ]
+            phrase = SORT_PHRASES.get((sort_by, ascending), f"{name} 기준 상위")
+            summary = f"{day} {label}에서 {phrase} 종목 {len(rows)}개입니다."
+            return self._judgment(intent, day, rows, "\n".join([summary] + lines))
+
+        return {"error": f"[MarketAgent] 지원하지 않는 집계 유형입니다: {metric}"}
+
+    def _judgment(self, intent: dict, day: str, value, explanation: str) -> dict:
+        return {
+            "judgment": {
+                "judgment_type": "market",
+                "metric": intent.get("metric"),
+                "market": intent.get("market"),
+                "date": day,
+                "value": value,
+                "explanation": explanation
+            },
+            "confidence": 0.95 if value is not None else 0.0
+        }
@@ -1,15 +1,17 @@
-import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from agents.base_agent import BaseAgent
-from api.yfinance_api import get_bulk_volume_parallel, get_bulk_rsi_parallel
+from core.symbol_master import symbol_master
+from api.market_data import market_data
+from api.yfinance_api import indicator_window
+from core.ranking import top_n
+from core.trading_calendar import krx_calendar
 import re
 
 
 class ScreeningAgent(BaseAgent):
     def __init__(self):
         super().__init__("ScreeningAgent")
-        self.krx_path = "data/krx_stocks.csv"
         self.market_suffix = ".KS"
 
     async def handle(self, context: dict) -> dict:
@@ -26,7 +28,9 @@ class ScreeningAgent(BaseAgent):
                 date = datetime.strptime(date_range["to"], "%Y-%m-%d").date()
             else:
                 date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                prev_date = date - timedelta(days=1)
+                # 지정일(휴장일이면 다음 거래일)의 직전 거래일과 비교
+                current = krx_calendar.next_trading_day(date, inclusive=True) or date
+                prev_date = krx_calendar.previous_trading_day(current) or (date - timedelta(days=1))
             date_str = date.strftime("%Y-%m-%d")
 
             # 조건 파싱
@@ -39,62 +43,37 @@ class ScreeningAgent(BaseAgent):
                 return {"error": "거래량 변화 방향(up/down)이 명확하지 않습니다."}
 
             # 종목 리스트 불러오기
-            symbols, df_krx = self._get_filtered_symbols()
-
-            # 병렬 수집
-            volume_prev_map = get_bulk_volume_parallel(symbols, prev_date.strftime("%Y-%m-%d"), workers=3)
-            volume_curr_map = get_bulk_volume_parallel(symbols, date.strftime("%Y-%m-%d"), workers=3)
-            rsi_map = {}
-            if rsi_threshold:
-                rsi_map = get_bulk_rsi_parallel(symbols, date_str, workers=3)
+            symbols = self._get_filtered_symbols()
+
+            # 전 종목 일봉을 한 번에 읽어 거래량/RSI를 벡터 연산으로 계산
+            prev_date_str = prev_date.strftime("%Y-%m-%d")
+            start, end = indicator_window("rsi", date_str)
+            start = min(start, prev_date_str)
+            engine = await market_data.get_indicator_engine(symbols, start, end)
+            section = engine.cross_section(date_str, prev_date=prev_date_str)
+
+            # 조건을 만족하는 종목을 마스크로 거른 뒤 변화율 기준 정확한 상위 N개를 부분 정렬로 선택
+            pct_change = section["volume_change"]
+            with np.errstate(invalid="ignore"):
+                if volume_direction == "up":
+                    mask = pct_change >= volume_threshold * 100
+                else:
+                    mask = pct_change <= -volume_threshold * 100
+                if rsi_threshold:
+                    mask &= section["rsi"] >= rsi_threshold
 
             matched = []
-
-            def volume_screening(symbol):
-                try:
-                    code = symbol.replace(".KS", "")
-                    name = "Unknown"
-                    if not df_krx.empty:
-                        row = df_krx[df_krx["종목코드"] == code]
-                        if not row.empty:
-                            name = row.iloc[0]["회사명"]
-
-                    vol_prev = volume_prev_map.get(symbol)
-                    vol_curr = volume_curr_map.get(symbol)
-                    if vol_prev is None or vol_curr is None or vol_prev == 0:
-                        return None
-
-                    pct_change = ((vol_curr / vol_prev) - 1) * 100
-                    if (volume_direction == "up" and pct_change >= volume_threshold * 100) or \
-                       (volume_direction == "down" and pct_change <= -volume_threshold * 100):
-
-                        if rsi_threshold:
-                            rsi = rsi_map.get(symbol)
-                            if rsi is None or rsi < rsi_threshold:
-                                return None
-                        else:
-                            rsi = None
-
-                        return {
-                            "name": name,
-                            "code": code,
-                            "volume_yesterday": vol_prev,
-                            "volume_today": vol_curr,
-                            "change_ratio": round(pct_change, 2),
-                            **({"rsi": rsi} if rsi_threshold else {})
-                        }
-                    return None
-                except:
-                    return None
-
-            with ThreadPoolExecutor(max_workers=3) as executor:
-                futures = [executor.submit(volume_screening, sym) for sym in symbols]
-                for future in as_completed(futures):
-                    res = future.result()
-                    if res:
-                        matched.append(res)
-                        if len(matched) >= limit:
-                            break
+            for i in top_n(pct_change, limit, ascending=(volume_direction == "down"), mask=mask):
+                symbol = engine.matrix.symbols[i]
+                code = symbol.replace(".KS", "")
+                matched.append({
+                    "name": symbol_master.name(code) or "Unknown",
+                    "code": code,
+                    "volume_yesterday": int(section["prev_volume"][i]),
+                    "volume_today": int(section["volume"][i]),
+                    "change_ratio": round(float(pct_change[i]), 2),
+                    **({"rsi": float(section["rsi"][i])} if rsi_threshold else {})
+                })
 
             # 응답 구성
             direction_kor = "증가" if volume_direction == "up" else "감소"
@@ -118,28 +97,20 @@ class ScreeningAgent(BaseAgent):
         return float(numbers[0]) / 100 if numbers else 0.0
 
     def _get_filtered_symbols(self, limit_symbols=50):
-        try:
-            df_krx = pd.read_csv(self.krx_path, encoding="euc-kr")
-            df_krx = df_krx[~df_krx["회사명"].str.contains("스팩|리츠", na=False)]
-            df_krx["상장일"] = pd.to_datetime(df_krx["상장일"], errors="coerce")
-            df_krx = df_krx[df_krx["상장일"].dt.date < (datetime.now().date() - timedelta(days=90))]
-            df_krx["종목코드"] = df_krx["종목코드"].astype(str).str.zfill(6)
-            df_krx = df_krx[df_krx["종목코드"].str.match(r"^\d{6}$")]
-
-            stable_symbols = [
-                "005930", "000660", "035420", "051910", "006400",
-                "035720", "207940", "068270", "323410", "051900",
-                "006380", "017670", "015760", "028260", "032830",
-                "086790", "055550", "105560", "139480", "024110"
-            ]
-
-            df_filtered = df_krx[df_krx["종목코드"].isin(stable_symbols)]
-            symbols = [row["종목코드"] + self.market_suffix for _, row in df_filtered.iterrows()]
-            return symbols, df_filtered
-
-        except Exception as e:
-            default_symbols = [
+        # 프로세스 공용 종목 마스터에서 스팩·리츠와 상장 90일 미만 종목을 뺀 안정 종목 선택 (CSV는 다시 읽지 않음)
+        stable_symbols = [
+            "005930", "000660", "035420", "051910", "006400",
+            "035720", "207940", "068270", "323410", "051900",
+            "006380", "017670", "015760", "028260", "032830",
+            "086790", "055550", "105560", "139480", "024110"
+        ]
+        codes = symbol_master.select(
+            stable_symbols, exclude_names="스팩|리츠",
+            listed_before=datetime.now().date() - timedelta(days=90)
+        )
+        if not codes:
+            return [
                 "005930.KS", "000660.KS", "035420.KS", "051910.KS", "006400.KS",
                 "035720.KS", "207940.KS", "068270.KS", "323410.KS", "051900.KS"
             ]
-            return default_symbols, pd.DataFrame()
\ No newline at end of file
+        return [code + self.market_suffix for code in codes]
\ No newline at end of file
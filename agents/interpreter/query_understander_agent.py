@@ -1,5 +1,6 @@
 from agents.base_agent import BaseAgent
 from agents.interpreter.symbol_resolver_agent import SymbolResolverAgent
+from core.trading_calendar import krx_calendar
 from dateutil.relativedelta import relativedelta
 import re
 from datetime import datetime, timedelta
@@ -7,16 +8,14 @@ from datetime import datetime, timedelta
 class QueryUnderstanderAgent(BaseAgent):
     def __init__(self):
         super().__init__("QueryUnderstanderAgent")
+        self.symbol_resolver = SymbolResolverAgent()
 
     def get_most_recent_trading_day(self, reference: datetime = None) -> str:
         if reference is None:
             reference = datetime.today()
-        weekday = reference.weekday()
-        if weekday == 5:  # 토요일
-            reference -= timedelta(days=1)
-        elif weekday == 6:  # 일요일
-            reference -= timedelta(days=2)
-        return reference.strftime("%Y-%m-%d")
+        # 주말·휴장일이면 직전 거래일로
+        trading_day = krx_calendar.previous_trading_day(reference, inclusive=True) or reference
+        return trading_day.strftime("%Y-%m-%d")
 
     async def handle(self, context: dict) -> dict:
         text = context.get("query", "")
@@ -67,10 +66,17 @@ class QueryUnderstanderAgent(BaseAgent):
                 except ValueError:
                     pass
 
+        # 시장 전체 집계 질문은 종목 추출 없이 스냅샷 집계로 처리
+        market_query = self._parse_market_query(text)
+        if market_query:
+            result.update(market_query)
+            result["task"] = "market_overview"
+            context["intent"] = result
+            return result
+
         # 2. 종목 추출
         if not is_screening:
-            resolver = SymbolResolverAgent()
-            context = await resolver.handle(context)
+            context = await self.symbol_resolver.handle(context)
             result["symbol"] = context.get("symbol")
             symbol = context.get("symbol")
             
@@ -121,4 +127,45 @@ class QueryUnderstanderAgent(BaseAgent):
 
     def _is_screening_intent(self, text: str) -> bool:
         screening_patterns = ["이상", "미만", "상위", "하위", "증가", "급등", "종목", "퍼센트", "비율", "전날 대비", "조건", "검색"]
-        return any(kw in text for kw in screening_patterns)
\ No newline at end of file
+        return any(kw in text for kw in screening_patterns)
+
+    def _parse_market_query(self, text: str) -> dict:
+        """
+        시장 전체 집계 질문(상승/하락/거래 종목 수, 거래대금, 상위 N개) 해석
+        :return: {"metric", "market", ("sort_by", "ascending", "limit")} 또는 None
+        """
+        if "종목" not in text and "시장" not in text:
+            return None
+
+        upper = text.upper()
+        market = None
+        if "KOSDAQ" in upper or "코스닥" in text:
+            market = "KOSDAQ"
+        elif "KOSPI" in upper or "코스피" in text:
+            market = "KOSPI"
+
+        is_count = "몇" in text or "종목 수" in text
+        if is_count and "상승한 종목" in text:
+            return {"metric": "advancers", "market": market}
+        if is_count and "하락한 종목" in text:
+            return {"metric": "decliners", "market": market}
+        if is_count and "거래된 종목" in text:
+            return {"metric": "traded", "market": market}
+
+        top_patterns = [
+            (r"상승률\s*(이\s*)?높은", "change_pct", False),
+            (r"하락률\s*(이\s*)?높은", "change_pct", True),
+            (r"거래대금\s*(이\s*)?(가장\s*)?많은|거래대금\s*기준\s*상위", "value", False),
+            (r"거래량\s*(이\s*)?(가장\s*)?많은|거래량\s*기준\s*상위", "volume", False),
+            (r"가장\s*비싼", "close", False),
+        ]
+        for pattern, sort_by, ascending in top_patterns:
+            if re.search(pattern, text):
+                limit_match = re.search(r"(\d+)\s*개", text)
+                limit = int(limit_match.group(1)) if limit_match else (1 if "가장" in text else 10)
+                return {"metric": "top", "market": market, "sort_by": sort_by, "ascending": ascending, "limit": limit}
+
+        if "거래대금" in text and "종목" not in text:
+            return {"metric": "total_value", "market": market}
+
+        return None
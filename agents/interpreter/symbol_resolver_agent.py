@@ -1,37 +1,22 @@
 from agents.base_agent import BaseAgent
-import csv
-import os
+from core.symbol_master import symbol_master
 import difflib
 import re
 
-KRX_CSV_PATH = os.path.join(os.path.dirname(__file__), "../../data/krx_stocks.csv")
-
 class SymbolResolverAgent(BaseAgent):
     def __init__(self):
         super().__init__("SymbolResolverAgent")
-        self.symbol_map = {}
-        self._load_csv()
-
-    def _load_csv(self):
-        with open(KRX_CSV_PATH, newline="", encoding="euc-kr") as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                name = row["회사명"].strip()
-                code = row["종목코드"].zfill(6)
-                market = row.get("시장구분", "").strip()
+        self.symbols = symbol_master  # 프로세스 공용 종목 마스터 (CSV는 시작 시 한 번만 읽음)
 
-                yfsuffix = ".KQ" if market == "KOSDAQ" else ".KS"
-
-                self.symbol_map[name] = {
-                    "yfinance_code": code + yfsuffix
-                }
+    def _mapped(self, name: str) -> dict:
+        return {"yfinance_code": self.symbols.yfinance_code(self.symbols.code(name))}
 
     def resolve(self, name: str) -> dict:
         name = name.strip()
         if name.endswith("우선주"):
             name = name.replace("우선주", "우")
 
-        result = self.symbol_map.get(name)
+        result = self._mapped(name) if name in self.symbols.by_name else None
         if result:
             return result
         if not result:
@@ -40,9 +25,9 @@ class SymbolResolverAgent(BaseAgent):
                 "error": "종목코드 매핑 실패"
             }
 
-        candidates = difflib.get_close_matches(name, self.symbol_map.keys(), n=1, cutoff=0.7)
+        candidates = difflib.get_close_matches(name, self.symbols.by_name.keys(), n=1, cutoff=0.7)
         if candidates:
-            return self.symbol_map[candidates[0]]
+            return self._mapped(candidates[0])
 
         return {}
 
@@ -7,6 +7,7 @@ from agents.decisionmaker.ambiguous_agent import AmbiguousAgent
 from agents.decisionmaker.analyzer_agent import AnalyzerAgent
 from agents.decisionmaker.screener_agent import ScreeningAgent
 from agents.decisionmaker.signal_agent import SignalAgent
+from agents.decisionmaker.market_agent import MarketAgent
 from agents.responder.summarizer_agent import SummarizerAgent
 from utils.logger import logger
 
@@ -21,6 +22,7 @@ class Orchestrator:
             "screener": ScreeningAgent(),
             "signal": SignalAgent(),
             "advanced": AdvancedAgent(),
+            "market": MarketAgent(),
             "summarizer": SummarizerAgent()
         }
 
@@ -31,9 +33,13 @@ class Orchestrator:
             "screener",            # 조건 기반 필터링
             "signal",              # 기술적 신호 감지
             "advanced",            # 특화 기능 처리
+            "market",              # 시장 전체 집계 (전 종목 스냅샷)
             "summarizer"           # 자연어 응답 생성
         ]
 
+        # 시장 전체 집계 질문에서는 건너뛰는 종목별 조회 에이전트
+        self.per_symbol_agents = {"analyzer", "screener", "signal", "advanced"}
+
     async def async_run(self, query: str) -> dict:
         context = {
             "query": query,
@@ -46,6 +52,9 @@ class Orchestrator:
 
         try:
             for agent_name in self.pipeline:
+                if context["intent"].get("task") == "market_overview" and agent_name in self.per_symbol_agents:
+                    continue
+
                 agent = self.agents[agent_name]
                 logger.debug(f"[Orchestrator] {agent_name} 실행 시작")
 
@@ -63,6 +72,8 @@ class Orchestrator:
                             context["judgment"] = output.get("judgment")
                         elif agent_name == "advanced" and output.get("judgment"):
                             context["judgment"] = output.get("judgment")
+                        elif agent_name == "market" and output.get("judgment"):
+                            context["judgment"] = output.get("judgment")
 
                     if agent_name == "ambiguous" and output.get("clarification_needed"):
                         context["clarification_needed"] = True
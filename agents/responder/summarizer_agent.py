@@ -1,3 +1,4 @@
+import asyncio
 from agents.base_agent import BaseAgent
 from api.hyperclova_api import generate_answer
 
@@ -77,7 +78,8 @@ class SummarizerAgent(BaseAgent):
 
 위 내용을 사용자에게 금융 전문가처럼 정중하고 간결하게 설명해주세요."""
 
-        answer = generate_answer(prompt)
+        # HTTP 호출이 이벤트 루프를 막지 않도록 스레드에서 실행
+        answer = await asyncio.to_thread(generate_answer, prompt)
 
         return {
             "response": answer,
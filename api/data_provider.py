@@ -0,0 +1,257 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import pandas as pd
+
+from core.history_store import normalize_ohlcv, split_ohlcv
+from utils.metrics import metrics
+from utils.rate_limiter import yf_rate_limiter, is_throttle_error
+
+# 외부 공급자 호출 지연 (재시도와 레이트 리미터 대기 포함). outcome: ok / partial / empty / error
+UPSTREAM_FETCH_SECONDS = metrics.histogram(
+    "upstream_fetch_seconds", "Upstream market data download latency",
+    ("provider", "kind", "outcome")
+)
+
+
+# 다종목 요청에서 동시에 보내는 종목별 요청 수 (요청 속도는 전역 레이트 리미터가 제한)
+DOWNLOAD_THREADS = 8
+
+# 요청 제한이 아닌 오류를 다시 시도하기 전 대기 시간 (시도마다 배수로 늘림, 초)
+RETRY_DELAY_SECONDS = 1.0
+
+# yfinance가 데이터가 없는 종목에 남기는 메시지 (오류가 아니라 빈 응답으로 처리)
+NO_DATA_PATTERNS = ("possibly delisted", "no price data", "no data found", "no timezone found")
+
+
+def _is_no_data(error) -> bool:
+    message = str(error).lower()
+    return any(pattern in message for pattern in NO_DATA_PATTERNS)
+
+
+def _date_str(value) -> str:
+    return value.strftime("%Y-%m-%d") if hasattr(value, "strftime") else str(value)[:10]
+
+
+def _to_wide(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """종목별 프레임을 yf.download 다종목 응답과 같은 (Price, Ticker) 컬럼 형태로 합침"""
+    frames = {symbol: frame for symbol, frame in frames.items() if not frame.empty}
+    if not frames:
+        return pd.DataFrame()
+    wide = pd.concat(frames, axis=1).swaplevel(0, 1, axis=1)
+    wide.columns.names = ["Price", "Ticker"]
+    return wide
+
+
+class DataProvider(ABC):
+    """
+    일봉 OHLCV 공급자 공통 인터페이스.
+    download(symbol, ...)는 단일 레벨 컬럼 프레임을,
+    download([symbols], ...)는 (Price, Ticker) 컬럼 프레임을 반환한다 (end는 미포함).
+    데이터가 없으면 빈 프레임을 반환하고, 다운로드 자체가 실패하면 예외를 던진다.
+    다종목 요청에서 일부 종목만 실패하면 그 종목들을 attrs["failed"] (종목 → 사유)로 알린다.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def download(self, symbols, start, end) -> pd.DataFrame:
+        raise NotImplementedError(f"[{self.name}] download()를 구현해야 합니다.")
+
+
+class YFinanceProvider(DataProvider):
+    """Yahoo Finance 공급자 (전역 레이트 리미터 + 재시도)"""
+
+    name = "yfinance"
+
+    def __init__(self, max_retries: int = 3):
+        import yfinance as yf
+        self.yf = yf
+        self.max_retries = max_retries
+
+    def download(self, symbols, start, end) -> pd.DataFrame:
+        started = time.perf_counter()
+        kind = "batch" if isinstance(symbols, (list, tuple)) else "single"
+        outcome = "error"
+        try:
+            df = self._download_with_retries(symbols, start, end)
+            outcome = "partial" if df.attrs.get("failed") else "empty" if df.empty else "ok"
+            return df
+        finally:
+            UPSTREAM_FETCH_SECONDS.observe(time.perf_counter() - started, self.name, kind, outcome)
+
+    def _download_one(self, symbol: str, start, end) -> pd.DataFrame:
+        """
+        종목 하나의 일봉 요청 (yf.download가 종목마다 스레드에서 부르는 것과 같은 Ticker.history 호출).
+        yf.download와 달리 결과·오류를 모듈 전역(shared._DFS/_ERRORS)에 모으지 않아 여러 스레드에서 동시에 불러도 안전하다.
+        데이터가 없거나 요청이 실패하면 예외를 던진다.
+        """
+        yf_rate_limiter.acquire()
+        frame = self.yf.Ticker(symbol).history(start=_date_str(start), end=_date_str(end), auto_adjust=False,
+                                               actions=False, raise_errors=True)
+        return normalize_ohlcv(frame)
+
+    def _download_once(self, pending: List[str], start, end):
+        """
+        종목별 요청을 최대 DOWNLOAD_THREADS개씩 동시에 보냄 -> (종목별 프레임, 종목별 오류)
+        요청은 종목마다 하나씩 나가므로 리미터 토큰도 요청을 보낼 때 하나씩 받는다.
+        """
+        frames: Dict[str, pd.DataFrame] = {}
+        errors: Dict[str, Exception] = {}
+
+        def fetch(symbol: str):
+            try:
+                frame = self._download_one(symbol, start, end)
+            except Exception as e:
+                errors[symbol] = e
+                return
+            if not frame.empty:
+                frames[symbol] = frame
+
+        if len(pending) == 1:
+            fetch(pending[0])
+        else:
+            with ThreadPoolExecutor(max_workers=min(DOWNLOAD_THREADS, len(pending))) as executor:
+                list(executor.map(fetch, pending))
+        return frames, errors
+
+    def _download_with_retries(self, symbols, start, end) -> pd.DataFrame:
+        """
+        요청 제한·오류가 난 종목만 다시 받음 (요청 제한이면 리미터 백오프, 그 밖의 오류는 점점 길게 쉰 뒤).
+        끝까지 실패한 종목은 다종목 응답의 attrs["failed"]에 사유("throttled"/"error")와 함께 담아
+        데이터 없음과 구분한다. 단일 종목이 실패하면 예외를 던진다.
+        """
+        is_batch = isinstance(symbols, (list, tuple))
+        pending = list(symbols) if is_batch else [symbols]
+        frames: Dict[str, pd.DataFrame] = {}
+        failed: Dict[str, str] = {}
+        last_error = None
+
+        for attempt in range(self.max_retries):
+            fetched, errors = self._download_once(pending, start, end)
+            frames.update(fetched)
+
+            failed = {}
+            for symbol in pending:
+                error = errors.get(symbol)
+                if symbol in fetched or error is None or _is_no_data(error):
+                    continue
+                failed[symbol] = "throttled" if is_throttle_error(error) else "error"
+                last_error = error
+            if not failed:
+                yf_rate_limiter.report_success()
+                break
+
+            if "throttled" in failed.values():
+                # 요청 제한 → 리미터가 전체 요청을 잠시 멈추도록 백오프 (다음 acquire가 기다림)
+                yf_rate_limiter.report_throttled()
+            elif attempt < self.max_retries - 1:
+                time.sleep(RETRY_DELAY_SECONDS * (attempt + 1))
+            pending = list(failed)
+
+        if not is_batch:
+            if failed:
+                # 재시도를 모두 실패하면 빈 응답(데이터 없음)과 구분되도록 예외로 전달
+                raise RuntimeError(f"{symbols} 다운로드 실패 ({failed[symbols]}): {last_error}")
+            return frames.get(symbols, normalize_ohlcv(None))
+
+        wide = _to_wide(frames)
+        if failed:
+            wide.attrs["failed"] = failed
+        return wide
+
+
+class LocalProvider(DataProvider):
+    """
+    로컬 픽스처 공급자.
+    fixtures_dir/<종목코드>.csv 에 저장된 일봉을 네트워크 없이 돌려준다.
+    record=True면 upstream 공급자의 실제 응답을 받아 픽스처에 합쳐 기록한 뒤 돌려준다.
+    """
+
+    name = "local"
+
+    def __init__(self, fixtures_dir: str = "fixtures", upstream: DataProvider = None, record: bool = False):
+        """
+        :param fixtures_dir: 픽스처 디렉토리
+        :param upstream: 기록 모드에서 실제로 호출할 공급자
+        :param record: True면 upstream 응답을 픽스처에 기록
+        """
+        if record and upstream is None:
+            raise ValueError("기록 모드에는 upstream 공급자가 필요합니다.")
+        self.fixtures_dir = fixtures_dir
+        self.upstream = upstream
+        self.record = record
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+
+    def _fixture_path(self, symbol: str) -> str:
+        return os.path.join(self.fixtures_dir, f"{symbol}.csv")
+
+    def _load_fixture(self, symbol: str) -> pd.DataFrame:
+        with self._lock:
+            if symbol not in self._frames:
+                path = self._fixture_path(symbol)
+                if os.path.exists(path):
+                    self._frames[symbol] = pd.read_csv(path, index_col="Date", parse_dates=["Date"],
+                                                       float_precision="round_trip").sort_index()
+                else:
+                    self._frames[symbol] = pd.DataFrame()
+            return self._frames[symbol]
+
+    def _save_fixture(self, symbol: str, fetched: pd.DataFrame):
+        existing = self._load_fixture(symbol)
+        merged = pd.concat([existing, fetched]) if not existing.empty else fetched
+        merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+
+        path = self._fixture_path(symbol)
+        tmp_path = f"{path}.tmp"
+        merged.to_csv(tmp_path, index_label="Date")
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._frames[symbol] = merged
+
+    def _slice(self, symbol: str, start, end) -> pd.DataFrame:
+        frame = self._load_fixture(symbol)
+        if frame.empty:
+            return frame
+        lo = frame.index.searchsorted(pd.Timestamp(_date_str(start)), side="left")
+        hi = frame.index.searchsorted(pd.Timestamp(_date_str(end)), side="left")
+        return frame.iloc[lo:hi]
+
+    def download(self, symbols, start, end) -> pd.DataFrame:
+        is_batch = isinstance(symbols, (list, tuple))
+        symbol_list: List[str] = list(symbols) if is_batch else [symbols]
+
+        if self.record:
+            live = self.upstream.download(symbols, start, end)
+            for symbol, frame in split_ohlcv(live, symbol_list).items():
+                self._save_fixture(symbol, frame)
+
+        frames = {symbol: self._slice(symbol, start, end) for symbol in symbol_list}
+        return _to_wide(frames) if is_batch else frames[symbols]
+
+
+def create_data_provider(name: str = None) -> DataProvider:
+    """
+    설정에 맞는 공급자 생성
+    :param name: "yfinance"(기본), "local"(픽스처 재생), "record"(yfinance 응답을 픽스처에 기록)
+    """
+    name = (name or os.getenv("MARKET_DATA_PROVIDER", "yfinance")).lower()
+    fixtures_dir = os.getenv("MARKET_DATA_FIXTURES", "fixtures")
+
+    if name == "yfinance":
+        return YFinanceProvider()
+    if name == "local":
+        return LocalProvider(fixtures_dir)
+    if name == "record":
+        return LocalProvider(fixtures_dir, upstream=YFinanceProvider(), record=True)
+    raise ValueError(f"알 수 없는 데이터 공급자: {name}")
+
+
+# 전역 데이터 공급자 (MARKET_DATA_PROVIDER 환경변수로 선택)
+data_provider = create_data_provider()
@@ -0,0 +1,84 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from api.yfinance_api import (
+    get_price_data, get_volume_data, get_rsi_data, get_moving_average_data,
+    get_bulk_volume_parallel, get_bulk_rsi_parallel, get_bulk_moving_average_parallel,
+    build_indicator_engine, get_market_snapshot, history_store
+)
+from utils.single_flight import SingleFlight
+
+
+class AsyncMarketData:
+    """
+    비동기 시세 조회 계층.
+    yfinance 다운로드·파일 I/O 같은 블로킹 작업을 전용 스레드 풀에서 실행해
+    에이전트가 이벤트 루프를 막지 않고 await 할 수 있게 한다.
+    스레드 풀 크기가 동시에 실행되는 블로킹 작업 수의 상한이다.
+    같은 인자로 동시에 들어온 조회는 실행 중인 하나의 결과를 함께 기다린다 (single-flight).
+    """
+
+    def __init__(self, max_concurrency: int = 8):
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="market-data")
+        self._flights = SingleFlight()
+
+    async def run(self, fn, *args, **kwargs):
+        """임의의 블로킹 함수를 스레드 풀에서 실행하고 결과를 기다림"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def _shared(self, fn, *args, **kwargs):
+        """
+        같은 함수·인자로 실행 중인 조회가 있으면 그 결과를 함께 기다림
+        (요청별 loader가 주어진 호출은 요청마다 상태가 달라서 합치지 않음)
+        """
+        if kwargs.get("loader") is not None:
+            return await self.run(fn, *args, **kwargs)
+        key = (
+            fn,
+            tuple(tuple(arg) if isinstance(arg, list) else arg for arg in args),
+            tuple(sorted(kwargs.items())),
+        )
+        return await self._flights.do_async(key, self.run, fn, *args, **kwargs)
+
+    async def get_price(self, symbol: str, date: str, loader=None):
+        return await self._shared(get_price_data, symbol, date, loader=loader)
+
+    async def get_volume(self, symbol: str, date: str, loader=None):
+        return await self._shared(get_volume_data, symbol, date, loader=loader)
+
+    async def get_rsi(self, symbol: str, date: str, period: int = 14, loader=None):
+        return await self._shared(get_rsi_data, symbol, date, period, loader=loader)
+
+    async def get_moving_average(self, symbol: str, date: str, period: int = 50, loader=None):
+        return await self._shared(get_moving_average_data, symbol, date, period, loader=loader)
+
+    async def get_history(self, symbol: str, start: str, end: str):
+        return await self._shared(history_store.get_history, symbol, start, end)
+
+    async def get_history_many(self, symbols, start: str, end: str):
+        return await self._shared(history_store.get_history_many, symbols, start, end)
+
+    async def get_indicator_engine(self, symbols, start: str, end: str, workers: int = 3):
+        """종목 x 거래일 행렬 기반 지표 엔진 (IndicatorEngine)"""
+        return await self._shared(build_indicator_engine, symbols, start, end, workers=workers)
+
+    async def get_market_snapshot(self, date: str):
+        """지정일 전 종목 스냅샷 (MarketSnapshot)"""
+        return await self._shared(get_market_snapshot, date)
+
+    async def get_bulk_volume(self, symbols, date: str, workers: int = 3):
+        return await self._shared(get_bulk_volume_parallel, symbols, date, workers=workers)
+
+    async def get_bulk_rsi(self, symbols, date: str, period: int = 14, workers: int = 3):
+        return await self._shared(get_bulk_rsi_parallel, symbols, date, period, workers=workers)
+
+    async def get_bulk_moving_average(self, symbols, date: str, period: int = 50, workers: int = 3):
+        return await self._shared(get_bulk_moving_average_parallel, symbols, date, period=period, workers=workers)
+
+
+# 전역 비동기 시세 조회 인스턴스
+market_data = AsyncMarketData(max_concurrency=int(os.getenv("MARKET_DATA_CONCURRENCY", "8")))
@@ -1,130 +1,160 @@
-import yfinance as yf
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import time
-import random
-from utils.cache_manager import CacheManager
-
-# 전역 캐시 매니저 인스턴스
-cache_manager = CacheManager()
+from utils.cache_manager import cache_manager, HIT, MISS
+from api.data_provider import data_provider
+from core.history_store import HistoryStore, HistoryLoader
+from core.indicator_engine import IndicatorEngine, PriceMatrix
+from core.indicator_state import IndicatorStateStore
+from core.market_snapshot import MarketSnapshotStore, MarketSnapshot
+from core.trading_calendar import krx_calendar
+
+def nearest_bar_position(df: pd.DataFrame, target_date) -> int:
+    """
+    정렬된 DatetimeIndex에서 지정일 또는 그 이후 첫 봉의 위치를 이진 탐색으로 찾음 (없으면 None)
+    프레임 복사나 날짜 변환 없이 인덱스만 탐색한다.
+    """
+    pos = int(df.index.searchsorted(pd.Timestamp(target_date), side="left"))
+    return pos if pos < len(df) else None
 
 def get_nearest_trading_day_data(df: pd.DataFrame, target_date: str):
-    target = pd.to_datetime(target_date).date() 
-    df = df.copy()
-    df = df.reset_index()
-    df["Date"] = pd.to_datetime(df["Date"]).dt.date
-
-    future_dates = df[df["Date"] >= target]
-    if future_dates.empty:
+    pos = nearest_bar_position(df, target_date)
+    if pos is None:
         return None
-
-    return future_dates.iloc[0]
+    return df.iloc[pos]
 
 def get_nearest_trading_day(date: datetime.date) -> datetime.date:
-    while date.weekday() >= 5:
-        date -= timedelta(days=1)
-    return date
+    """지정일 당일 또는 그 이전 마지막 KRX 거래일 (주말·휴장일 제외)"""
+    return krx_calendar.previous_trading_day(date, inclusive=True) or date
 
-def safe_yf_download(symbol: str, start: str, end: str, max_retries: int = 3):
-    """안전한 YFinance 다운로드 with 재시도 로직"""
-    for attempt in range(max_retries):
-        try:
-            # API 리밋 방지를 위한 지연시간
-            time.sleep(random.uniform(0.1, 0.3))
-            df = yf.download(symbol, start=start, end=end, auto_adjust=False, progress=False, threads=False)
-            return df
-        except Exception as e:
-            if attempt < max_retries - 1:
-                # 재시도 전 더 긴 지연시간
-                time.sleep(random.uniform(1, 3))
-                continue
-            else:
-                return pd.DataFrame()
-    return pd.DataFrame()
+# 전역 일봉 저장소 인스턴스 (저장소에 없는 구간만 다운로드)
+history_store = HistoryStore(fetcher=data_provider.download, calendar=krx_calendar)
+
+# 지표 증분 상태 (확정 일봉이 저장될 때마다 O(1)로 갱신, 마지막 거래일 지표는 바로 조회)
+indicator_state = IndicatorStateStore(history_store)
+history_store.add_listener(indicator_state.advance)
+
+def invalidate_symbol(symbol: str):
+    """수정주가 반영 등으로 과거 일봉이 바뀐 종목의 캐시(영구 항목 포함)와 지표 상태를 다시 만들게 함"""
+    cache_manager.invalidate(symbol)
+    indicator_state.rebuild(symbol)
+
+# 저장된 확정 일봉이 다시 받은 값과 다르면 자동으로 무효화
+history_store.add_revision_listener(invalidate_symbol)
+
+# 일자별 전 종목 스냅샷 (시장 전체 집계·상위 N개 질문을 종목별 조회 없이 처리)
+market_snapshots = MarketSnapshotStore(history_store, calendar=krx_calendar)
+
+# 다종목 요청 한 번에 묶을 종목 수
+BULK_CHUNK_SIZE = 50
+
+def indicator_window(indicator: str, date_str: str, period: int = None) -> tuple:
+    """
+    지표 계산에 필요한 일봉 구간 [start, end) 반환
+    :param indicator: "price", "volume", "rsi", "moving_average" 중 하나
+    """
+    date = datetime.strptime(date_str, "%Y-%m-%d").date()
+    if indicator == "price":
+        start, end = date - timedelta(days=5), date + timedelta(days=5)
+    elif indicator == "volume":
+        start, end = date, date + timedelta(days=7)
+    elif indicator == "rsi":
+        start, end = date - timedelta(days=(period or 14) + 10), date + timedelta(days=7)
+    elif indicator == "moving_average":
+        start, end = date - timedelta(days=(period or 50) + 50), date + timedelta(days=10)
+    else:
+        raise ValueError(f"알 수 없는 지표: {indicator}")
+    return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+
+def _cache_negative(data_type: str, symbol: str, date_str: str, reason: str, window: tuple, **kwargs):
+    """
+    구간의 데이터 유무가 확정된 경우에만 음수 캐시에 기록
+    (다운로드 실패·요청 제한으로 비어 있는 구간이면 기록하지 않고 다음 요청에서 다시 받음)
+    """
+    if history_store.is_resolved(symbol, *window):
+        cache_manager.set_negative(data_type, symbol, date_str, reason, **kwargs)
+
+def load_history(symbol: str, start: str, end: str, loader: HistoryLoader = None) -> pd.DataFrame:
+    """요청 단위 로더가 있으면 로더에서, 없으면 전역 저장소에서 일봉을 읽음"""
+    if loader is not None:
+        return loader.load(symbol, start, end)
+    return history_store.get_history(symbol, start, end)
 
-def get_price_data(symbol: str, date_str: str) -> float:
+def get_price_data(symbol: str, date_str: str, loader: HistoryLoader = None) -> float:
     
-    target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-    start_date = (target_date - timedelta(days=5)).strftime("%Y-%m-%d")
-    end_date = (target_date + timedelta(days=5)).strftime("%Y-%m-%d")
+    start_date, end_date = indicator_window("price", date_str)
 
     try:
-        df = yf.download(symbol, start=start_date, end=end_date, auto_adjust=False, progress=False, threads=False)
+        df = load_history(symbol, start_date, end_date, loader)
         if df.empty:
             return None
 
-        df = df.reset_index()
-        df["Date"] = pd.to_datetime(df["Date"]).dt.date
-
-        future_dates = df[df["Date"] >= target_date]
-        if future_dates.empty:
+        pos = nearest_bar_position(df, date_str)
+        if pos is None:
             return None
 
-        row = future_dates.iloc[0]
-        return float(row["Close"])
+        return float(df["Close"].iat[pos])
 
     except Exception as e:
         return None
 
-def get_moving_average_data(symbol: str, date_str: str, period: int = 50) -> dict:
+def _moving_average_result(current_price: float, moving_average: float) -> dict:
+    """현재가와 이동평균으로 돌파율 결과 dict 구성"""
+    # 돌파율 계산
+    breakout_ratio = ((current_price - moving_average) / moving_average) * 100
+    
+    return {
+        'current_price': current_price,
+        'moving_average': moving_average,
+        'breakout_ratio': round(breakout_ratio, 2),
+        'is_breakout': breakout_ratio > 10  # 10% 이상 상향 돌파
+    }
+
+def _compute_moving_average(df: pd.DataFrame, date_str: str, period: int) -> tuple:
+    """
+    일봉에서 지정일(또는 이후 첫 거래일)까지의 period개 종가로 이동평균 결과 계산
+    :return: (결과 dict, None) 또는 (None, 음수 사유)
+    """
+    if df.empty or len(df) < period:
+        return None, "empty" if df.empty else "insufficient"
+    
+    # 지정된 날짜의 봉을 찾고 그 봉까지의 period개 종가만으로 이동평균 계산
+    pos = nearest_bar_position(df, date_str)
+    if pos is None or pos < period - 1:
+        return None, "no_bar" if pos is None else "insufficient"
+    
+    closes = df['Close'].to_numpy()
+    window = closes[pos - period + 1:pos + 1]
+    if np.isnan(window).any():
+        return None, "insufficient"
+    return _moving_average_result(float(closes[pos]), float(window.mean())), None
+
+def get_moving_average_data(symbol: str, date_str: str, period: int = 50, loader: HistoryLoader = None) -> dict:
     """
     지정된 날짜의 이동평균과 현재가를 계산
     """
     try:
         # 캐시에서 먼저 확인
-        cached_data = cache_manager.get("moving_average", symbol, date_str, period=period)
-        if cached_data is not None:
-            return cached_data
+        status, cached_data = cache_manager.lookup("moving_average", symbol, date_str, period=period)
+        if status != MISS:
+            return cached_data if status == HIT else None
         
-        date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        # 마지막 확정 거래일이면 증분 상태에서 바로 조회
+        state = indicator_state.lookup(symbol, date_str)
+        if state and state["sma"].get(period) is not None:
+            result = _moving_average_result(state["close"], state["sma"][period])
+            cache_manager.set("moving_average", symbol, date_str, result, period=period)
+            return result
         
-        # 이동평균 계산을 위한 충분한 데이터 수집 (period + 30일)
-        start_date = (date - timedelta(days=period + 50)).strftime("%Y-%m-%d")
-        end_date = (date + timedelta(days=10)).strftime("%Y-%m-%d")
+        # 이동평균 계산을 위한 충분한 데이터 수집 (period + 50일)
+        start_date, end_date = indicator_window("moving_average", date_str, period)
         
-        # API 리밋 방지를 위한 지연시간
-        time.sleep(random.uniform(0.2, 0.4))
-        
-        df = yf.download(symbol, start=start_date, end=end_date, auto_adjust=False, progress=False, threads=False)
-        
-        if df.empty or len(df) < period:
-            print(f"데이터 부족: {len(df)}행 (필요: {period}행)")
+        df = load_history(symbol, start_date, end_date, loader)
+        result, reason = _compute_moving_average(df, date_str, period)
+        if result is None:
+            _cache_negative("moving_average", symbol, date_str, reason, (start_date, end_date), period=period)
             return None
         
-        close_col = df['Close']
-        if isinstance(close_col, pd.DataFrame):
-            close_col = close_col.iloc[:, 0]
-        
-        # 이동평균 계산
-        df['MA'] = close_col.rolling(window=period).mean()
-        
-        # 지정된 날짜의 데이터 찾기
-        target_date = pd.to_datetime(date_str).date()
-        nearest_data = None
-        
-        for idx, row in df.iterrows():
-            if idx.date() >= target_date:
-                nearest_data = row
-                break
-        
-        if nearest_data is None or pd.isna(nearest_data['MA'].iloc[0]):
-            return None
-        
-        current_price = float(nearest_data['Close'].iloc[0])
-        moving_average = float(nearest_data['MA'].iloc[0])
-
-        
-        # 돌파율 계산
-        breakout_ratio = ((current_price - moving_average) / moving_average) * 100
-        
-        result = {
-            'current_price': current_price,
-            'moving_average': moving_average,
-            'breakout_ratio': round(breakout_ratio, 2),
-            'is_breakout': breakout_ratio > 10  # 10% 이상 상향 돌파
-        }
-        
         # 결과를 캐시에 저장
         cache_manager.set("moving_average", symbol, date_str, result, period=period)
         
@@ -134,46 +164,49 @@ def get_moving_average_data(symbol: str, date_str: str, period: int = 50) -> dic
         print(f"이동평균 계산 오류: {e}")
         return None
 
-def get_volume_data(symbol: str, date: str) -> int:
+def get_volume_data(symbol: str, date: str, loader: HistoryLoader = None) -> int:
     """
     지정된 날짜 또는 그 이후 가장 가까운 거래일의 거래량을 반환
     """
     try:
         # 캐시에서 먼저 확인
-        cached_data = cache_manager.get("volume", symbol, date)
-        if cached_data is not None:
-            return cached_data
+        status, cached_data = cache_manager.lookup("volume", symbol, date)
+        if status != MISS:
+            return cached_data if status == HIT else None
         
-        ticker = yf.Ticker(symbol)
-        end_date = (datetime.strptime(date, "%Y-%m-%d") + timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        # API 리밋 방지를 위한 지연시간
-        time.sleep(random.uniform(0.1, 0.2))
-        df = ticker.history(start=date, end=end_date)
+        start_date, end_date = indicator_window("volume", date)
+        df = load_history(symbol, start_date, end_date, loader)
 
         if df.empty:
+            _cache_negative("volume", symbol, date, "empty", (start_date, end_date))
             return None
 
-        nearest_row = get_nearest_trading_day_data(df, date)
-        if nearest_row is None:
+        pos = nearest_bar_position(df, date)
+        # 거래량이 비어 있는 봉(NaN)은 봉이 없는 것으로 처리
+        if pos is None or pd.isna(df["Volume"].iat[pos]):
+            _cache_negative("volume", symbol, date, "no_bar", (start_date, end_date))
             return None
 
-        result = int(nearest_row["Volume"])
+        result = int(df["Volume"].iat[pos])
         
         # 결과를 캐시에 저장
         cache_manager.set("volume", symbol, date, result)
         
         return result
     except Exception as e:
-        print(f"[ERROR] get_price_data() Exception: {e}", flush=True)
+        print(f"[ERROR] get_volume_data() Exception: {e}", flush=True)
         return None 
 
 def get_volume_change(symbol: str, prev_date: str, date: str) -> dict:
     """
     두 날짜의 거래량을 비교하여 변화율을 계산
     """
-    vol_prev = get_volume_data(symbol, prev_date)
-    vol_curr = get_volume_data(symbol, date)
+    loader = HistoryLoader(history_store)
+    loader.require(symbol, *indicator_window("volume", prev_date))
+    loader.require(symbol, *indicator_window("volume", date))
+
+    vol_prev = get_volume_data(symbol, prev_date, loader=loader)
+    vol_curr = get_volume_data(symbol, date, loader=loader)
 
     if vol_prev is None or vol_curr is None or vol_prev == 0:
         return {"error": "거래량 정보 부족"}
@@ -188,154 +221,165 @@ def get_volume_change(symbol: str, prev_date: str, date: str) -> dict:
     }    
 
 def get_bulk_volume_parallel(symbols, target_date, workers=10):
-    """API 리밋을 고려한 안전한 병렬 처리"""
+    """캐시에 없는 종목만 다종목 요청으로 묶어서 거래량 조회"""
     start = (datetime.strptime(target_date, "%Y-%m-%d") - timedelta(days=2)).strftime("%Y-%m-%d")
     end = (datetime.strptime(target_date, "%Y-%m-%d") + timedelta(days=2)).strftime("%Y-%m-%d")
-    target_dt = datetime.strptime(target_date, "%Y-%m-%d").date()
+    # 캐시에서 먼저 한 번에 확인해 적중/음수/미적중으로 나눔
+    result, negatives = cache_manager.get_many("volume", symbols, target_date)
+    misses = [symbol for symbol in symbols if symbol not in result and symbol not in negatives]
 
-    result = {}
+    if not misses:
+        return result
 
-    def fetch(symbol):
+    frames = history_store.get_history_many(misses, start, end, chunk_size=BULK_CHUNK_SIZE, workers=workers)
+    volumes, missing = {}, {}
+    for symbol, df in frames.items():
         try:
-            # 캐시에서 먼저 확인
-            cached_data = cache_manager.get("volume", symbol, target_date)
-            if cached_data is not None:
-                return symbol, cached_data
-            
-            # API 리밋 방지를 위한 지연시간
-            time.sleep(random.uniform(0.2, 0.5))
-            df = safe_yf_download(symbol, start, end)
             if df.empty or "Volume" not in df:
-                return symbol, None
-            df = df.reset_index()
-            df["Date"] = pd.to_datetime(df["Date"]).dt.date
-            nearest = df[df["Date"] >= target_dt]
-            if nearest.empty:
-                return symbol, None
-            
-            volume = int(nearest.iloc[0]["Volume"].item())
-            
-            # 결과를 캐시에 저장
-            cache_manager.set("volume", symbol, target_date, volume)
-            
-            return symbol, volume
-        except Exception as e:
-            return symbol, None
-
-    # 워커 수를 줄여서 API 리밋 방지
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = [executor.submit(fetch, symbol) for symbol in symbols]
-        for future in as_completed(futures):
-            symbol, volume = future.result()
-            if volume is not None:
-                result[symbol] = volume
+                missing[symbol] = "empty"
+                continue
+            pos = nearest_bar_position(df, target_date)
+            if pos is None or pd.isna(df["Volume"].iat[pos]):
+                missing[symbol] = "no_bar"
+                continue
+
+            volumes[symbol] = int(df["Volume"].iat[pos])
+        except Exception:
+            continue
+
+    # 결과를 캐시에 한 번에 저장
+    cache_manager.set_many("volume", volumes, target_date)
+    # 다운로드가 실패한 종목은 데이터 없음으로 저장하지 않음
+    cache_manager.set_negative_many("volume", {
+        symbol: reason for symbol, reason in missing.items() if history_store.is_resolved(symbol, start, end)
+    }, target_date)
+    result.update(volumes)
 
     return result
 
 def get_bulk_moving_average_parallel(symbols, target_date: str, period=50, workers=5) -> dict:
-    """API 리밋을 고려한 안전한 이동평균 병렬 처리"""
-    result = {}
-
-    def fetch(symbol):
-        try:
-            # 캐시에서 먼저 확인
-            cached_data = cache_manager.get("moving_average", symbol, target_date, period=period)
-            if cached_data is not None:
-                return symbol, cached_data
-            
-            # API 리밋 방지를 위한 지연시간
-            time.sleep(random.uniform(0.5, 1.0))
-            ma_data = get_moving_average_data(symbol, target_date, period)
-            return symbol, ma_data
-        except Exception as e:
-            return symbol, None
-
-    # 워커 수를 줄여서 API 리밋 방지
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = [executor.submit(fetch, symbol) for symbol in symbols]
-        for future in as_completed(futures):
-            symbol, ma_data = future.result()
+    """캐시에 없는 종목만 다종목 요청으로 일봉을 받아 이동평균 계산"""
+    # 캐시에서 먼저 한 번에 확인해 적중/음수/미적중으로 나눔
+    result, negatives = cache_manager.get_many("moving_average", symbols, target_date, period=period)
+    computed, misses = {}, []
+    for symbol in dict.fromkeys(symbols):
+        if symbol in result or symbol in negatives:
+            continue
+
+        state = indicator_state.lookup(symbol, target_date)
+        if state and state["sma"].get(period) is not None:
+            computed[symbol] = _moving_average_result(state["close"], state["sma"][period])
+        else:
+            misses.append(symbol)
+
+    # 미적중 종목만 필요한 구간을 묶음 요청으로 저장소에 채운 뒤 받은 일봉으로 바로 계산 (캐시·상태를 다시 보지 않음)
+    missing = {}
+    if misses:
+        start, end = indicator_window("moving_average", target_date, period)
+        frames = history_store.get_history_many(misses, start, end, chunk_size=BULK_CHUNK_SIZE, workers=workers)
+        for symbol, df in frames.items():
+            ma_data, reason = _compute_moving_average(df, target_date, period)
             if ma_data is not None:
-                result[symbol] = ma_data
+                computed[symbol] = ma_data
+            elif history_store.is_resolved(symbol, start, end):
+                missing[symbol] = reason
+
+    cache_manager.set_many("moving_average", computed, target_date, period=period)
+    cache_manager.set_negative_many("moving_average", missing, target_date, period=period)
+    result.update(computed)
 
     return result
 
-def get_rsi_data(symbol: str, date: str, period: int = 14) -> float:
+def build_indicator_engine(symbols, start: str, end: str, workers: int = 3) -> IndicatorEngine:
+    """여러 종목의 [start, end) 일봉을 묶음 요청으로 읽어 종목 x 거래일 지표 엔진 생성"""
+    frames = history_store.get_history_many(symbols, start, end, chunk_size=BULK_CHUNK_SIZE, workers=workers)
+    return IndicatorEngine(PriceMatrix.from_frames(frames))
+
+def get_market_snapshot(date_str: str) -> MarketSnapshot:
+    """지정일(휴장일이면 다음 거래일)의 전 종목 스냅샷"""
+    return market_snapshots.get(date_str)
+
+def _compute_rsi(df: pd.DataFrame, date: str, period: int) -> tuple:
     """
-    지정된 날짜의 RSI 값을 계산
+    일봉에서 지정일(또는 이후 첫 거래일)까지의 period개 변화량으로 RSI 계산
+    :return: (RSI, None) 또는 (None, 음수 사유)
     """
-    try:
-        # 캐시에서 먼저 확인
-        cached_data = cache_manager.get("rsi", symbol, date, period=period)
-        if cached_data is not None:
-            return cached_data
-        
-        ticker = yf.Ticker(symbol)
-        end_date = (datetime.strptime(date, "%Y-%m-%d") + timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        # API 리밋 방지를 위한 지연시간
-        time.sleep(random.uniform(0.1, 0.2))
-        df = ticker.history(start=date, end=end_date)
+    if len(df) < period:
+        return None, "empty" if df.empty else "insufficient"
 
-        if df.empty:
-            return None
+    pos = nearest_bar_position(df, date)
+    if pos is None or pos < period:
+        return None, "no_bar" if pos is None else "insufficient"
 
-        nearest_row = get_nearest_trading_day_data(df, date)
-        if nearest_row is None:
-            return None
+    delta = np.diff(df['Close'].to_numpy()[pos - period:pos + 1])
+    avg_gain = delta[delta > 0].sum() / period
+    avg_loss = -delta[delta < 0].sum() / period
+    if np.isnan(delta).any() or (avg_gain == 0 and avg_loss == 0):
+        return None, "insufficient"
+    return (100.0 if avg_loss == 0 else float(100 - (100 / (1 + avg_gain / avg_loss)))), None
 
-        # RSI 계산을 위한 더 많은 데이터 필요
-        start_date = (datetime.strptime(date, "%Y-%m-%d") - timedelta(days=period + 10)).strftime("%Y-%m-%d")
-        time.sleep(random.uniform(0.1, 0.2))
-        df_rsi = ticker.history(start=start_date, end=end_date)
+def get_rsi_data(symbol: str, date: str, period: int = 14, loader: HistoryLoader = None) -> float:
+    """
+    지정된 날짜의 RSI 값을 계산
+    """
+    try:
+        # 캐시에서 먼저 확인
+        status, cached_data = cache_manager.lookup("rsi", symbol, date, period=period)
+        if status != MISS:
+            return cached_data if status == HIT else None
         
-        if len(df_rsi) < period:
-            return None
-
-        # RSI 계산
-        delta = df_rsi['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
+        # 마지막 확정 거래일이면 증분 상태에서 바로 조회
+        state = indicator_state.lookup(symbol, date)
+        if state and state["rsi"].get(period) is not None:
+            result = state["rsi"][period]
+            cache_manager.set("rsi", symbol, date, result, period=period)
+            return result
         
-        nearest_idx = df_rsi[df_rsi.index.date >= datetime.strptime(date, "%Y-%m-%d").date()].index
-        if len(nearest_idx) == 0:
+        # RSI 계산에 필요한 구간을 한 번에 읽음
+        start_date, end_date = indicator_window("rsi", date, period)
+        df_rsi = load_history(symbol, start_date, end_date, loader)
+        result, reason = _compute_rsi(df_rsi, date, period)
+        if result is None:
+            _cache_negative("rsi", symbol, date, reason, (start_date, end_date), period=period)
             return None
         
-        result = float(rsi.iloc[-1])
-        
         # 결과를 캐시에 저장
         cache_manager.set("rsi", symbol, date, result, period=period)
         
         return result
-    except Exception:
+    except Exception as e:
+        print(f"RSI 계산 오류: {e}")
         return None
 
 def get_bulk_rsi_parallel(symbols, target_date: str, period=14, workers=10) -> dict:
-    """API 리밋을 고려한 안전한 RSI 병렬 처리"""
-    result = {}
-
-    def fetch(symbol):
-        try:
-            # 캐시에서 먼저 확인
-            cached_data = cache_manager.get("rsi", symbol, target_date, period=period)
-            if cached_data is not None:
-                return symbol, cached_data
-            
-            # API 리밋 방지를 위한 지연시간
-            time.sleep(random.uniform(0.3, 0.6))
-            rsi = get_rsi_data(symbol, target_date, period)
-            return symbol, rsi
-        except Exception as e:
-            return symbol, None
-
-    # 워커 수를 줄여서 API 리밋 방지
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = [executor.submit(fetch, symbol) for symbol in symbols]
-        for future in as_completed(futures):
-            symbol, rsi = future.result()
+    """캐시에 없는 종목만 다종목 요청으로 일봉을 받아 RSI 계산"""
+    # 캐시에서 먼저 한 번에 확인해 적중/음수/미적중으로 나눔
+    result, negatives = cache_manager.get_many("rsi", symbols, target_date, period=period)
+    computed, misses = {}, []
+    for symbol in dict.fromkeys(symbols):
+        if symbol in result or symbol in negatives:
+            continue
+
+        state = indicator_state.lookup(symbol, target_date)
+        if state and state["rsi"].get(period) is not None:
+            computed[symbol] = state["rsi"][period]
+        else:
+            misses.append(symbol)
+
+    # 미적중 종목만 필요한 구간을 묶음 요청으로 저장소에 채운 뒤 받은 일봉으로 바로 계산 (캐시·상태를 다시 보지 않음)
+    missing = {}
+    if misses:
+        start, end = indicator_window("rsi", target_date, period)
+        frames = history_store.get_history_many(misses, start, end, chunk_size=BULK_CHUNK_SIZE, workers=workers)
+        for symbol, df in frames.items():
+            rsi, reason = _compute_rsi(df, target_date, period)
             if rsi is not None:
-                result[symbol] = rsi
+                computed[symbol] = rsi
+            elif history_store.is_resolved(symbol, start, end):
+                missing[symbol] = reason
 
-    return result
\ No newline at end of file
+    cache_manager.set_many("rsi", computed, target_date, period=period)
+    cache_manager.set_negative_many("rsi", missing, target_date, period=period)
+    result.update(computed)
+
+    return result
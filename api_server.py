@@ -14,7 +14,7 @@ from pydantic import BaseModel, Field
 # FastAPI 관련 import
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import uvicorn
 
 # 프로젝트 루트를 Python 경로에 추가
@@ -22,6 +22,8 @@ sys.path.append(str(Path(__file__).parent))
 
 from agents.orchestrator import Orchestrator
 from utils.logger import logger
+from utils.cache_manager import cache_manager
+from utils.metrics import metrics
 
 # Pydantic 모델 정의
 class QueryRequest(BaseModel):
@@ -166,8 +168,8 @@ async def process_query_sync(request: QueryRequest):
     start_time = time.time()
     
     try:
-        # 동기 방식으로 질의 처리
-        result = financial_system.run(request.query)
+        # 동기 방식으로 질의 처리 (별도 스레드의 이벤트 루프에서 실행해 서버 루프를 막지 않음)
+        result = await asyncio.to_thread(financial_system.run, request.query)
         
         processing_time = time.time() - start_time
         
@@ -201,13 +203,22 @@ async def get_stats():
         raise HTTPException(status_code=503, detail="서버가 초기화되지 않았습니다.")
     
     uptime = time.time() - start_time
+    # 디스크 캐시 집계는 SQLite/파일을 읽으므로 이벤트 루프 밖에서 실행
+    cache_stats = await asyncio.to_thread(cache_manager.stats)
     
     return {
         "uptime": uptime,
         "status": "running",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "cache": cache_stats,
+        "metrics": metrics.snapshot()
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus 수집용 지표 (텍스트 노출 형식, 워커 프로세스별 누적)"""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 if __name__ == "__main__":
     # 개발 서버 실행
     uvicorn.run(
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+KRX 전 종목 일봉 백필 엔트리포인트
+data/krx_stocks.csv의 모든 종목에 대해 최근 N년 일봉을 로컬 저장소(history/)에 미리 받아 둡니다.
+이미 받아 둔 구간은 건너뛰므로 중간에 멈춰도 다시 실행하면 이어서 진행합니다.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent))
+
+
+def _init_worker(parts: int):
+    """프로세스마다 전역 레이트 리미터 한도를 1/parts로 나눠 전체 요청 속도를 공유 한도 안으로 유지"""
+    from utils.rate_limiter import yf_rate_limiter
+    yf_rate_limiter.split(parts)
+
+
+def _backfill_chunk(codes: list, markets: dict, start: str, end: str) -> dict:
+    """
+    종목코드 묶음의 [start, end) 일봉을 저장소에 채움 (워커 프로세스에서 실행)
+    :return: 종목코드 → (시장, 일봉 수)
+    """
+    from api.yfinance_api import market_snapshots
+    frames = market_snapshots.fetch_universe(codes, start, end, dict(markets))
+    return {code: (market, len(frame)) for code, (market, frame) in frames.items()}
+
+
+def backfill(years: int = 5, workers: int = 4, chunk_size: int = 50, limit: int = None):
+    """
+    전 종목 일봉 백필
+    :param years: 받아 둘 기간 (년)
+    :param workers: 워커 프로세스 수
+    :param chunk_size: 워커에 한 번에 넘기는 종목 수 (다종목 요청 단위)
+    :param limit: 앞에서부터 limit개 종목만 처리 (벤치마크용)
+    """
+    from api.yfinance_api import history_store, market_snapshots
+    from core.market_snapshot import MARKET_SUFFIXES
+    from core.trading_calendar import kst_today
+
+    today = kst_today()
+    start = (today - timedelta(days=365 * years)).strftime("%Y-%m-%d")
+    end = (today + timedelta(days=1)).strftime("%Y-%m-%d")
+
+    universe = market_snapshots.load_universe()
+    markets = market_snapshots.load_markets(universe)
+    codes = sorted(universe)[:limit] if limit else sorted(universe)
+
+    # 시장을 알고 구간을 이미 다 받아 둔 종목은 건너뜀 (재실행 시 이어서 진행)
+    pending = [
+        code for code in codes
+        if code not in markets or not history_store.is_covered(code + MARKET_SUFFIXES[markets[code]], start, end)
+    ]
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+
+    print(f"백필 대상: {len(codes)}개 종목 ({start} ~ {today}), 이미 완료 {len(codes) - len(pending)}개")
+    print(f"처리할 종목 {len(pending)}개를 {len(chunks)}개 묶음으로 {workers}개 프로세스에서 처리합니다.")
+    if not chunks:
+        return
+
+    done, bars, failed, found = 0, 0, 0, 0
+    started = time.time()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(workers,)) as executor:
+        futures = {
+            executor.submit(_backfill_chunk, chunk, {c: markets[c] for c in chunk if c in markets}, start, end): chunk
+            for chunk in chunks
+        }
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += len(chunk)
+                print(f"묶음 처리 실패 ({chunk[0]} 외 {len(chunk) - 1}개): {e}")
+                result = {}
+
+            done += len(chunk)
+            found += len(result)
+            for code, (market, count) in result.items():
+                markets[code] = market
+                bars += count
+            # 확인된 시장은 바로 기록해 두어 중단 후 재실행 시 다시 탐색하지 않음
+            market_snapshots.save_markets(markets)
+
+            elapsed = max(time.time() - started, 1e-9)
+            print(f"[{done}/{len(pending)}] {done / len(pending) * 100:5.1f}% | "
+                  f"{done / elapsed:.1f} 종목/s | {bars / elapsed:,.0f} 봉/s | 실패 {failed}")
+
+    elapsed = time.time() - started
+    print(f"\n백필 완료:")
+    print(f"  - 데이터 있는 종목: {found}/{len(pending)}")
+    print(f"  - 일봉 수: {bars:,}")
+    print(f"  - 소요시간: {elapsed:.2f}초")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="KRX 전 종목 일봉 백필")
+    parser.add_argument("--years", "-y", type=int, default=5, help="받아 둘 기간 (년)")
+    parser.add_argument("--workers", "-w", type=int, default=4, help="워커 프로세스 수")
+    parser.add_argument("--chunk-size", type=int, default=50, help="묶음당 종목 수")
+    parser.add_argument("--limit", type=int, help="처리할 최대 종목 수 (벤치마크용)")
+    parser.add_argument("--provider", "-p", choices=["yfinance", "local", "record"],
+                        help="데이터 공급자 (기본값: MARKET_DATA_PROVIDER 환경변수)")
+
+    args = parser.parse_args()
+
+    # 공급자는 모듈을 불러오기 전에 정해야 워커 프로세스에도 같은 설정이 적용됨
+    if args.provider:
+        os.environ["MARKET_DATA_PROVIDER"] = args.provider
+
+    try:
+        backfill(years=args.years, workers=args.workers, chunk_size=args.chunk_size, limit=args.limit)
+    except KeyboardInterrupt:
+        print("\n백필을 중단합니다. 다시 실행하면 이어서 진행합니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,549 @@
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.cache_manager import NEGATIVE_TTL_HOURS
+from utils.single_flight import SingleFlight
+from core.trading_calendar import kst_today
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+def normalize_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """yfinance 응답을 단일 컬럼 레벨 + tz-naive 일자 인덱스 형태로 정리"""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+    df = df.copy()
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    df = df.loc[:, ~df.columns.duplicated()]
+
+    index = pd.to_datetime(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    df.index = index.normalize()
+    df.index.name = "Date"
+
+    columns = [col for col in OHLCV_COLUMNS if col in df.columns]
+    return df[columns]
+
+
+def adjust_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    저장된 원주가 일봉을 수정주가로 바꿈 (yf.download(auto_adjust=True)와 같은 값).
+    시가·고가·저가·종가에 Adj Close / Close 비율을 곱하고, Adj Close가 없거나 결측인 봉은 원주가를 그대로 둔다.
+    """
+    if "Adj Close" not in df.columns:
+        return df
+    df = df.copy()
+    ratio = (df["Adj Close"] / df["Close"]).astype(np.float64)
+    ratio = ratio.where(np.isfinite(ratio), 1.0)
+    for column in ("Open", "High", "Low", "Close"):
+        if column in df.columns:
+            df[column] = df[column] * ratio
+    return df.drop(columns="Adj Close")
+
+
+def split_ohlcv(df: pd.DataFrame, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """다종목 응답(Price x Ticker 컬럼)을 종목별 프레임으로 분리"""
+    if df is None or df.empty:
+        return {}
+
+    if not isinstance(df.columns, pd.MultiIndex):
+        return {symbols[0]: normalize_ohlcv(df)} if len(symbols) == 1 else {}
+
+    tickers = set(df.columns.get_level_values(-1))
+    frames = {}
+    for symbol in symbols:
+        if symbol not in tickers:
+            continue
+        frame = df.xs(symbol, axis=1, level=-1).dropna(how="all")
+        if not frame.empty:
+            frames[symbol] = normalize_ohlcv(frame)
+    return frames
+
+
+def _to_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+
+class HistoryStore:
+    """
+    종목별 일봉 OHLCV 로컬 저장소.
+    컬럼마다 하나의 .npy 파일로 저장하고 읽을 때는 memory-map으로 필요한 구간만 잘라낸다.
+    컬럼 파일은 쓸 때마다 새 버전 디렉토리(<종목>/v.../)에 모두 쓴 뒤 meta.json의 "data"를 바꿔 한 번에 공개하므로
+    읽는 쪽은 락 없이도 길이가 같은 컬럼 묶음을 본다. 읽기-병합-쓰기는 종목별 파일 락으로 프로세스 간에도 직렬화한다.
+    받아둔 구간은 meta.json에 구간 목록으로 기록하고, 요청 구간 중 어느 구간에도 없는 빈 구간만 받아서 합친다
+    (기간이 다른 지표가 같은 종목을 요청해도 일봉은 한 번만 받는다).
+    """
+
+    def __init__(self, fetcher: Callable[..., pd.DataFrame], store_dir: str = "history", calendar=None):
+        """
+        :param fetcher: (symbol 또는 symbol 리스트, start, end) -> DataFrame 형태의 다운로드 함수 (end는 미포함)
+        :param store_dir: 저장소 루트 디렉토리
+        :param calendar: 거래일 달력 (주어지면 거래일이 없는 구간은 받지 않고, 받을 구간도 거래일 범위로 좁힘)
+        """
+        self.fetcher = fetcher
+        self.store_dir = store_dir
+        self.calendar = calendar
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._listeners: List[Callable[[str], None]] = []
+        self._revision_listeners: List[Callable[[str], None]] = []
+        # 같은 (종목, 구간) 다운로드가 동시에 들어오면 한 번만 호출
+        self._flights = SingleFlight()
+        self._ensure_store_dir()
+
+    def add_listener(self, listener: Callable[[str], None]):
+        """새 일봉이 저장될 때마다 listener(symbol) 호출 (종목 락을 잡은 상태에서 실행)"""
+        self._listeners.append(listener)
+
+    def add_revision_listener(self, listener: Callable[[str], None]):
+        """
+        이미 저장된 확정 일봉 값이 새로 받은 값과 다를 때(수정주가 반영 등) listener(symbol) 호출.
+        add_listener의 리스너보다 먼저 실행한다.
+        """
+        self._revision_listeners.append(listener)
+
+    def _ensure_store_dir(self):
+        """저장소 디렉토리가 없으면 생성"""
+        if not os.path.exists(self.store_dir):
+            os.makedirs(self.store_dir)
+
+    def _symbol_dir(self, symbol: str) -> str:
+        return os.path.join(self.store_dir, symbol)
+
+    def _column_path(self, symbol: str, column: str, version: Optional[str] = None) -> str:
+        """컬럼 파일 경로 (version이 없으면 버전 디렉토리를 쓰기 전의 예전 배치)"""
+        base = os.path.join(self._symbol_dir(symbol), version) if version else self._symbol_dir(symbol)
+        return os.path.join(base, f"{column.replace(' ', '_')}.npy")
+
+    def _meta_path(self, symbol: str) -> str:
+        return os.path.join(self._symbol_dir(symbol), "meta.json")
+
+    def _symbol_lock(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            if symbol not in self._locks:
+                self._locks[symbol] = threading.Lock()
+            return self._locks[symbol]
+
+    @contextmanager
+    def _file_lock(self, symbol: str):
+        """
+        종목 디렉토리의 프로세스 간 배타 락 (서버 워커·backfill이 같은 종목을 동시에 병합하지 않도록).
+        같은 프로세스 안의 스레드는 _symbol_lock으로 먼저 직렬화한다.
+        """
+        os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self._symbol_dir(symbol), ".lock"), "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _read_meta(self, symbol: str) -> Optional[dict]:
+        try:
+            with open(self._meta_path(symbol), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _write_meta(self, symbol: str, meta: dict):
+        path = self._meta_path(symbol)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _write_version(self, symbol: str, frame: pd.DataFrame) -> str:
+        """컬럼을 모두 새 버전 디렉토리에 씀 (meta.json이 가리키기 전까지는 읽는 쪽에 보이지 않음)"""
+        version = f"v{time.time_ns()}.{os.getpid()}.{threading.get_ident()}"
+        os.makedirs(os.path.join(self._symbol_dir(symbol), version))
+        np.save(self._column_path(symbol, "Date", version), frame.index.values.astype("datetime64[D]"))
+        for column in frame.columns:
+            # 결측은 NaN 그대로 저장 (0으로 채우면 실제 0원 종가로 지표에 섞임)
+            np.save(self._column_path(symbol, column, version), frame[column].to_numpy(dtype=np.float64))
+        return version
+
+    def _remove_old_versions(self, symbol: str, keep: Tuple[Optional[str], ...]):
+        """
+        공개한 버전과 직전 버전만 남기고 정리 (직전 버전은 meta를 읽고 파일을 열기 직전인 읽기를 위해 남김).
+        예전 배치(종목 디렉토리 바로 아래)의 컬럼 파일도 지운다.
+        """
+        symbol_dir = self._symbol_dir(symbol)
+        for entry in os.scandir(symbol_dir):
+            if entry.is_dir() and entry.name.startswith("v") and entry.name not in keep:
+                shutil.rmtree(entry.path, ignore_errors=True)
+            elif entry.is_file() and entry.name.endswith(".npy") and None not in keep:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def segments(self, symbol: str) -> List[Tuple[date, date]]:
+        """저장된 구간 목록 [(start, end), ...] (시작일 순, 서로 겹치지 않음)"""
+        meta = self._read_meta(symbol)
+        if not meta:
+            return []
+        if "segments" in meta:
+            return [(_to_date(start), _to_date(end)) for start, end in meta["segments"]]
+        if "start" in meta:
+            # 구간 하나만 기록하던 예전 메타
+            return [(_to_date(meta["start"]), _to_date(meta["end"]))]
+        return []
+
+    def coverage(self, symbol: str) -> Optional[Tuple[date, date]]:
+        """저장된 구간 전체의 [처음, 끝) 반환 (사이에 빈 구간이 있을 수 있음), 없으면 None"""
+        segments = self.segments(symbol)
+        if not segments:
+            return None
+        return segments[0][0], segments[-1][1]
+
+    def negative_reason(self, symbol: str, fetch_start: date, fetch_end: date) -> Optional[str]:
+        """
+        [fetch_start, fetch_end) 구간이 최근에 데이터 없음으로 기록돼 있으면 사유 반환
+        (만료 전까지는 같은 구간을 다시 받지 않음)
+        """
+        meta = self._read_meta(symbol)
+        negative = (meta or {}).get("negative")
+        if not negative or datetime.fromisoformat(negative["expires"]) <= datetime.now():
+            return None
+        if _to_date(negative["start"]) <= fetch_start and fetch_end <= _to_date(negative["end"]):
+            return negative["reason"]
+        return None
+
+    def _record_negative(self, symbol: str, fetch_start: date, fetch_end: date, reason: str):
+        """데이터가 없던 구간을 사유·만료 시각과 함께 기록 (다음에 데이터를 받으면 _record_fetch가 지움)"""
+        expires = datetime.now() + timedelta(hours=NEGATIVE_TTL_HOURS.get(reason, 1))
+        with self._file_lock(symbol):
+            meta = self._read_meta(symbol) or {}
+            meta["negative"] = {
+                "start": fetch_start.strftime("%Y-%m-%d"),
+                "end": fetch_end.strftime("%Y-%m-%d"),
+                "reason": reason,
+                "expires": expires.isoformat()
+            }
+            self._write_meta(symbol, meta)
+
+    def _trim(self, start: date, end: date) -> Optional[Tuple[date, date]]:
+        """구간을 거래일 범위로 좁힘 (달력이 없으면 그대로, 거래일이 없으면 None)"""
+        if start >= end:
+            return None
+        if self.calendar is None:
+            return start, end
+        return self.calendar.trim(start, end)
+
+    def _missing_ranges(self, segments: List[Tuple[date, date]], start: date, end: date) -> List[Tuple[date, date]]:
+        """
+        요청 구간 중 저장된 구간들로 덮이지 않은 빈 구간 목록 (거래일 범위로 좁힘).
+        빈 구간마다 따로 받으므로 이미 받은 구간 사이를 다시 받지 않는다.
+        """
+        gaps = []
+        cursor = start
+        for segment_start, segment_end in segments:
+            if segment_end <= cursor:
+                continue
+            if segment_start >= end:
+                break
+            if segment_start > cursor:
+                gaps.append((cursor, segment_start))
+            cursor = max(cursor, segment_end)
+            if cursor >= end:
+                break
+        if cursor < end:
+            gaps.append((cursor, end))
+        return [trimmed for trimmed in (self._trim(*gap) for gap in gaps) if trimmed is not None]
+
+    def _add_segment(self, segments: List[Tuple[date, date]], start: date, end: date) -> List[Tuple[date, date]]:
+        """구간을 추가하고 겹치거나 맞닿은 구간(사이에 거래일이 없는 구간 포함)을 합침"""
+        merged: List[Tuple[date, date]] = []
+        for segment_start, segment_end in sorted(segments + [(start, end)]):
+            if merged and (segment_start <= merged[-1][1] or self._trim(merged[-1][1], segment_start) is None):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], segment_end))
+            else:
+                merged.append((segment_start, segment_end))
+        return merged
+
+    def _load_arrays(self, symbol: str, mmap: bool = True) -> Optional[Dict[str, np.ndarray]]:
+        """
+        meta.json이 가리키는 버전의 컬럼 배열을 모두 읽음.
+        읽는 사이 새 버전이 공개되고 예전 버전이 지워졌으면 meta를 다시 읽어 재시도한다.
+        """
+        mode = "r" if mmap else None
+        for _ in range(3):
+            version = (self._read_meta(symbol) or {}).get("data")
+            dates_path = self._column_path(symbol, "Date", version)
+            try:
+                arrays = {"Date": np.load(dates_path, mmap_mode=mode)}
+                for column in OHLCV_COLUMNS:
+                    path = self._column_path(symbol, column, version)
+                    if os.path.exists(path):
+                        arrays[column] = np.load(path, mmap_mode=mode)
+                return arrays
+            except FileNotFoundError:
+                if version is None and not os.path.exists(dates_path):
+                    return None
+        return None
+
+    def columns(self, symbol: str) -> Optional[Dict[str, np.ndarray]]:
+        """저장된 전체 컬럼 배열 (memory-map, 읽기 전용, 모든 컬럼이 같은 버전)"""
+        return self._load_arrays(symbol)
+
+    def _merge(self, symbol: str, fetched: pd.DataFrame) -> Tuple[pd.DataFrame, bool]:
+        """
+        새로 받은 봉을 기존 데이터와 합침 (같은 날짜는 새 값 우선)
+        :return: (합친 프레임, 겹치는 확정 일봉의 종가/거래량이 기존 값과 달랐는지 - 수정주가 반영 등)
+        """
+        existing = self._load_arrays(symbol, mmap=False)
+        revised = False
+        if existing is not None:
+            old = pd.DataFrame(
+                {col: values for col, values in existing.items() if col != "Date"},
+                index=pd.DatetimeIndex(existing["Date"].astype("datetime64[ns]"), name="Date")
+            )
+            revised = self._is_revised(old, fetched, self.segments(symbol))
+            merged = pd.concat([old, fetched])
+        else:
+            merged = fetched
+
+        merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+        return merged, revised
+
+    @staticmethod
+    def _is_revised(old: pd.DataFrame, fetched: pd.DataFrame, segments: List[Tuple[date, date]]) -> bool:
+        """
+        겹치는 확정 일봉의 종가/거래량 비교.
+        확정 구간(segments)에 기록된 봉만 비교한다. 장중에 받아 구간 밖에 저장된 당일 봉은
+        다음 날 확정 값으로 다시 받으면 당연히 달라지므로 수정으로 보지 않는다.
+        """
+        overlap = old.index.intersection(fetched.index)
+        settled = np.zeros(len(overlap), dtype=bool)
+        for start, end in segments:
+            settled |= (overlap >= pd.Timestamp(start)) & (overlap < pd.Timestamp(end))
+        overlap = overlap[settled]
+        if len(overlap) == 0:
+            return False
+        for column in ("Close", "Volume"):
+            if column not in old or column not in fetched:
+                continue
+            before = old.loc[overlap, column].to_numpy(dtype=np.float64)
+            after = fetched.loc[overlap, column].to_numpy(dtype=np.float64)
+            if not np.allclose(before, after, rtol=1e-6, atol=0, equal_nan=True):
+                return True
+        return False
+
+    def _read_frame(self, symbol: str, start: date, end: date) -> pd.DataFrame:
+        arrays = self._load_arrays(symbol)
+        if arrays is None:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        dates = arrays["Date"]
+        lo = int(np.searchsorted(dates, np.datetime64(start, "D"), side="left"))
+        hi = int(np.searchsorted(dates, np.datetime64(end, "D"), side="left"))
+
+        index = pd.DatetimeIndex(np.asarray(dates[lo:hi]).astype("datetime64[ns]"), name="Date")
+        data = {col: np.asarray(values[lo:hi]) for col, values in arrays.items() if col != "Date"}
+        return pd.DataFrame(data, index=index)
+
+    def _record_fetch(self, symbol: str, fetched: pd.DataFrame, fetch_start: date, fetch_end: date):
+        """
+        받은 봉을 저장하고 저장 구간을 넓힘.
+        당일 봉은 장중 변동이 있으므로 저장 구간은 오늘 이전까지만 확정으로 기록한다
+        (구간 밖에 저장된 봉은 임시 값이며 수정 판단과 증분 지표 상태에 쓰지 않는다).
+        """
+        if fetched.empty:
+            return
+
+        with self._file_lock(symbol):
+            # 다른 프로세스가 먼저 병합했을 수 있으므로 락 안에서 기존 데이터와 구간을 다시 읽음
+            merged, revised = self._merge(symbol, fetched)
+            previous = (self._read_meta(symbol) or {}).get("data")
+            version = self._write_version(symbol, merged)
+
+            segments = self.segments(symbol)
+            settled_end = min(fetch_end, kst_today())
+            if fetch_start < settled_end:
+                segments = self._add_segment(segments, fetch_start, settled_end)
+            meta = {
+                "data": version,
+                "segments": [[start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")] for start, end in segments],
+                "updated": datetime.now().isoformat()
+            }
+            if segments:
+                meta["start"], meta["end"] = meta["segments"][0][0], meta["segments"][-1][1]
+            # meta 교체가 곧 새 버전 공개 (모든 컬럼이 함께 바뀜)
+            self._write_meta(symbol, meta)
+            self._remove_old_versions(symbol, (version, previous))
+
+        listeners = (self._revision_listeners + self._listeners) if revised else self._listeners
+        for listener in listeners:
+            try:
+                listener(symbol)
+            except Exception as e:
+                print(f"일봉 저장 후처리 실패 ({symbol}): {e}")
+
+    def _fetch_and_record(self, symbols, fetch_start: date, fetch_end: date):
+        """
+        fetcher 한 번 호출 + 종목별 저장.
+        symbols가 문자열이면 호출한 쪽이 종목 락을 잡고 있고, 리스트면 종목마다 락을 잡고 저장한다.
+        """
+        try:
+            fetched = self.fetcher(symbols, fetch_start.strftime("%Y-%m-%d"), fetch_end.strftime("%Y-%m-%d"))
+        except Exception as e:
+            # 다운로드 실패·요청 제한은 데이터 없음이 아니므로 기록하지 않고 다음 요청에서 다시 받음
+            print(f"일봉 다운로드 실패 ({symbols if isinstance(symbols, str) else len(symbols)}): {e}")
+            return
+
+        # 응답에 없는 종목은 데이터 없음으로 기록해 만료 전까지 다시 요청하지 않음
+        if isinstance(symbols, str):
+            fetched = normalize_ohlcv(fetched)
+            if fetched.empty:
+                self._record_negative(symbols, fetch_start, fetch_end, "empty")
+            else:
+                self._record_fetch(symbols, fetched, fetch_start, fetch_end)
+            return
+
+        # 공급자가 실패로 알린 종목(요청 제한·오류)은 데이터 없음으로 기록하지 않음
+        failed = fetched.attrs.get("failed", {}) if fetched is not None else {}
+        if failed:
+            print(f"일봉 다운로드 실패 {len(failed)}개 종목 ({fetch_start} ~ {fetch_end}): {sorted(set(failed.values()))}")
+        frames = split_ohlcv(fetched, symbols)
+        for symbol in symbols:
+            with self._symbol_lock(symbol):
+                if symbol in frames:
+                    self._record_fetch(symbol, frames[symbol], fetch_start, fetch_end)
+                elif symbol not in failed:
+                    self._record_negative(symbol, fetch_start, fetch_end, "empty")
+
+    def _clamp_range(self, start, end) -> Tuple[date, date]:
+        start_d = _to_date(start)
+        end_d = min(_to_date(end), kst_today() + timedelta(days=1))
+        return start_d, end_d
+
+    def is_covered(self, symbol: str, start, end) -> bool:
+        """[start, end) 구간을 더 받을 필요 없이 저장소에서 바로 읽을 수 있는지"""
+        start_d, end_d = self._clamp_range(start, end)
+        return not self._missing_ranges(self.segments(symbol), start_d, end_d)
+
+    def is_resolved(self, symbol: str, start, end) -> bool:
+        """
+        [start, end) 구간의 데이터 유무가 확정됐는지 (모두 받았거나 데이터 없음으로 기록됨).
+        다운로드가 실패해 비어 있는 구간이 있으면 False (그 결과로 음수 캐시를 만들면 안 됨).
+        확정 전이라 구간에 기록하지 않는 당일 봉은 따지지 않는다.
+        """
+        start_d, end_d = self._clamp_range(start, end)
+        today = kst_today()
+        for gap in self._missing_ranges(self.segments(symbol), start_d, end_d):
+            if gap[0] < today and not self.negative_reason(symbol, *gap):
+                return False
+        return True
+
+    def get_history(self, symbol: str, start, end) -> pd.DataFrame:
+        """[start, end) 구간의 일봉 반환. 저장된 구간들 사이의 빈 구간만 fetcher로 받아 채운다."""
+        start_d, end_d = self._clamp_range(start, end)
+
+        for fetch_start, fetch_end in self._missing_ranges(self.segments(symbol), start_d, end_d):
+            if not self.negative_reason(symbol, fetch_start, fetch_end):
+                # 같은 종목·구간을 다른 요청이 받고 있으면 락을 기다리지 않고 그 다운로드를 함께 기다림
+                self._flights.do((symbol, fetch_start, fetch_end), self._fill_gap, symbol, fetch_start, fetch_end)
+
+        # 버전 디렉토리를 메타 교체로 공개하므로 읽기는 락 없이 한 시점의 데이터를 읽음
+        return self._read_frame(symbol, start_d, end_d)
+
+    def _fill_gap(self, symbol: str, fetch_start: date, fetch_end: date):
+        """종목 락을 잡고, 그 사이 다른 요청이 채우지 않은 부분만 받아 저장"""
+        with self._symbol_lock(symbol):
+            for gap_start, gap_end in self._missing_ranges(self.segments(symbol), fetch_start, fetch_end):
+                if not self.negative_reason(symbol, gap_start, gap_end):
+                    self._fetch_and_record(symbol, gap_start, gap_end)
+
+    def get_history_many(self, symbols: List[str], start, end, chunk_size: int = 50, workers: int = 1) -> Dict[str, pd.DataFrame]:
+        """
+        여러 종목의 [start, end) 구간 일봉을 한 번에 반환.
+        빈 구간이 같은 종목끼리 묶어 chunk_size 단위의 다종목 요청 한 번으로 받은 뒤 종목별로 나눠 저장한다.
+        """
+        start_d, end_d = self._clamp_range(start, end)
+
+        groups: Dict[Tuple[date, date], List[str]] = {}
+        for symbol in dict.fromkeys(symbols):
+            for missing in self._missing_ranges(self.segments(symbol), start_d, end_d):
+                if not self.negative_reason(symbol, *missing):
+                    groups.setdefault(missing, []).append(symbol)
+
+        jobs = [
+            (missing, group[i:i + chunk_size])
+            for missing, group in groups.items()
+            for i in range(0, len(group), chunk_size)
+        ]
+
+        def fetch_chunk(job):
+            (fetch_start, fetch_end), chunk = job
+            # 같은 묶음·구간을 다른 요청이 받고 있으면 그 다운로드를 함께 기다림
+            self._flights.do((tuple(chunk), fetch_start, fetch_end),
+                             self._fetch_and_record, chunk, fetch_start, fetch_end)
+
+        if jobs:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                list(executor.map(fetch_chunk, jobs))
+
+        return {symbol: self._read_frame(symbol, start_d, end_d) for symbol in symbols}
+
+
+class HistoryLoader:
+    """
+    요청 단위 일봉 로더.
+    종목별로 필요한 구간을 미리 모아 두었다가 가장 넓은 구간을 한 번만 읽고,
+    이후 가격/거래량/RSI/이동평균 계산은 그 프레임을 잘라서 사용한다.
+    """
+
+    def __init__(self, store: HistoryStore):
+        self.store = store
+        self._windows: Dict[str, Tuple[date, date]] = {}
+        self._frames: Dict[str, Tuple[date, date, pd.DataFrame]] = {}
+
+    def require(self, symbol: str, start, end):
+        """읽기 전에 필요한 구간을 등록 (여러 번 호출하면 구간이 합쳐짐)"""
+        start_d, end_d = _to_date(start), _to_date(end)
+        if symbol in self._windows:
+            old_start, old_end = self._windows[symbol]
+            start_d, end_d = min(old_start, start_d), max(old_end, end_d)
+        self._windows[symbol] = (start_d, end_d)
+
+    def load(self, symbol: str, start, end) -> pd.DataFrame:
+        """[start, end) 구간 반환. 이미 읽은 프레임이 구간을 덮으면 저장소를 다시 읽지 않음"""
+        start_d, end_d = _to_date(start), _to_date(end)
+        loaded = self._frames.get(symbol)
+
+        if loaded is None or start_d < loaded[0] or end_d > loaded[1]:
+            self.require(symbol, start_d, end_d)
+            window_start, window_end = self._windows[symbol]
+            frame = self.store.get_history(symbol, window_start, window_end)
+            loaded = (window_start, window_end, frame)
+            self._frames[symbol] = loaded
+
+        frame = loaded[2]
+        lo = frame.index.searchsorted(pd.Timestamp(start_d), side="left")
+        hi = frame.index.searchsorted(pd.Timestamp(end_d), side="left")
+        return frame.iloc[lo:hi]
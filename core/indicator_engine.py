@@ -0,0 +1,200 @@
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _to_datetime64(value) -> np.datetime64:
+    if isinstance(value, (date, datetime)):
+        return np.datetime64(value.strftime("%Y-%m-%d"), "D")
+    return np.datetime64(str(value)[:10], "D")
+
+
+def _shift(values: np.ndarray, lag: int) -> np.ndarray:
+    """시간축(axis=1)으로 lag만큼 밀어낸 배열 (앞쪽은 NaN)"""
+    shifted = np.full(values.shape, np.nan)
+    if lag < values.shape[1]:
+        shifted[:, lag:] = values[:, :-lag]
+    return shifted
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """종목 x 일자 행렬의 단순이동평균. 구간에 결측이 있으면 NaN"""
+    out = np.full(values.shape, np.nan)
+    if period <= 0 or values.shape[1] < period:
+        return out
+
+    valid = ~np.isnan(values)
+    csum = np.cumsum(np.where(valid, values, 0.0), axis=1)
+    ccount = np.cumsum(valid, axis=1)
+
+    window_sum = csum[:, period - 1:].copy()
+    window_sum[:, 1:] -= csum[:, :-period]
+    window_count = ccount[:, period - 1:].copy()
+    window_count[:, 1:] -= ccount[:, :-period]
+
+    out[:, period - 1:] = np.where(window_count == period, window_sum / period, np.nan)
+    return out
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """종목 x 일자 행렬의 지수이동평균. 첫 period일 SMA를 시작값으로 사용"""
+    out = np.full(values.shape, np.nan)
+    if period <= 0 or values.shape[1] < period:
+        return out
+
+    alpha = 2.0 / (period + 1)
+    current = sma(values[:, :period], period)[:, -1]
+    out[:, period - 1] = current
+    # 시간축으로만 반복하고 종목축은 한 번에 계산
+    for t in range(period, values.shape[1]):
+        current = alpha * values[:, t] + (1 - alpha) * current
+        out[:, t] = current
+    return out
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """종목 x 일자 행렬의 RSI (get_rsi_data와 같은 단순평균 방식)"""
+    delta = close - _shift(close, 1)
+    gain = np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0))
+    loss = np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = sma(gain, period) / sma(loss, period)
+        return 100 - (100 / (1 + rs))
+
+
+def returns(close: np.ndarray, lag: int = 1) -> np.ndarray:
+    """lag일 수익률 (%)"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (close / _shift(close, lag) - 1) * 100
+
+
+def volume_ratio(volume: np.ndarray, lag: int = 1) -> np.ndarray:
+    """lag일 전 대비 거래량 배율"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        previous = _shift(volume, lag)
+        return np.where(previous > 0, volume / previous, np.nan)
+
+
+class PriceMatrix:
+    """종목 x 거래일 2차원 종가/거래량 행렬 (결측은 NaN)"""
+
+    def __init__(self, symbols: List[str], dates: np.ndarray, close: np.ndarray, volume: np.ndarray):
+        self.symbols = list(symbols)
+        self.dates = dates
+        self.close = close
+        self.volume = volume
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> "PriceMatrix":
+        """종목별 일봉 프레임을 공통 거래일 축으로 정렬해 행렬 생성"""
+        symbols = [symbol for symbol, frame in frames.items() if frame is not None and not frame.empty]
+        if not symbols:
+            empty = np.empty((0, 0))
+            return cls([], np.array([], dtype="datetime64[D]"), empty, empty)
+
+        dates = np.unique(np.concatenate([
+            frames[symbol].index.values.astype("datetime64[D]") for symbol in symbols
+        ]))
+        close = np.full((len(symbols), len(dates)), np.nan)
+        volume = np.full((len(symbols), len(dates)), np.nan)
+
+        for i, symbol in enumerate(symbols):
+            frame = frames[symbol]
+            positions = np.searchsorted(dates, frame.index.values.astype("datetime64[D]"))
+            close[i, positions] = frame["Close"].to_numpy(dtype=np.float64)
+            if "Volume" in frame:
+                volume[i, positions] = frame["Volume"].to_numpy(dtype=np.float64)
+
+        return cls(symbols, dates, close, volume)
+
+
+class IndicatorEngine:
+    """
+    종목 x 거래일 행렬 위에서 RSI, SMA/EMA, 거래량 배율, 수익률을 전 종목 한 번에 계산하는 엔진.
+    종목별 값은 지정일 또는 그 이후 첫 거래일 기준으로 꺼낸다 (기존 단일 종목 함수와 동일한 규칙).
+    """
+
+    def __init__(self, matrix: PriceMatrix):
+        self.matrix = matrix
+        self._cache: Dict[tuple, np.ndarray] = {}
+
+    def _indicator(self, name: str, period: int) -> np.ndarray:
+        key = (name, period)
+        if key not in self._cache:
+            if name == "rsi":
+                self._cache[key] = rsi(self.matrix.close, period)
+            elif name == "sma":
+                self._cache[key] = sma(self.matrix.close, period)
+            elif name == "ema":
+                self._cache[key] = ema(self.matrix.close, period)
+            elif name == "return":
+                self._cache[key] = returns(self.matrix.close, period)
+            elif name == "volume_ratio":
+                self._cache[key] = volume_ratio(self.matrix.volume, period)
+            else:
+                raise ValueError(f"알 수 없는 지표: {name}")
+        return self._cache[key]
+
+    def bar_positions(self, target) -> np.ndarray:
+        """종목별로 지정일 이후 첫 거래일의 열 번호 (없으면 -1)"""
+        close = self.matrix.close
+        positions = np.full(len(self.matrix.symbols), -1)
+        start = int(np.searchsorted(self.matrix.dates, _to_datetime64(target), side="left"))
+        if start >= close.shape[1]:
+            return positions
+
+        valid = ~np.isnan(close[:, start:])
+        has_bar = valid.any(axis=1)
+        positions[has_bar] = start + valid.argmax(axis=1)[has_bar]
+        return positions
+
+    def _take(self, values: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        taken = np.full(len(positions), np.nan)
+        found = positions >= 0
+        taken[found] = values[np.nonzero(found)[0], positions[found]]
+        return taken
+
+    def cross_section(self, target, rsi_period: int = 14, ma_period: int = 50,
+                      ema_period: Optional[int] = None, prev_date=None) -> Dict[str, np.ndarray]:
+        """
+        지정일 기준 전 종목 단면 지표를 컬럼별 배열로 반환
+        :param prev_date: 주어지면 해당일 거래량과 비교한 거래량 배율(prev_volume, volume_change)을 함께 계산
+        """
+        positions = self.bar_positions(target)
+        close = self._take(self.matrix.close, positions)
+        ma = self._take(self._indicator("sma", ma_period), positions)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            section = {
+                "close": close,
+                "volume": self._take(self.matrix.volume, positions),
+                "return": self._take(self._indicator("return", 1), positions),
+                "volume_ratio": self._take(self._indicator("volume_ratio", 1), positions),
+                "rsi": self._take(self._indicator("rsi", rsi_period), positions),
+                "sma": ma,
+                "breakout_ratio": (close - ma) / ma * 100,
+            }
+            if ema_period:
+                section["ema"] = self._take(self._indicator("ema", ema_period), positions)
+
+            if prev_date is not None:
+                prev_volume = self._take(self.matrix.volume, self.bar_positions(prev_date))
+                section["prev_volume"] = prev_volume
+                section["volume_change"] = np.where(prev_volume > 0, (section["volume"] / prev_volume - 1) * 100, np.nan)
+
+        return section
+
+    def snapshot(self, target, **kwargs) -> Dict[str, dict]:
+        """cross_section 결과를 종목별 dict로 변환 (값이 없는 항목은 None)"""
+        section = self.cross_section(target, **kwargs)
+        result = {}
+        for i, symbol in enumerate(self.matrix.symbols):
+            result[symbol] = {
+                name: (None if np.isnan(values[i]) else float(values[i]))
+                for name, values in section.items()
+            }
+        return result
@@ -0,0 +1,275 @@
+import json
+import math
+import os
+import threading
+from datetime import date, datetime
+from typing import Dict, Optional
+
+import numpy as np
+
+from core.history_store import HistoryStore
+from core.trading_calendar import kst_today
+
+# 기본으로 증분 관리하는 지표와 기간
+DEFAULT_TRACKED = {
+    "rsi": (14,),
+    "sma": (20, 50),
+    "ema": (20,),
+}
+
+
+def _ring_new(period: int) -> dict:
+    return {"values": [0.0] * period, "pos": 0, "count": 0, "sum": 0.0}
+
+
+def _ring_push(ring: dict, value: float):
+    """고정 길이 링 버퍼에 값 추가 + 구간 합 O(1) 갱신"""
+    values = ring["values"]
+    period = len(values)
+    old = values[ring["pos"]]
+    values[ring["pos"]] = value
+    ring["pos"] = (ring["pos"] + 1) % period
+
+    if ring["count"] < period:
+        ring["count"] += 1
+        ring["sum"] += value
+    else:
+        ring["sum"] += value - old
+
+    # 한 바퀴 돌 때마다 누적 오차 보정 (분할 상환 O(1))
+    if ring["pos"] == 0:
+        ring["sum"] = math.fsum(values)
+
+
+def _ring_mean(ring: dict) -> Optional[float]:
+    period = len(ring["values"])
+    if ring["count"] < period:
+        return None
+    return ring["sum"] / period
+
+
+def _rsi_from_averages(avg_gain: Optional[float], avg_loss: Optional[float]) -> Optional[float]:
+    if avg_gain is None or avg_loss is None:
+        return None
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else None
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+class IndicatorStateStore:
+    """
+    종목별 지표 증분 상태 저장소.
+    RSI(단순평균/와일더 평활), SMA 구간 합, EMA 누적값을 종목마다 보관하고
+    확정된 일봉(오늘 이전)이 하나 추가될 때마다 O(1)로 갱신한다.
+    마지막 확정 거래일 기준 지표는 구간 재계산 없이 lookup으로 바로 꺼낼 수 있다.
+    저장소의 일봉은 사이에 빈 구간이 있을 수 있으므로 상태는 마지막 확정 봉이 속한
+    연속 구간(저장 구간 하나, 종가 결측 이후)의 봉만으로 만든다.
+    """
+
+    def __init__(self, store: HistoryStore, tracked: Dict[str, tuple] = None):
+        """
+        :param store: 일봉 저장소 (상태 파일은 종목 디렉토리에 함께 저장)
+        :param tracked: 관리할 지표별 기간 (예: {"rsi": (14,), "sma": (20, 50)})
+        """
+        self.store = store
+        self.tracked = tracked or DEFAULT_TRACKED
+        self._states: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _state_path(self, symbol: str) -> str:
+        return os.path.join(self.store.store_dir, symbol, "indicators.json")
+
+    def _new_state(self) -> dict:
+        return {
+            "segment_start": None,
+            "first_date": None,
+            "date": None,
+            "prev_date": None,
+            "close": None,
+            "rsi": {
+                str(p): {"gains": _ring_new(p), "losses": _ring_new(p), "wilder_gain": None, "wilder_loss": None}
+                for p in self.tracked.get("rsi", ())
+            },
+            "sma": {str(p): _ring_new(p) for p in self.tracked.get("sma", ())},
+            "ema": {str(p): {"count": 0, "seed_sum": 0.0, "value": None} for p in self.tracked.get("ema", ())},
+        }
+
+    def _load_state(self, symbol: str) -> Optional[dict]:
+        with self._lock:
+            if symbol in self._states:
+                return self._states[symbol]
+        try:
+            with open(self._state_path(symbol), "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except Exception:
+            return None
+
+        # 관리 대상 지표 구성이 바뀌었으면 재구축 대상
+        if set(state.get("sma", {})) != {str(p) for p in self.tracked.get("sma", ())} or \
+           set(state.get("rsi", {})) != {str(p) for p in self.tracked.get("rsi", ())} or \
+           set(state.get("ema", {})) != {str(p) for p in self.tracked.get("ema", ())}:
+            return None
+
+        with self._lock:
+            self._states[symbol] = state
+        return state
+
+    def _save_state(self, symbol: str, state: dict):
+        path = self._state_path(symbol)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._states[symbol] = state
+
+    def _advance_bar(self, state: dict, bar_date: str, close: float):
+        """일봉 하나만큼 상태 전진 (지표 개수에만 비례, 구간 길이와 무관)"""
+        prev_close = state["close"]
+
+        for ring in state["sma"].values():
+            _ring_push(ring, close)
+
+        if prev_close is not None:
+            delta = close - prev_close
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            for period, rsi_state in state["rsi"].items():
+                p = int(period)
+                _ring_push(rsi_state["gains"], gain)
+                _ring_push(rsi_state["losses"], loss)
+                if rsi_state["wilder_gain"] is not None:
+                    rsi_state["wilder_gain"] = (rsi_state["wilder_gain"] * (p - 1) + gain) / p
+                    rsi_state["wilder_loss"] = (rsi_state["wilder_loss"] * (p - 1) + loss) / p
+                elif rsi_state["gains"]["count"] == p:
+                    # 첫 period개 변화량의 단순평균으로 와일더 평활 시작
+                    rsi_state["wilder_gain"] = _ring_mean(rsi_state["gains"])
+                    rsi_state["wilder_loss"] = _ring_mean(rsi_state["losses"])
+
+        for period, ema_state in state["ema"].items():
+            p = int(period)
+            ema_state["count"] += 1
+            if ema_state["count"] <= p:
+                ema_state["seed_sum"] += close
+                if ema_state["count"] == p:
+                    ema_state["value"] = ema_state["seed_sum"] / p
+            else:
+                alpha = 2.0 / (p + 1)
+                ema_state["value"] = alpha * close + (1 - alpha) * ema_state["value"]
+
+        if state["first_date"] is None:
+            state["first_date"] = bar_date
+        state["prev_date"] = state["date"]
+        state["date"] = bar_date
+        state["close"] = close
+
+    def _segment_start(self, symbol: str, day) -> Optional[str]:
+        """day가 속한 저장 구간의 시작일 (구간 기록이 없거나 속한 구간이 없으면 None)"""
+        day = np.datetime64(day, "D").astype(date)
+        for start, end in self.store.segments(symbol):
+            if start <= day < end:
+                return start.strftime("%Y-%m-%d")
+        return None
+
+    def _is_stale(self, symbol: str, state: dict) -> bool:
+        """상태를 만든 연속 구간이 지금 저장소의 구간과 다른지 (구간 기록이 없는 예전 저장소는 확인하지 않음)"""
+        current = self._segment_start(symbol, state["date"])
+        return current is not None and current != state.get("segment_start")
+
+    def _settled_run(self, symbol: str, dates: np.ndarray) -> Optional[tuple]:
+        """
+        확정 일봉이 있는 마지막 저장 구간 -> (구간 시작일, 첫 봉 위치, 마지막 봉 다음 위치).
+        구간 밖의 봉(장중에 받은 당일 봉 등)은 날짜가 지나도 다시 받기 전까지 임시 값이므로 쓰지 않는다.
+        구간 기록이 없는 예전 저장소는 오늘(한국 시간) 이전 봉 전체를 한 구간으로 본다.
+        """
+        segments = self.store.segments(symbol)
+        if not segments:
+            settled = int(np.searchsorted(dates, np.datetime64(kst_today(), "D"), side="left"))
+            return (str(dates[0]), 0, settled) if settled else None
+
+        for start, end in reversed(segments):
+            lo = int(np.searchsorted(dates, np.datetime64(start, "D"), side="left"))
+            hi = int(np.searchsorted(dates, np.datetime64(end, "D"), side="left"))
+            if hi > lo:
+                return start.strftime("%Y-%m-%d"), lo, hi
+        return None
+
+    def advance(self, symbol: str):
+        """저장소에 새로 들어온 확정 일봉만큼 상태를 전진 (HistoryStore 리스너)"""
+        columns = self.store.columns(symbol)
+        if columns is None or "Close" not in columns:
+            return
+
+        dates = columns["Date"]
+        closes = columns["Close"]
+        run = self._settled_run(symbol, dates)
+        if run is None:
+            return
+        segment_start, segment_lo, settled = run
+
+        state = self._load_state(symbol)
+        start = None
+        if state is not None and state.get("segment_start") == segment_start and state["date"] is not None \
+                and str(dates[segment_lo]) <= state["date"] <= str(dates[settled - 1]):
+            start = int(np.searchsorted(dates, np.datetime64(state["date"], "D"), side="right"))
+            if np.isnan(closes[start:settled]).any():
+                start = None
+
+        if start is None:
+            # 상태가 없거나, 빈 구간이 채워져 구간 시작이 바뀌었거나, 마지막 구간이 새 구간이면 처음부터 재구축
+            # (종가 결측 봉이 있으면 그 다음 봉부터)
+            state = self._new_state()
+            state["segment_start"] = segment_start
+            missing = np.flatnonzero(np.isnan(closes[segment_lo:settled]))
+            start = segment_lo + (int(missing[-1]) + 1 if len(missing) else 0)
+        elif start >= settled:
+            return
+
+        for i in range(start, settled):
+            self._advance_bar(state, str(dates[i]), float(closes[i]))
+        self._save_state(symbol, state)
+
+    def rebuild(self, symbol: str):
+        """수정주가 반영 등으로 과거 일봉이 바뀌었을 때 상태를 처음부터 다시 계산"""
+        with self._lock:
+            self._states.pop(symbol, None)
+        try:
+            os.remove(self._state_path(symbol))
+        except FileNotFoundError:
+            pass
+        self.advance(symbol)
+
+    def lookup(self, symbol: str, date_str: str) -> Optional[dict]:
+        """
+        지정일(또는 이후 첫 거래일)이 상태의 마지막 확정 거래일과 같으면 지표값 반환, 아니면 None.
+        기간만큼의 봉이 한 연속 구간 안에 없는 지표는 None이다.
+        :return: {"date", "close", "rsi": {기간: 값}, "rsi_wilder": {...}, "sma": {...}, "ema": {...}}
+        """
+        state = self._load_state(symbol)
+        if state is None:
+            self.advance(symbol)
+            state = self._load_state(symbol)
+        if state is not None and state["date"] is not None and self._is_stale(symbol, state):
+            # 다른 프로세스가 빈 구간을 채워 구간이 바뀐 경우 상태를 다시 만듦
+            self.advance(symbol)
+            state = self._load_state(symbol)
+        if state is None or state["date"] is None or self._is_stale(symbol, state):
+            return None
+
+        target = datetime.strptime(date_str, "%Y-%m-%d").strftime("%Y-%m-%d")
+        if target > state["date"] or (state["prev_date"] is not None and target <= state["prev_date"]):
+            return None
+
+        return {
+            "date": state["date"],
+            "close": state["close"],
+            "rsi": {
+                int(p): _rsi_from_averages(_ring_mean(s["gains"]), _ring_mean(s["losses"]))
+                for p, s in state["rsi"].items()
+            },
+            "rsi_wilder": {
+                int(p): _rsi_from_averages(s["wilder_gain"], s["wilder_loss"])
+                for p, s in state["rsi"].items()
+            },
+            "sma": {int(p): _ring_mean(ring) for p, ring in state["sma"].items()},
+            "ema": {int(p): s["value"] for p, s in state["ema"].items()},
+        }
@@ -0,0 +1,350 @@
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.history_store import HistoryStore
+from core.ranking import top_n
+from core.symbol_master import MARKET_SUFFIXES, SymbolMaster, symbol_master
+from core.trading_calendar import kst_today
+
+# 시장 컬럼은 아래 순서의 번호(int8)로 저장 (-1은 미확인)
+MARKETS = ("KOSPI", "KOSDAQ")
+
+SNAPSHOT_COLUMNS = ("code", "name", "open", "high", "low", "close", "volume", "value", "change_pct", "market")
+
+# 저장된 스냅샷의 수집 범위 기록 (이 파일이 없으면 완전한 스냅샷으로 보지 않고 다시 계산)
+COVERAGE_FILE = "coverage.json"
+
+
+def _to_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+
+def market_index(market: Optional[str]) -> Optional[int]:
+    """시장 이름(KOSPI/KOSDAQ, 대소문자 무관)을 시장 컬럼 번호로 변환"""
+    if market is None:
+        return None
+    market = market.upper()
+    return MARKETS.index(market) if market in MARKETS else None
+
+
+class MarketSnapshot:
+    """
+    하루치 전 종목 단면 테이블.
+    컬럼마다 하나의 배열(memory-map)이며, 집계·정렬은 모두 배열 연산 한 번으로 처리한다.
+    """
+
+    def __init__(self, trading_date: date, columns: Dict[str, np.ndarray], universe: int = None,
+                 unresolved: List[str] = ()):
+        """
+        :param universe: 스냅샷을 만들 때 조회한 전체 종목 수
+        :param unresolved: 다운로드 실패·요청 제한으로 데이터 유무를 확인하지 못한 종목코드
+        """
+        self.date = trading_date
+        self.columns = columns
+        self.universe = universe
+        self.unresolved = tuple(unresolved)
+
+    @property
+    def complete(self) -> bool:
+        """전 종목의 데이터 유무를 확인했는지 (False면 일부 종목이 빠져 있을 수 있음)"""
+        return not self.unresolved
+
+    def coverage(self) -> dict:
+        return {"universe": self.universe, "rows": len(self), "unresolved": list(self.unresolved)}
+
+    def __len__(self) -> int:
+        return len(self.columns["code"])
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def mask(self, market: Optional[str] = None) -> np.ndarray:
+        """시장 필터 (None이면 전체)"""
+        index = market_index(market)
+        if market is not None and index is None:
+            raise ValueError(f"알 수 없는 시장: {market}")
+        if index is None:
+            return np.ones(len(self), dtype=bool)
+        return self.columns["market"] == index
+
+    def count(self, market: Optional[str] = None, where: Optional[np.ndarray] = None) -> int:
+        """조건(where)을 만족하는 종목 수"""
+        mask = self.mask(market)
+        if where is not None:
+            mask &= where
+        return int(np.count_nonzero(mask))
+
+    def advancers(self, market: Optional[str] = None) -> int:
+        return self.count(market, self.columns["change_pct"] > 0)
+
+    def decliners(self, market: Optional[str] = None) -> int:
+        return self.count(market, self.columns["change_pct"] < 0)
+
+    def traded(self, market: Optional[str] = None) -> int:
+        return self.count(market, self.columns["volume"] > 0)
+
+    def total(self, column: str, market: Optional[str] = None) -> float:
+        """컬럼 합계 (결측 제외)"""
+        values = self.columns[column][self.mask(market)]
+        return float(np.nansum(values))
+
+    def row(self, index: int) -> dict:
+        row = {}
+        for column in SNAPSHOT_COLUMNS:
+            value = self.columns[column][index]
+            if column == "market":
+                row[column] = MARKETS[value] if value >= 0 else None
+            elif column in ("code", "name"):
+                row[column] = str(value)
+            elif column == "volume":
+                row[column] = int(value)
+            else:
+                row[column] = None if np.isnan(value) else float(value)
+        return row
+
+    def top(self, column: str, n: int, market: Optional[str] = None,
+            ascending: bool = False, keep_ties: bool = False) -> List[dict]:
+        """컬럼 기준 상위(ascending=True면 하위) n개 종목 (결측 제외, 동률은 종목코드 순)"""
+        positions = top_n(self.columns[column], n, ascending=ascending,
+                          mask=self.mask(market), keep_ties=keep_ties)
+        return [self.row(i) for i in positions]
+
+
+class MarketSnapshotStore:
+    """
+    일자별 전 종목 스냅샷 저장소.
+    data/krx_stocks.csv 전 종목의 당일/전일 일봉을 HistoryStore에서 묶음 요청으로 한 번 읽어
+    시가·고가·저가·종가·거래량·거래대금·등락률·시장 컬럼을 만들고, 컬럼마다 .npy 파일로 저장한다.
+    이후에는 memory-map으로 복사 없이 읽는다. 거래대금은 종가 x 거래량 근사치다.
+    요청 경로에서는 시장을 이미 아는 종목(백필·CSV 시장구분)만 읽고, 시장을 모르는 종목을 KOSPI/KOSDAQ로
+    찾아보는 일은 백필(backfill.py)에 맡긴다. 시장을 모르는 종목은 두 시장 모두 데이터 없음으로 기록된 경우가 아니면
+    미확인으로 남는다.
+    파일로 저장하는 것은 전 종목을 확인한 확정 거래일 스냅샷뿐이고,
+    당일·불완전 스냅샷은 메모리에 fresh_seconds 동안만 두고 그 뒤에는 다시 계산한다.
+    """
+
+    def __init__(self, history_store: HistoryStore, snapshot_dir: str = "snapshots",
+                 symbols: SymbolMaster = None, calendar=None, workers: int = 3, fresh_seconds: float = 300):
+        """
+        :param history_store: 일봉 저장소 (부족한 구간만 다운로드)
+        :param snapshot_dir: 스냅샷 루트 디렉토리 (snapshot_dir/YYYY-MM-DD/<컬럼>.npy)
+        :param symbols: 종목 마스터 (없으면 프로세스 공용 symbol_master)
+        :param calendar: 거래일 달력 (휴장일 요청을 거래일로 맞추고 전일 종가를 찾는 데 사용)
+        :param workers: 묶음 요청 동시 실행 수
+        :param fresh_seconds: 당일·불완전 스냅샷을 메모리에서 재사용하는 시간 (초)
+        """
+        self.history_store = history_store
+        self.snapshot_dir = snapshot_dir
+        self.symbols = symbols or symbol_master
+        self.calendar = calendar
+        self.workers = workers
+        self.fresh_seconds = fresh_seconds
+        # 거래일 → (스냅샷, 만료 시각(monotonic), 확정 스냅샷은 inf)
+        self._snapshots: Dict[date, tuple] = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+
+    def _markets_path(self) -> str:
+        return os.path.join(self.snapshot_dir, "markets.json")
+
+    def _date_dir(self, trading_date: date) -> str:
+        return os.path.join(self.snapshot_dir, trading_date.strftime("%Y-%m-%d"))
+
+    def load_universe(self) -> Dict[str, dict]:
+        """종목코드 → {"name", "market"} (CSV에 시장구분이 없으면 market은 None)"""
+        return {
+            code: {"name": name, "market": market}
+            for code, name, market in zip(self.symbols.codes, self.symbols.names, self.symbols.markets)
+        }
+
+    def load_markets(self, universe: Dict[str, dict] = None) -> Dict[str, str]:
+        """이미 확인된 종목코드 → 시장 (snapshot_dir/markets.json + CSV 시장구분)"""
+        markets = self._read_markets()
+        for code, info in (universe or self.load_universe()).items():
+            if info["market"]:
+                markets[code] = info["market"]
+        return markets
+
+    def _read_markets(self) -> Dict[str, str]:
+        try:
+            with open(self._markets_path(), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def save_markets(self, markets: Dict[str, str]):
+        path = self._markets_path()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(markets, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def resolve_date(self, value) -> date:
+        """지정일 또는 그 이후 첫 거래일"""
+        target = _to_date(value)
+        if self.calendar is None:
+            return target
+        return self.calendar.next_trading_day(target, inclusive=True) or target
+
+    def _previous_day(self, trading_date: date) -> date:
+        if self.calendar is not None:
+            previous = self.calendar.previous_trading_day(trading_date)
+            if previous is not None:
+                return previous
+        return trading_date - timedelta(days=7)
+
+    def _fetch_frames(self, codes: List[str], market: str, start: date, end: date) -> dict:
+        suffix = MARKET_SUFFIXES[market]
+        frames = self.history_store.get_history_many(
+            [code + suffix for code in codes], start, end, workers=self.workers
+        )
+        return {symbol[:-len(suffix)]: frame for symbol, frame in frames.items() if not frame.empty}
+
+    def fetch_universe(self, codes: List[str], start, end, markets: Dict[str, str],
+                       probe: bool = True) -> Dict[str, tuple]:
+        """
+        종목코드들의 [start, end) 일봉을 묶음 요청으로 읽음.
+        시장을 아는 종목은 해당 접미사로, 모르는 종목은 KOSPI → KOSDAQ 순서로 찾아보고 찾은 시장을 markets에 기록한다.
+        :param probe: False면 시장을 모르는 종목은 찾아보지 않고 건너뜀 (종목마다 시장 수만큼 요청이 늘어나므로 백필에서만 사용)
+        :return: 종목코드 → (시장, 일봉 프레임)
+        """
+        frames: Dict[str, tuple] = {}
+        for market in MARKETS:
+            known = [code for code in codes if markets.get(code) == market]
+            for code, frame in self._fetch_frames(known, market, start, end).items():
+                frames[code] = (market, frame)
+
+        unresolved = [code for code in codes if code not in markets] if probe else []
+        for market in MARKETS:
+            if not unresolved:
+                break
+            found = self._fetch_frames(unresolved, market, start, end)
+            for code, frame in found.items():
+                frames[code] = (market, frame)
+                markets[code] = market
+            unresolved = [code for code in unresolved if code not in found]
+        return frames
+
+    def _is_resolved(self, code: str, markets: Dict[str, str], start: date, end: date) -> bool:
+        """종목의 [start, end) 일봉 유무가 확정됐는지 (시장을 모르면 두 시장 모두 확인돼야 함)"""
+        candidates = [markets[code]] if code in markets else MARKETS
+        return all(self.history_store.is_resolved(code + MARKET_SUFFIXES[market], start, end)
+                   for market in candidates)
+
+    def build(self, value) -> MarketSnapshot:
+        """
+        지정일 스냅샷을 일봉 저장소에서 새로 계산 (확정된 과거 거래일이면 파일로 저장).
+        시장을 아는 종목만 읽으므로 시장을 모르는 종목마다 두 시장을 찾아보는 요청은 생기지 않는다.
+        """
+        trading_date = self.resolve_date(value)
+        start, end = self._previous_day(trading_date), trading_date + timedelta(days=1)
+
+        universe = self.load_universe()
+        markets = self.load_markets(universe)
+        frames = self.fetch_universe(list(universe), start, end, markets, probe=False)
+        # 응답이 없는 종목 중 다운로드가 실패했거나 아직 시장을 모르는 종목
+        # (데이터 없음이 확정된 종목은 제외)
+        unresolved = [code for code in universe
+                      if code not in frames and not self._is_resolved(code, markets, start, end)]
+
+        target = np.datetime64(trading_date, "D")
+        rows = []
+        for code, (market, frame) in frames.items():
+            dates = frame.index.values.astype("datetime64[D]")
+            pos = int(np.searchsorted(dates, target, side="left"))
+            if pos >= len(dates) or dates[pos] != target:
+                continue
+            bar = frame.iloc[pos]
+            prev_close = float(frame["Close"].iat[pos - 1]) if pos > 0 else np.nan
+            rows.append((code, universe[code]["name"], bar, prev_close, MARKETS.index(market)))
+
+        rows.sort(key=lambda item: item[0])
+        close = np.array([float(bar["Close"]) for _, _, bar, _, _ in rows], dtype=np.float64)
+        volume = np.array([int(bar["Volume"]) if bar["Volume"] == bar["Volume"] else 0
+                           for _, _, bar, _, _ in rows], dtype=np.int64)
+        prev_close = np.array([prev for _, _, _, prev, _ in rows], dtype=np.float64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            columns = {
+                "code": np.array([code for code, *_ in rows], dtype="<U6"),
+                "name": np.array([name for _, name, *_ in rows], dtype=str),
+                "open": np.array([float(bar["Open"]) for _, _, bar, _, _ in rows], dtype=np.float64),
+                "high": np.array([float(bar["High"]) for _, _, bar, _, _ in rows], dtype=np.float64),
+                "low": np.array([float(bar["Low"]) for _, _, bar, _, _ in rows], dtype=np.float64),
+                "close": close,
+                "volume": volume,
+                "value": close * volume,
+                "change_pct": np.where(prev_close > 0, (close / prev_close - 1) * 100, np.nan),
+                "market": np.array([market for *_, market in rows], dtype=np.int8),
+            }
+
+        snapshot = MarketSnapshot(trading_date, columns, len(universe), unresolved)
+        if unresolved:
+            unknown = sum(1 for code in unresolved if code not in markets)
+            print(f"{trading_date} 스냅샷: {len(unresolved)}개 종목 미확인 "
+                  f"(다운로드 실패 {len(unresolved) - unknown}개, 시장 미확인 {unknown}개는 backfill.py로 채움, "
+                  f"저장하지 않고 나중에 다시 계산)")
+        # 당일 봉은 장중에 바뀌므로 전 종목을 확인한 확정 거래일만 저장
+        elif trading_date < kst_today():
+            self._write_snapshot(snapshot)
+        return snapshot
+
+    def _write_snapshot(self, snapshot: MarketSnapshot):
+        final_dir = self._date_dir(snapshot.date)
+        tmp_dir = f"{final_dir}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        for column, values in snapshot.columns.items():
+            np.save(os.path.join(tmp_dir, f"{column}.npy"), values)
+        with open(os.path.join(tmp_dir, COVERAGE_FILE), "w", encoding="utf-8") as f:
+            json.dump(snapshot.coverage(), f)
+        shutil.rmtree(final_dir, ignore_errors=True)
+        os.replace(tmp_dir, final_dir)
+
+    def _read_snapshot(self, trading_date: date) -> Optional[MarketSnapshot]:
+        date_dir = self._date_dir(trading_date)
+        if not os.path.isdir(date_dir):
+            return None
+        try:
+            # 수집 범위 기록이 없는 예전 스냅샷은 일부 종목이 빠졌을 수 있으므로 다시 계산
+            with open(os.path.join(date_dir, COVERAGE_FILE), "r", encoding="utf-8") as f:
+                coverage = json.load(f)
+            if coverage.get("unresolved"):
+                return None
+            columns = {
+                column: np.load(os.path.join(date_dir, f"{column}.npy"), mmap_mode="r")
+                for column in SNAPSHOT_COLUMNS
+            }
+        except Exception:
+            return None
+        return MarketSnapshot(trading_date, columns, coverage.get("universe"))
+
+    def get(self, value) -> MarketSnapshot:
+        """
+        지정일(휴장일이면 다음 거래일) 스냅샷. 저장된 파일이 있으면 복사 없이 memory-map으로 읽음.
+        당일·불완전 스냅샷은 fresh_seconds가 지나면 다시 계산한다.
+        """
+        trading_date = self.resolve_date(value)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._snapshots.get(trading_date)
+            if cached is not None and now < cached[1]:
+                return cached[0]
+
+        snapshot = self._read_snapshot(trading_date) or self.build(trading_date)
+        settled = trading_date < kst_today() and snapshot.complete
+        expires = float("inf") if settled else now + self.fresh_seconds
+        with self._lock:
+            self._snapshots[trading_date] = (snapshot, expires)
+        return snapshot
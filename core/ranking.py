@@ -0,0 +1,39 @@
+from typing import Optional
+
+import numpy as np
+
+
+def top_n(values: np.ndarray, n: int, ascending: bool = False,
+          mask: Optional[np.ndarray] = None, keep_ties: bool = False) -> np.ndarray:
+    """
+    단면 컬럼에서 상위(ascending=True면 하위) n개의 위치를 순서대로 반환.
+    argpartition으로 경계값만 찾은 뒤 뽑힌 n개만 정렬하므로 O(len + n log n)이다.
+    결측(NaN)과 mask=False인 항목은 제외한다.
+    :param mask: 후보 필터 (예: 시장 필터), None이면 전체
+    :param keep_ties: True면 n번째와 같은 값인 항목을 모두 포함 (False면 앞쪽 위치 우선으로 n개에서 자름)
+    :return: 값 순서(동률은 위치 순서)로 정렬된 위치 배열
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    if mask is not None:
+        valid &= mask
+    candidates = np.flatnonzero(valid)
+    if n <= 0 or len(candidates) == 0:
+        return np.array([], dtype=np.int64)
+
+    keys = values[candidates] if ascending else -values[candidates]
+
+    if n < len(candidates):
+        # n번째 값(경계값)만 선형 시간에 찾고, 경계값보다 확실히 앞선 항목 + 경계값 동률 항목을 고름
+        boundary = keys[np.argpartition(keys, n - 1)[n - 1]]
+        ahead = np.flatnonzero(keys < boundary)
+        ties = np.flatnonzero(keys == boundary)
+        if not keep_ties:
+            ties = ties[:n - len(ahead)]
+        chosen = np.concatenate([ahead, ties])
+    else:
+        chosen = np.arange(len(candidates))
+
+    # 뽑힌 항목만 (값, 위치) 순으로 정렬
+    order = np.lexsort((candidates[chosen], keys[chosen]))
+    return candidates[chosen[order]]
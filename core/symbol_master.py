@@ -0,0 +1,191 @@
+import csv
+import os
+import re
+from datetime import date
+from types import MappingProxyType
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+KRX_STOCKS_PATH = os.path.join(os.path.dirname(__file__), "../data/krx_stocks.csv")
+SYMBOL_MASTER_SNAPSHOT = os.path.join(os.path.dirname(__file__), "../snapshots/symbol_master.npz")
+
+# 스냅샷 형식 버전 (배열 구성을 바꾸면 올림)
+SNAPSHOT_VERSION = 1
+
+MARKET_SUFFIXES = {"KOSPI": ".KS", "KOSDAQ": ".KQ"}
+
+
+class SymbolMaster:
+    """
+    KRX 종목 마스터 (data/krx_stocks.csv).
+    프로세스 시작 시 한 번 읽어 종목코드·회사명·시장·상장일을 CSV 순서의 배열로 들고,
+    회사명 → 위치, 종목코드 → 위치 dict로 O(1) 조회한다. 만든 뒤에는 바꾸지 않는다.
+    snapshot_path가 있으면 CSV를 파싱한 결과를 .npz로 저장해 두고,
+    CSV의 수정 시각·크기가 같으면 다음 실행부터 스냅샷을 바로 읽는다.
+    """
+
+    def __init__(self, csv_path: str = KRX_STOCKS_PATH, snapshot_path: Optional[str] = SYMBOL_MASTER_SNAPSHOT):
+        """
+        :param csv_path: 종목 목록 CSV (euc-kr)
+        :param snapshot_path: 미리 변환한 이진 스냅샷 경로 (None이면 매번 CSV를 읽음)
+        """
+        self.csv_path = csv_path
+        self.snapshot_path = snapshot_path
+
+        arrays = self._load()
+        self.codes = tuple(arrays["codes"].tolist())
+        self.names = tuple(arrays["names"].tolist())
+        self.markets = tuple(market or None for market in arrays["markets"].tolist())
+        self.listed = arrays["listed"]
+        self.listed.setflags(write=False)
+
+        # 같은 회사명이 여러 번 나오면 CSV에서 나중에 나온 종목을 사용
+        self.by_name = MappingProxyType({name: i for i, name in enumerate(self.names)})
+        self.by_code = MappingProxyType({code: i for i, code in enumerate(self.codes)})
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.by_code
+
+    def _source_stamp(self) -> np.ndarray:
+        stat = os.stat(self.csv_path)
+        return np.array([SNAPSHOT_VERSION, stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+
+    def _load(self) -> dict:
+        """스냅샷이 CSV와 맞으면 스냅샷을, 아니면 CSV를 읽음 (CSV가 없으면 빈 마스터)"""
+        try:
+            stamp = self._source_stamp()
+        except OSError:
+            print(f"종목 마스터 파일이 없습니다: {self.csv_path}")
+            return self._empty()
+
+        if self.snapshot_path:
+            snapshot = self._read_snapshot(stamp)
+            if snapshot is not None:
+                return snapshot
+
+        arrays = self._parse_csv()
+        if self.snapshot_path:
+            self._write_snapshot(arrays, stamp)
+        return arrays
+
+    @staticmethod
+    def _empty() -> dict:
+        return {
+            "codes": np.array([], dtype="U6"),
+            "names": np.array([], dtype="U1"),
+            "markets": np.array([], dtype="U1"),
+            "listed": np.array([], dtype="datetime64[D]")
+        }
+
+    def _parse_csv(self) -> dict:
+        codes, names, markets, listed = [], [], [], []
+        with open(self.csv_path, newline="", encoding="euc-kr") as csvfile:
+            for row in csv.DictReader(csvfile):
+                code = row["종목코드"].strip().zfill(6)
+                if not re.match(r"^[0-9A-Z]{6}$", code):
+                    continue
+                market = (row.get("시장구분") or "").strip().upper()
+                codes.append(code)
+                names.append(row["회사명"].strip())
+                markets.append(market if market in MARKET_SUFFIXES else "")
+                listed.append((row.get("상장일") or "").strip()[:10] or "NaT")
+
+        try:
+            listed_days = np.array(listed, dtype="datetime64[D]")
+        except ValueError:
+            # 날짜 형식이 어긋난 행은 상장일 미확인(NaT)으로
+            listed_days = np.array([self._parse_day(value) for value in listed], dtype="datetime64[D]")
+        return {
+            "codes": np.array(codes, dtype="U6"),
+            "names": np.array(names, dtype=str) if names else np.array([], dtype="U1"),
+            "markets": np.array(markets, dtype=str) if markets else np.array([], dtype="U1"),
+            "listed": listed_days
+        }
+
+    @staticmethod
+    def _parse_day(value: str) -> np.datetime64:
+        try:
+            return np.datetime64(value, "D")
+        except ValueError:
+            return np.datetime64("NaT", "D")
+
+    def _read_snapshot(self, stamp: np.ndarray) -> Optional[dict]:
+        try:
+            with np.load(self.snapshot_path, allow_pickle=False) as snapshot:
+                if not np.array_equal(snapshot["stamp"], stamp):
+                    return None
+                return {key: snapshot[key] for key in ("codes", "names", "markets", "listed")}
+        except Exception:
+            return None
+
+    def _write_snapshot(self, arrays: dict, stamp: np.ndarray):
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                np.savez(f, stamp=stamp, **arrays)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"종목 마스터 스냅샷 저장 실패: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def code(self, name: str) -> Optional[str]:
+        """회사명 → 종목코드"""
+        i = self.by_name.get(name)
+        return self.codes[i] if i is not None else None
+
+    def name(self, code: str) -> Optional[str]:
+        """종목코드 → 회사명"""
+        i = self.by_code.get(code)
+        return self.names[i] if i is not None else None
+
+    def market(self, code: str) -> Optional[str]:
+        """종목코드 → 시장 (KOSPI / KOSDAQ, CSV에 시장구분이 없으면 None)"""
+        i = self.by_code.get(code)
+        return self.markets[i] if i is not None else None
+
+    def listing_date(self, code: str) -> Optional[date]:
+        """종목코드 → 상장일"""
+        i = self.by_code.get(code)
+        if i is None or np.isnat(self.listed[i]):
+            return None
+        return self.listed[i].astype(date)
+
+    def yfinance_code(self, code: str) -> str:
+        """yfinance 심볼 (시장을 모르면 KOSPI 접미사)"""
+        return code + MARKET_SUFFIXES.get(self.market(code), ".KS")
+
+    def select(self, codes: Iterable[str] = None, exclude_names: str = None, listed_before: date = None) -> List[str]:
+        """
+        조건에 맞는 종목코드 목록 (CSV 순서)
+        :param codes: 이 종목들 중에서만 고름 (없으면 전 종목)
+        :param exclude_names: 회사명이 이 정규식을 포함하면 제외 (예: "스팩|리츠")
+        :param listed_before: 이 날짜 이전에 상장한 종목만 (상장일 미확인 종목은 제외)
+        """
+        if codes is None:
+            positions = range(len(self.codes))
+        else:
+            positions = sorted({self.by_code[code] for code in codes if code in self.by_code})
+
+        pattern = re.compile(exclude_names) if exclude_names else None
+        cutoff = np.datetime64(listed_before, "D") if listed_before is not None else None
+
+        selected = []
+        for i in positions:
+            if pattern is not None and pattern.search(self.names[i]):
+                continue
+            if cutoff is not None and not self.listed[i] < cutoff:
+                continue
+            selected.append(self.codes[i])
+        return selected
+
+
+# 전역 종목 마스터 (프로세스 시작 시 한 번 읽음)
+symbol_master = SymbolMaster()
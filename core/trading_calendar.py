@@ -0,0 +1,126 @@
+import csv
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+import numpy as np
+
+KRX_HOLIDAYS_PATH = os.path.join(os.path.dirname(__file__), "../data/krx_holidays.csv")
+
+# KRX 기준 시간대 (일봉 확정·캐시 유지 시간 판단은 모두 한국 시간 기준)
+KST = timezone(timedelta(hours=9))
+
+
+def kst_today() -> date:
+    """한국 시간 기준 오늘 날짜 (호스트 시간대와 무관, 이 날짜 이전 봉만 확정으로 봄)"""
+    return datetime.now(KST).date()
+
+
+def _to_datetime64(value) -> np.datetime64:
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return np.datetime64(value, "D")
+    return np.datetime64(str(value)[:10], "D")
+
+
+def _to_date(value: np.datetime64) -> date:
+    return value.astype("datetime64[D]").astype(date)
+
+
+class TradingCalendar:
+    """
+    KRX 거래일 달력.
+    주말과 휴장일(data/krx_holidays.csv)을 뺀 거래일을 정렬된 배열로 미리 만들어 두고
+    다음/이전/n번째 거래일을 이진 탐색으로 찾는다.
+    휴장일 파일에 없는 연도는 주말만 제외하므로 매년 휴장일을 추가해야 한다.
+    그런 연도의 날짜를 조회하면 휴장일이 거래일로 잡힐 수 있으므로 연도마다 한 번 경고를 출력한다.
+    """
+
+    def __init__(self, holidays_path: str = KRX_HOLIDAYS_PATH, start: str = "2000-01-01", end: str = "2035-12-31"):
+        self.holidays = self._load_holidays(holidays_path)
+        days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+        self.days = days[np.is_busday(days, holidays=self.holidays)]
+        # 휴장일 파일이 다루는 연도 범위 (첫 휴장일 연도 ~ 마지막 휴장일 연도)
+        years = self.holidays.astype("datetime64[Y]").astype(int) + 1970
+        self.covered_years = (int(years[0]), int(years[-1])) if len(years) else None
+        self._warned_years = set()
+
+    def _load_holidays(self, path: str) -> np.ndarray:
+        try:
+            with open(path, newline="", encoding="utf-8") as csvfile:
+                reader = csv.DictReader(csvfile)
+                return np.array(sorted(row["날짜"] for row in reader), dtype="datetime64[D]")
+        except FileNotFoundError:
+            return np.array([], dtype="datetime64[D]")
+
+    def covers(self, value) -> bool:
+        """value가 휴장일 파일이 다루는 연도 안인지 (밖이면 주말만 빼고 모두 거래일로 봄)"""
+        if self.covered_years is None:
+            return False
+        year = _to_date(_to_datetime64(value)).year
+        return self.covered_years[0] <= year <= self.covered_years[1]
+
+    def _check_coverage(self, *values):
+        for value in values:
+            if self.covers(value):
+                continue
+            year = _to_date(_to_datetime64(value)).year
+            if year not in self._warned_years:
+                self._warned_years.add(year)
+                covered = "%d~%d년" % self.covered_years if self.covered_years else "없음"
+                print(f"거래일 달력: {year}년 휴장일 정보가 없어 주말만 제외합니다 "
+                      f"(휴장일 파일 범위 {covered}, data/krx_holidays.csv에 추가 필요)")
+
+    def _at(self, index: int) -> Optional[date]:
+        if index < 0 or index >= len(self.days):
+            return None
+        return _to_date(self.days[index])
+
+    def is_trading_day(self, value) -> bool:
+        self._check_coverage(value)
+        target = _to_datetime64(value)
+        index = int(np.searchsorted(self.days, target, side="left"))
+        return index < len(self.days) and self.days[index] == target
+
+    def next_trading_day(self, value, inclusive: bool = True) -> Optional[date]:
+        """value 이후 첫 거래일 (inclusive=True면 value 당일 포함)"""
+        self._check_coverage(value)
+        side = "left" if inclusive else "right"
+        return self._at(int(np.searchsorted(self.days, _to_datetime64(value), side=side)))
+
+    def previous_trading_day(self, value, inclusive: bool = False) -> Optional[date]:
+        """value 이전 마지막 거래일 (inclusive=True면 value 당일 포함)"""
+        self._check_coverage(value)
+        side = "right" if inclusive else "left"
+        return self._at(int(np.searchsorted(self.days, _to_datetime64(value), side=side)) - 1)
+
+    def nth_trading_day(self, value, n: int) -> Optional[date]:
+        """
+        value 이후 첫 거래일을 0번째로 보고 n번째 거래일 반환
+        (n=1이면 그다음 거래일, n=-1이면 value 직전 거래일)
+        """
+        self._check_coverage(value)
+        return self._at(int(np.searchsorted(self.days, _to_datetime64(value), side="left")) + n)
+
+    def trading_days_between(self, start, end) -> np.ndarray:
+        """[start, end) 구간의 거래일 배열"""
+        self._check_coverage(start, _to_datetime64(end) - 1)
+        lo = int(np.searchsorted(self.days, _to_datetime64(start), side="left"))
+        hi = int(np.searchsorted(self.days, _to_datetime64(end), side="left"))
+        return self.days[lo:hi]
+
+    def has_trading_day(self, start, end) -> bool:
+        """[start, end) 구간에 거래일이 하나라도 있는지"""
+        return len(self.trading_days_between(start, end)) > 0
+
+    def trim(self, start: date, end: date) -> Optional[tuple]:
+        """[start, end) 구간을 실제 거래일 범위로 좁힘. 거래일이 없으면 None"""
+        days = self.trading_days_between(start, end)
+        if len(days) == 0:
+            return None
+        return _to_date(days[0]), _to_date(days[-1]) + timedelta(days=1)
+
+
+# 전역 KRX 거래일 달력
+krx_calendar = TradingCalendar()
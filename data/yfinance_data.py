@@ -1,4 +1,8 @@
-from api.yfinance_api import get_price_data, get_rsi_data, get_volume_data
+from api.yfinance_api import (
+    get_price_data, get_rsi_data, get_volume_data, get_moving_average_data,
+    history_store, indicator_window
+)
+from core.history_store import HistoryLoader
 
 def fetch_technical_data(symbol: dict, date: str) -> dict:
     if isinstance(symbol, dict):
@@ -9,12 +13,19 @@ def fetch_technical_data(symbol: dict, date: str) -> dict:
     if not code:
         return {}
 
-    price = get_price_data(code, date)
-    volume = get_volume_data(code, date)
-    rsi = get_rsi_data(code, date)
+    # 종목당 가장 넓은 구간을 한 번만 읽고 모든 지표가 같은 프레임을 사용
+    loader = HistoryLoader(history_store)
+    for indicator in ("price", "volume", "rsi", "moving_average"):
+        loader.require(code, *indicator_window(indicator, date))
+
+    price = get_price_data(code, date, loader=loader)
+    volume = get_volume_data(code, date, loader=loader)
+    rsi = get_rsi_data(code, date, loader=loader)
+    moving_average = get_moving_average_data(code, date, loader=loader)
 
     return {
         "price": price,
         "volume": volume,
-        "rsi": rsi
+        "rsi": rsi,
+        "moving_average": moving_average
     }
\ No newline at end of file
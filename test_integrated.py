@@ -246,6 +246,352 @@ def test_task5_specialized_features():
     print("\n3. API 리밋 방지 테스트")
     print_result(True, "지연시간 및 재시도 로직 구현됨")
 
+def test_indicator_state_gap():
+    """증분 지표 상태가 저장 구간 사이의 빈 구간을 건너뛰지 않는지 (네트워크 불필요)"""
+    print_header("증분 지표 상태 - 빈 구간 처리")
+
+    import tempfile
+    import numpy as np
+    import pandas as pd
+    from core.history_store import HistoryStore
+    from core.indicator_state import IndicatorStateStore
+
+    def fetcher(symbol, start, end):
+        # 거래일마다 결정적으로 바뀌는 종가 (빈 구간 앞뒤 값이 크게 다르도록 추세 포함)
+        index = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1), name="Date")
+        days = (index - pd.Timestamp("2024-01-01")).days.values
+        close = 100 + np.sin(days / 5.0) * 10 - days * 0.05
+        return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1,
+                             "Close": close, "Volume": np.full(len(index), 1000.0)}, index=index)
+
+    def expected(store, symbol, end):
+        # end 전날까지 전체 구간 종가로 다시 계산한 SMA20 / RSI14 (단순평균)
+        closes = store.get_history(symbol, "2024-01-31", end)["Close"].to_numpy()
+        delta = np.diff(closes[-15:])
+        gain, loss = delta[delta > 0].sum() / 14, -delta[delta < 0].sum() / 14
+        return closes[-20:].mean(), 100 - 100 / (1 + gain / loss)
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = HistoryStore(fetcher, store_dir)
+        state = IndicatorStateStore(store)
+        store.add_listener(state.advance)
+        symbol = "TEST.KS"
+
+        # 두 구간 사이에 1년 넘는 빈 구간을 만듦
+        store.get_history(symbol, "2024-01-31", "2024-04-20")
+        store.get_history(symbol, "2025-06-23", "2025-07-02")
+        values = state.lookup(symbol, "2025-07-01")
+        if values is None or (values["sma"][20] is None and values["rsi"][14] is None):
+            print_result(True, "빈 구간 뒤 봉이 부족하면 증분 상태를 사용하지 않음")
+        else:
+            print_result(False, f"빈 구간을 건너뛴 값 반환: SMA20={values['sma'][20]}, RSI14={values['rsi'][14]}")
+
+        # 빈 구간을 채우면 상태를 다시 만들어 전체 구간 재계산과 같아야 함
+        store.get_history(symbol, "2024-01-31", "2025-07-02")
+        values = state.lookup(symbol, "2025-07-01")
+        sma, rsi = expected(store, symbol, "2025-07-02")
+        if values is not None and np.isclose(values["sma"][20], sma) and np.isclose(values["rsi"][14], rsi):
+            print_result(True, f"빈 구간을 채운 뒤 재계산과 일치: SMA20={sma:.2f}, RSI14={rsi:.2f}")
+        else:
+            print_result(False, f"재계산과 불일치: {values and (values['sma'][20], values['rsi'][14])} != ({sma}, {rsi})")
+
+def test_history_intraday_bar():
+    """
+    장중에 저장한 당일 봉이 다음 날 확정 값으로 바뀌어도 수정주가로 보지 않고,
+    다시 받기 전까지 증분 지표 상태에 쓰지 않는지 (네트워크 불필요)
+    """
+    print_header("일봉 저장소 - 장중 당일 봉")
+
+    import tempfile
+    from datetime import date
+    import numpy as np
+    import pandas as pd
+    import core.history_store as history_module
+    from core.history_store import HistoryStore
+    from core.indicator_state import IndicatorStateStore
+
+    today = {"value": date(2025, 3, 10)}
+
+    def fetcher(symbol, start, end):
+        index = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1), name="Date")
+        close = np.full(len(index), 100.0)
+        # 아직 확정되지 않은 당일 봉은 장중 값
+        close[index >= pd.Timestamp(today["value"])] = 50.0
+        return pd.DataFrame({"Open": close, "High": close, "Low": close,
+                             "Close": close, "Volume": np.full(len(index), 1000.0)}, index=index)
+
+    original_today = history_module.kst_today
+    history_module.kst_today = lambda: today["value"]
+    try:
+        with tempfile.TemporaryDirectory() as store_dir:
+            store = HistoryStore(fetcher, store_dir)
+            revised = []
+            store.add_revision_listener(revised.append)
+
+            store.get_history("X", "2025-03-01", "2025-03-11")
+            today["value"] = date(2025, 3, 11)
+
+            # 다음 날 다시 받기 전에 만든 상태는 구간 밖의 장중 봉(3/10)을 확정 봉으로 쓰지 않아야 함
+            values = IndicatorStateStore(store, {"sma": (5,)}).lookup("X", "2025-03-07")
+            if values is not None and values["date"] == "2025-03-07" and values["close"] == 100.0:
+                print_result(True, "증분 상태는 확정 구간의 마지막 봉(3/7)까지만 반영")
+            else:
+                print_result(False, f"장중 봉이 증분 상태에 반영됨: {values and (values['date'], values['close'])}")
+
+            frame = store.get_history("X", "2025-03-01", "2025-03-12")
+            if not revised and frame.loc["2025-03-10", "Close"] == 100.0:
+                print_result(True, "다음 날 다시 받은 당일 봉을 확정 값으로 교체 (수정 알림 없음)")
+            else:
+                print_result(False, f"장중 봉을 수정으로 판단: {revised}")
+    finally:
+        history_module.kst_today = original_today
+
+def test_cache_codec_roundtrip():
+    """캐시 이진 형식이 값과 인덱스 dtype(날짜 단위·시간대)을 그대로 되돌리는지 (네트워크 불필요)"""
+    print_header("캐시 이진 형식 - 왕복 변환")
+
+    import numpy as np
+    import pandas as pd
+    from utils.cache_codec import decode, decode_entry, encode, encode_entry
+
+    value = {"price": 71000.0, "volume": np.int64(1200), "flags": [True, None, "x"],
+             "closes": np.array([1.5, np.nan, 3.0])}
+    decoded = decode(encode(value))
+    if decoded["price"] == 71000.0 and decoded["volume"] == 1200 and decoded["flags"] == [True, None, "x"] \
+            and np.array_equal(decoded["closes"], value["closes"], equal_nan=True):
+        print_result(True, "dict/list/ndarray 값 왕복 변환")
+    else:
+        print_result(False, f"값이 달라짐: {decoded}")
+
+    for unit in ("ns", "us", "s"):
+        index = pd.date_range("2025-03-03", periods=3, freq="B", name="Date").as_unit(unit)
+        frame = pd.DataFrame({"Close": [1.0, 2.0, 3.0], "Volume": np.array([10, 20, 30])}, index=index)
+        decoded = decode(encode(frame))
+        series = decode(encode(frame["Close"]))
+        if decoded.index.dtype == index.dtype and series.index.dtype == index.dtype and decoded.equals(frame):
+            print_result(True, f"DataFrame/Series 날짜 인덱스 dtype 유지: {index.dtype}")
+        else:
+            print_result(False, f"인덱스 dtype 변경: {index.dtype} -> {decoded.index.dtype} / {series.index.dtype}")
+
+    index = pd.date_range("2025-03-03 15:30", periods=2, tz="Asia/Seoul")
+    series = decode(encode(pd.Series([1.0, 2.0], index=index)))
+    if series.index.dtype == index.dtype and series.index.equals(index):
+        print_result(True, f"시간대 있는 인덱스 유지: {index.dtype}")
+    else:
+        print_result(False, f"시간대 인덱스 변경: {index.dtype} -> {series.index.dtype}")
+
+    entry = (1741000000.0, {"rsi": 55.2}, None, float("inf"))
+    restored = decode_entry(encode_entry(entry, "rsi", "005930.KS"))
+    if restored == (entry, "rsi", "005930.KS"):
+        print_result(True, "캐시 항목(저장 시각·유지 시간·종류·종목) 왕복 변환")
+    else:
+        print_result(False, f"캐시 항목이 달라짐: {restored}")
+
+def test_trading_calendar():
+    """KRX 거래일 달력의 휴장일·이전/다음 거래일 조회와 휴장일 파일 범위 밖 표시 (네트워크 불필요)"""
+    print_header("거래일 달력 - 휴장일 / 이전 거래일")
+
+    from datetime import date
+    from core.trading_calendar import TradingCalendar
+
+    calendar = TradingCalendar()
+    checks = [
+        ("설 연휴(1/27~1/30) 중 거래일 아님", not calendar.is_trading_day("2025-01-28")),
+        ("주말 거래일 아님", not calendar.is_trading_day("2025-03-08")),
+        ("평일 거래일", calendar.is_trading_day("2025-03-10")),
+        ("설 연휴 첫날의 이전 거래일은 1/24", calendar.previous_trading_day("2025-01-27") == date(2025, 1, 24)),
+        ("설 연휴 중 다음 거래일은 1/31", calendar.next_trading_day("2025-01-29") == date(2025, 1, 31)),
+        ("거래일 당일 포함 이전 거래일은 당일",
+         calendar.previous_trading_day("2025-03-10", inclusive=True) == date(2025, 3, 10)),
+        ("연말 휴장일(12/31) 직후 첫 거래일은 1/2", calendar.next_trading_day("2024-12-31") == date(2025, 1, 2)),
+        ("추석 연휴(10/3~10/9) 구간 거래일 없음", not calendar.has_trading_day("2025-10-03", "2025-10-10")),
+        ("1/31 직전 2번째 거래일은 1/23", calendar.nth_trading_day("2025-01-31", -2) == date(2025, 1, 23)),
+    ]
+    for message, passed in checks:
+        print_result(passed, message)
+
+    # 휴장일 파일 범위 밖 연도는 주말만 빼므로 범위를 밝혀야 함
+    first, last = calendar.covered_years
+    print_result(calendar.covers(f"{last}-12-31") and not calendar.covers(f"{last + 1}-01-01")
+                 and not calendar.covers(f"{first - 1}-12-31"),
+                 f"휴장일 파일 범위 {first}~{last}년 밖의 날짜 구분")
+
+def test_top_n_ranking():
+    """단면 상위 N개 선택의 동률·결측 처리 (네트워크 불필요)"""
+    print_header("상위 N개 선택 - 동률 / 결측")
+
+    import numpy as np
+    from core.ranking import top_n
+
+    values = np.array([3.0, np.nan, 5.0, 5.0, 1.0, 5.0, np.nan, 2.0])
+    checks = [
+        ("결측 제외 + 동률은 위치 순서로 n개에서 자름", top_n(values, 2).tolist() == [2, 3]),
+        ("keep_ties=True면 경계값 동률을 모두 포함", top_n(values, 2, keep_ties=True).tolist() == [2, 3, 5]),
+        ("ascending=True면 작은 값부터", top_n(values, 3, ascending=True).tolist() == [4, 7, 0]),
+        ("n이 유효 항목 수보다 크면 결측을 뺀 전체", top_n(values, 10).tolist() == [2, 3, 5, 0, 7, 4]),
+        ("mask=False 항목 제외", top_n(values, 2, mask=np.array([1, 1, 0, 1, 1, 1, 1, 1], dtype=bool)).tolist() == [3, 5]),
+        ("n=0 또는 모두 결측이면 빈 결과",
+         len(top_n(values, 0)) == 0 and len(top_n(np.full(4, np.nan), 2)) == 0),
+    ]
+    for message, passed in checks:
+        print_result(passed, message)
+
+    # 무작위 값에서 전체 정렬 결과와 같은지
+    rng = np.random.default_rng(7)
+    random_values = rng.integers(0, 50, 1000).astype(np.float64)
+    random_values[rng.random(1000) < 0.1] = np.nan
+    valid = np.flatnonzero(~np.isnan(random_values))
+    expected = valid[np.lexsort((valid, -random_values[valid]))][:25]
+    print_result(top_n(random_values, 25).tolist() == expected.tolist(), "전체 정렬(값 내림차순, 동률 위치 순) 앞 25개와 일치")
+
+def test_single_flight():
+    """동시에 겹친 같은 키의 호출이 한 번만 실행되는지 (스레드·코루틴·일봉 저장소, 네트워크 불필요)"""
+    print_header("중복 호출 합치기 (single flight)")
+
+    import asyncio
+    import tempfile
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    import numpy as np
+    import pandas as pd
+    from core.history_store import HistoryStore
+    from utils.single_flight import SingleFlight
+
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow(value):
+        calls.append(value)
+        started.set()
+        release.wait(5)
+        return value * 2
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        leader = executor.submit(flights.do, "key", slow, 21)
+        started.wait(5)
+        followers = [executor.submit(flights.do, "key", slow, 21) for _ in range(7)]
+        # 뒤따르는 호출이 모두 기다리는 상태가 된 뒤 리더를 끝냄
+        while flights.shared < 7:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [future.result() for future in followers]
+    print_result(len(calls) == 1 and results == [42] * 8 and flights.executed == 1,
+                 f"스레드 8개 동시 호출 → 실행 {len(calls)}번, 결과 공유 {flights.shared}번")
+
+    print_result(flights.do("key", lambda: "new") == "new", "끝난 호출의 결과는 캐시하지 않음 (다음 호출은 새로 실행)")
+
+    errors = []
+    failing_started, failing_release = threading.Event(), threading.Event()
+
+    def failing():
+        failing_started.set()
+        failing_release.wait(5)
+        raise RuntimeError("upstream down")
+
+    def call_failing():
+        try:
+            flights.do("error", failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call_failing) for _ in range(3)]
+    threads[0].start()
+    failing_started.wait(5)
+    shared_before = flights.shared
+    for thread in threads[1:]:
+        thread.start()
+    while flights.shared < shared_before + 2:
+        time.sleep(0.001)
+    failing_release.set()
+    for thread in threads:
+        thread.join()
+    print_result(errors == ["upstream down"] * 3, f"리더의 예외를 기다리던 호출도 함께 받음: {len(errors)}개")
+
+    async def run_async():
+        async_calls = []
+
+        async def fetch():
+            async_calls.append(1)
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        results = await asyncio.gather(*[flights.do_async("async", fetch) for _ in range(5)])
+        return async_calls, results
+
+    async_calls, async_results = asyncio.run(run_async())
+    print_result(len(async_calls) == 1 and async_results == ["ok"] * 5,
+                 f"코루틴 5개 동시 호출 → 실행 {len(async_calls)}번")
+
+    # 일봉 저장소: 같은 종목·구간을 동시에 요청하면 다운로드는 한 번
+    fetches = []
+
+    def fetcher(symbol, start, end):
+        fetches.append((symbol, start, end))
+        time.sleep(0.1)
+        index = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1), name="Date")
+        close = np.full(len(index), 100.0)
+        return pd.DataFrame({"Open": close, "High": close, "Low": close,
+                             "Close": close, "Volume": np.full(len(index), 1000.0)}, index=index)
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = HistoryStore(fetcher, store_dir)
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            frames = list(executor.map(lambda _: store.get_history("X", "2025-03-03", "2025-03-08"), range(6)))
+    print_result(len(fetches) == 1 and all(len(frame) == 5 for frame in frames),
+                 f"일봉 저장소 동시 요청 6개 → 다운로드 {len(fetches)}번")
+
+def test_cache_eviction():
+    """디스크 캐시 용량 정리와 합계 테이블(cache_stats)이 실제 항목과 맞는지 (네트워크 불필요)"""
+    print_header("디스크 캐시 - 용량 정리 / 합계")
+
+    import sqlite3
+    import tempfile
+    from utils.cache_backend import FileBackend, SqliteBackend
+
+    def actual(backend):
+        with sqlite3.connect(backend.path) as conn:
+            return tuple(conn.execute("SELECT ifnull(sum(size), 0), count(*) FROM cache").fetchone())
+
+    now = time.time()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        backend = SqliteBackend(cache_dir)
+        backend.put_many([(f"k{i:03d}", (now, "x" * (100 + i), None, 3600.0), "price", f"S{i % 5}")
+                          for i in range(200)])
+        # 같은 키를 크기가 다른 값으로 덮어쓰기 (UPSERT도 합계에 반영돼야 함)
+        backend.put_many([(f"k{i:03d}", (now, "y" * 2000, None, 3600.0), "price", f"S{i % 5}")
+                          for i in range(0, 200, 4)])
+        backend.put("k000", (now, "z", None, 3600.0), "price", "S0")
+        print_result(backend.usage() == actual(backend), f"UPSERT 후 합계 일치: {backend.usage()}")
+
+        backend.delete("k001")
+        removed = backend.delete_symbol("S2")
+        print_result(removed == 40 and backend.usage() == actual(backend),
+                     f"삭제·종목 무효화 후 합계 일치: {backend.usage()} (무효화 {removed}개)")
+
+        # 최근 접근한 항목은 정리 대상에서 뒤로 밀림
+        # (키 순서와 반대로 접근 시각을 기록해 키 순서가 아니라 접근 순서로 지우는지 확인)
+        keys = [f"k{i:03d}" for i in range(200) if i != 1 and i % 5 != 2][::-1]
+        backend.touch_many(keys, [now + 1 + i for i in range(len(keys))])
+        recent = keys[-10:]
+        max_bytes = backend.usage()[0] // 3
+        evicted = backend.evict(max_bytes)
+        total, entries = backend.usage()
+        survived = backend.get_many(recent)
+        print_result(total <= max_bytes * 0.9 and (total, entries) == actual(backend),
+                     f"용량 정리 {evicted}개 삭제 → {total}B <= {int(max_bytes * 0.9)}B, 합계 일치")
+        print_result(len(survived) == len(recent) and backend.get(keys[0]) is None,
+                     "오래 접근하지 않은 항목부터 삭제 (최근 접근 항목 유지)")
+        print_result(backend.evict(max_bytes) == 0, "한도 이하에서는 삭제하지 않음")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        backend = FileBackend(cache_dir)
+        for i in range(50):
+            backend.put(f"k{i:03d}", (now, "x" * 500, None, 3600.0), "price", "S")
+        max_bytes = backend.usage()[0] // 2
+        backend.evict(max_bytes)
+        print_result(backend.usage()[0] <= max_bytes * 0.9, f"파일 저장소 용량 정리: {backend.usage()}")
+
 def test_performance():
     """성능 테스트"""
     print_header("성능 테스트")
@@ -298,6 +644,13 @@ def main():
     test_task3_signal_detection()
     test_task4_ambiguous_interpretation()
     test_task5_specialized_features()
+    test_indicator_state_gap()
+    test_history_intraday_bar()
+    test_cache_codec_roundtrip()
+    test_trading_calendar()
+    test_top_n_ranking()
+    test_single_flight()
+    test_cache_eviction()
     test_performance()
     
     print_header("테스트 완료")
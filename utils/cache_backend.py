@@ -0,0 +1,646 @@
+import glob
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from utils.cache_codec import decode, decode_entry, encode, encode_entry
+from utils.metrics import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# 디스크에 쓴 바이트 (종류별, 저장소가 실제로 쓴 크기 기준)
+CACHE_BYTES_WRITTEN = metrics.counter("cache_bytes_written_total", "Bytes written to the disk cache by data type", ("data_type",))
+
+# 캐시 항목: (저장 시각(epoch 초), 데이터, 음수 사유 또는 None, 유지 시간(초) 또는 None)
+# 유지 시간이 math.inf면 영구 항목이고, None이면 조회하는 쪽의 max_age_hours로 만료를 판단한다.
+
+
+class CacheBackend(ABC):
+    """CacheManager의 디스크 단계 저장소 (키는 _get_cache_key의 md5 문자열)"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[tuple]:
+        """항목 조회 (없거나 읽을 수 없으면 None)"""
+
+    @abstractmethod
+    def put(self, key: str, entry: tuple, data_type: str = None, symbol: str = None):
+        """항목 저장 (같은 키는 덮어씀)"""
+
+    @abstractmethod
+    def delete(self, key: str, created: float = None):
+        """
+        항목 삭제 (없으면 무시).
+        created가 주어지면 저장 시각이 그대로일 때만 삭제한다 (만료를 확인하는 사이 다른 프로세스가 새로 쓴 항목은 보존).
+        """
+
+    @abstractmethod
+    def purge_expired(self, max_age_hours: float) -> int:
+        """만료된 항목 삭제 후 삭제 수 반환 (유지 시간이 없는 항목은 max_age_hours 기준)"""
+
+    @abstractmethod
+    def delete_symbol(self, symbol: str, data_type: str = None) -> int:
+        """종목의 항목을 모두 삭제 (data_type이 있으면 그 종류만) 후 삭제 수 반환"""
+
+    @abstractmethod
+    def touch_many(self, keys: List[str], accessed: List[float]):
+        """마지막 접근 시각 갱신 (LRU 정리 기준)"""
+
+    @abstractmethod
+    def usage(self) -> Tuple[int, int]:
+        """(전체 바이트, 항목 수)"""
+
+    @abstractmethod
+    def evict(self, max_bytes: int, target_ratio: float = 0.9) -> int:
+        """
+        전체 크기가 max_bytes를 넘으면 오래 접근하지 않은 항목부터 max_bytes * target_ratio 이하가 될 때까지 삭제
+        :return: 삭제한 항목 수
+        """
+
+    def get_many(self, keys: List[str]) -> Dict[str, tuple]:
+        """여러 키 조회 (있는 키만 담은 dict)"""
+        found = {}
+        for key in keys:
+            entry = self.get(key)
+            if entry is not None:
+                found[key] = entry
+        return found
+
+    def put_many(self, rows: list) -> bool:
+        """(키, 항목, data_type, symbol) 여러 개 저장 (성공 여부 반환)"""
+        for key, entry, data_type, symbol in rows:
+            self.put(key, entry, data_type, symbol)
+        return True
+
+    def delete_many(self, keys: List[str], created: List[float] = None):
+        """여러 키 삭제 (created는 키별 조건, delete 참고)"""
+        for i, key in enumerate(keys):
+            self.delete(key, created[i] if created is not None else None)
+
+
+def _record_to_entry(record: dict) -> tuple:
+    """예전 JSON 파일 형식({'timestamp': ISO 문자열, 'data': ...}) 호환 읽기"""
+    ttl_hours = record.get('ttl_hours')
+    return (
+        datetime.fromisoformat(record['timestamp']).timestamp(),
+        record['data'],
+        record.get('reason', 'empty') if record.get('negative') else None,
+        ttl_hours * 3600 if ttl_hours is not None else None
+    )
+
+
+def _read_cache_file(path: str) -> Tuple[tuple, Optional[str], Optional[str]]:
+    """캐시 파일 하나를 (항목, 종류, 종목)으로 읽음 (.bin 이진 형식 / 예전 .json 형식)"""
+    if path.endswith(".json"):
+        with open(path, 'r', encoding='utf-8') as f:
+            record = json.load(f)
+        return _record_to_entry(record), record.get('type'), record.get('symbol')
+    with open(path, 'rb') as f:
+        return decode_entry(f.read())
+
+
+def _cache_files(cache_dir: str) -> List[str]:
+    return glob.glob(os.path.join(cache_dir, "*.bin")) + glob.glob(os.path.join(cache_dir, "*.json"))
+
+
+class _DirectoryLock:
+    """
+    캐시 디렉토리 단위 프로세스 간 공유/배타 락 (<dir>/.lock에 fcntl.flock).
+    스레드마다 파일을 따로 열어 같은 프로세스의 스레드끼리도 서로 배제된다.
+    fcntl이 없는 OS에서는 프로세스 안의 락으로만 동작한다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._fallback = threading.Lock()
+
+    def _fd(self) -> int:
+        fd = getattr(self._local, "fd", None)
+        if fd is None:
+            fd = self._local.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        return fd
+
+    @contextmanager
+    def _hold(self, mode: int):
+        if fcntl is None:
+            with self._fallback:
+                yield
+            return
+        fd = self._fd()
+        fcntl.flock(fd, mode)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def shared(self):
+        """쓰기(교체)용: 여러 쓰기가 동시에 진행될 수 있음"""
+        return self._hold(fcntl.LOCK_SH if fcntl else 0)
+
+    def exclusive(self):
+        """삭제(만료·무효화)용: 확인과 삭제 사이에 다른 쓰기가 끼어들지 않음"""
+        return self._hold(fcntl.LOCK_EX if fcntl else 0)
+
+
+class FileBackend(CacheBackend):
+    """
+    키 하나당 파일 하나 (cache/<key>.bin, utils.cache_codec 이진 형식).
+    예전 JSON 파일(cache/<key>.json)도 읽으며, 같은 키를 다시 저장하면 이진 파일로 바뀐다.
+    쓰기는 임시 파일에 쓴 뒤 os.replace로 바꿔 끼우므로 읽는 쪽은 온전한 이전/새 파일만 본다.
+    삭제는 디렉토리 락을 배타적으로 잡고 다시 확인한 뒤 지우므로, 여러 프로세스가 캐시를 공유해도
+    다른 프로세스가 방금 쓴 항목을 만료 처리로 지우지 않는다.
+    """
+
+    TMP_GRACE_SECONDS = 3600  # 이보다 오래된 임시 파일은 중단된 쓰기로 보고 정리
+
+    def __init__(self, cache_dir: str = "cache"):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = _DirectoryLock(os.path.join(cache_dir, ".lock"))
+
+    def _path(self, key: str, suffix: str = ".bin") -> str:
+        return os.path.join(self.cache_dir, f"{key}{suffix}")
+
+    def get(self, key: str) -> Optional[tuple]:
+        for suffix in (".bin", ".json"):
+            try:
+                return _read_cache_file(self._path(key, suffix))[0]
+            except FileNotFoundError:
+                continue
+            except Exception:
+                return None
+        return None
+
+    def put(self, key: str, entry: tuple, data_type: str = None, symbol: str = None):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            data = encode_entry(entry, data_type, symbol)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            with self._lock.shared():
+                os.replace(tmp_path, path)
+                self._remove(self._path(key, ".json"))
+            CACHE_BYTES_WRITTEN.inc(data_type or "unknown", amount=len(data))
+        except Exception as e:
+            self._remove(tmp_path)
+            print(f"캐시 저장 실패: {e}")
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def _remove_if_created(self, path: str, created: Optional[float]) -> bool:
+        """배타 락 안에서 호출. created가 있으면 파일의 저장 시각이 같을 때만 삭제"""
+        if created is not None:
+            try:
+                if _read_cache_file(path)[0][0] != created:
+                    return False
+            except FileNotFoundError:
+                return False
+            except Exception:
+                pass  # 읽을 수 없으면 삭제
+        return self._remove(path)
+
+    def delete(self, key: str, created: float = None):
+        with self._lock.exclusive():
+            for suffix in (".bin", ".json"):
+                self._remove_if_created(self._path(key, suffix), created)
+
+    def delete_many(self, keys: List[str], created: List[float] = None):
+        with self._lock.exclusive():
+            for i, key in enumerate(keys):
+                for suffix in (".bin", ".json"):
+                    self._remove_if_created(self._path(key, suffix), created[i] if created is not None else None)
+
+    def delete_symbol(self, symbol: str, data_type: str = None) -> int:
+        # 파일 이름이 해시라 전체를 훑음 (종목 컬럼이 인덱스된 sqlite 저장소 권장)
+        removed = 0
+        with self._lock.exclusive():
+            for path in _cache_files(self.cache_dir):
+                try:
+                    _, stored_type, stored_symbol = _read_cache_file(path)
+                except Exception:
+                    continue
+                if stored_symbol == symbol and (not data_type or stored_type == data_type):
+                    removed += self._remove(path)
+        return removed
+
+    def purge_expired(self, max_age_hours: float) -> int:
+        now = time.time()
+        removed = 0
+        with self._lock.exclusive():
+            for path in _cache_files(self.cache_dir):
+                try:
+                    created, _, _, ttl = _read_cache_file(path)[0]
+                    expired = now - created > (ttl if ttl is not None else max_age_hours * 3600)
+                except FileNotFoundError:
+                    continue
+                except Exception:
+                    # 읽을 수 없는 파일(손상, 다른 버전)은 충분히 오래된 경우에만 삭제
+                    expired = self._older_than(path, now, max_age_hours * 3600)
+                if expired:
+                    removed += self._remove(path)
+
+            # 쓰다가 중단된 임시 파일 정리
+            for path in glob.glob(os.path.join(self.cache_dir, "*.tmp")):
+                if self._older_than(path, now, self.TMP_GRACE_SECONDS):
+                    self._remove(path)
+        return removed
+
+    def touch_many(self, keys: List[str], accessed: List[float]):
+        # 파일의 접근 시각(atime)을 LRU 기준으로 사용 (수정 시각은 유지)
+        for key, at in zip(keys, accessed):
+            for suffix in (".bin", ".json"):
+                path = self._path(key, suffix)
+                try:
+                    os.utime(path, (at, os.stat(path).st_mtime))
+                    break
+                except OSError:
+                    continue
+
+    def _scan(self) -> List[Tuple[float, int, str]]:
+        """(접근 시각, 크기, 경로) 목록 - 파일 내용은 읽지 않고 stat만 사용"""
+        files = []
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith((".bin", ".json")):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                files.append((st.st_atime, st.st_size, entry.path))
+        return files
+
+    def usage(self) -> Tuple[int, int]:
+        files = self._scan()
+        return sum(size for _, size, _ in files), len(files)
+
+    def evict(self, max_bytes: int, target_ratio: float = 0.9) -> int:
+        # 파일 저장소에는 색인이 없어 디렉토리를 한 번 훑음 (항목 수에 비례, 대규모 캐시는 sqlite 저장소 권장)
+        files = self._scan()
+        total = sum(size for _, size, _ in files)
+        if total <= max_bytes:
+            return 0
+        removed = 0
+        with self._lock.exclusive():
+            for _, size, path in sorted(files):
+                if total <= max_bytes * target_ratio:
+                    break
+                if self._remove(path):
+                    total -= size
+                    removed += 1
+        return removed
+
+    @staticmethod
+    def _older_than(path: str, now: float, seconds: float) -> bool:
+        try:
+            return now - os.path.getmtime(path) > seconds
+        except OSError:
+            return False
+
+
+class SqliteBackend(CacheBackend):
+    """
+    단일 파일 SQLite(WAL) 저장소 (cache/cache.db).
+    키는 기본키 인덱스로, 만료는 expires/created 인덱스로, 종목 단위 무효화는 symbol 인덱스로,
+    용량 정리는 accessed 인덱스(LRU)로 한 번의 DELETE로 처리한다.
+    영구 항목은 expires가 inf라 만료 삭제 대상이 되지 않는다.
+    WAL 모드라 여러 프로세스(uvicorn 워커 등)가 읽는 동안에도 쓰기가 막히지 않는다.
+    """
+
+    BATCH_SIZE = 500
+    SCHEMA_VERSION = 1
+
+    def __init__(self, cache_dir: str = "cache", filename: str = "cache.db"):
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, filename)
+        os.makedirs(cache_dir, exist_ok=True)
+        self._local = threading.local()  # 스레드마다 연결 하나
+        self._pid = os.getpid()
+        self._init_schema()
+
+    def _init_schema(self):
+        """
+        테이블이 곧 캐시 목록(manifest)이다: 키, 크기, 저장 시각, 마지막 접근 시각.
+        전체 크기/항목 수는 트리거로 cache_stats 한 행에 유지해 정리 작업이 항목 수와 무관하게 O(1)로 읽는다.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    data_type TEXT,
+                    symbol TEXT,
+                    created REAL NOT NULL,
+                    expires REAL,
+                    reason TEXT,
+                    value BLOB,
+                    size INTEGER NOT NULL DEFAULT 0,
+                    accessed REAL
+                ) WITHOUT ROWID
+            """)
+            if conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+                # 크기/접근 시각 컬럼이 없던 이전 스키마 갱신 (한 번만)
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(cache)")}
+                if "size" not in columns:
+                    conn.execute("ALTER TABLE cache ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+                if "accessed" not in columns:
+                    conn.execute("ALTER TABLE cache ADD COLUMN accessed REAL")
+                conn.execute("UPDATE cache SET size = length(key) + ifnull(length(value), 0), accessed = created")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS cache_stats (
+                        id INTEGER PRIMARY KEY CHECK (id = 0),
+                        bytes INTEGER NOT NULL,
+                        entries INTEGER NOT NULL
+                    )
+                """)
+                conn.execute("INSERT OR REPLACE INTO cache_stats SELECT 0, ifnull(sum(size), 0), count(*) FROM cache")
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS cache_stats_insert AFTER INSERT ON cache BEGIN
+                        UPDATE cache_stats SET bytes = bytes + NEW.size, entries = entries + 1 WHERE id = 0;
+                    END
+                """)
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS cache_stats_delete AFTER DELETE ON cache BEGIN
+                        UPDATE cache_stats SET bytes = bytes - OLD.size, entries = entries - 1 WHERE id = 0;
+                    END
+                """)
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS cache_stats_update AFTER UPDATE OF size ON cache BEGIN
+                        UPDATE cache_stats SET bytes = bytes + NEW.size - OLD.size WHERE id = 0;
+                    END
+                """)
+                conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache(expires) WHERE expires IS NOT NULL")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_created ON cache(created) WHERE expires IS NULL")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_symbol ON cache(symbol, data_type)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed)")
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # fork된 자식 프로세스는 부모의 연결을 쓰면 안 되므로 새로 연결
+            self._local = threading.local()
+            self._pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _row_to_entry(created, expires, reason, value) -> Optional[tuple]:
+        try:
+            # 예전에 JSON 문자열로 저장된 값도 decode가 그대로 읽음
+            data = decode(value) if value is not None else None
+        except ValueError:
+            return None
+        return (created, data, reason, expires - created if expires is not None else None)
+
+    def get(self, key: str) -> Optional[tuple]:
+        try:
+            row = self._conn().execute(
+                "SELECT created, expires, reason, value FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"캐시 조회 실패: {e}")
+            return None
+        if row is None:
+            return None
+        return self._row_to_entry(*row)
+
+    def get_many(self, keys: List[str]) -> Dict[str, tuple]:
+        """기본키 IN 조회로 묶어서 읽음 (SQLite 변수 개수 제한 때문에 500개씩)"""
+        found = {}
+        conn = self._conn()
+        for i in range(0, len(keys), self.BATCH_SIZE):
+            batch = keys[i:i + self.BATCH_SIZE]
+            try:
+                rows = conn.execute(
+                    f"SELECT key, created, expires, reason, value FROM cache WHERE key IN ({','.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+            except sqlite3.Error as e:
+                print(f"캐시 조회 실패: {e}")
+                continue
+            for key, *row in rows:
+                entry = self._row_to_entry(*row)
+                if entry is not None:
+                    found[key] = entry
+        return found
+
+    def put(self, key: str, entry: tuple, data_type: str = None, symbol: str = None):
+        self.put_many([(key, entry, data_type, symbol)])
+
+    def put_many(self, rows: list) -> bool:
+        """(키, 항목, data_type, symbol) 여러 개를 한 트랜잭션으로 저장 (성공 여부 반환)"""
+        params = []
+        for key, (created, data, reason, ttl), data_type, symbol in rows:
+            try:
+                value = encode(data) if data is not None else None
+            except (TypeError, ValueError) as e:
+                print(f"캐시 저장 실패 ({symbol}): {e}")
+                continue
+            params.append((
+                key, data_type, symbol, created,
+                created + ttl if ttl is not None else None,
+                reason,
+                value,
+                len(key) + (len(value) if value is not None else 0),
+                created
+            ))
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # REPLACE는 삭제 트리거를 건너뛰므로 UPSERT로 갱신해 cache_stats 합계를 맞춤
+            conn.executemany("""
+                INSERT INTO cache (key, data_type, symbol, created, expires, reason, value, size, accessed)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    data_type = excluded.data_type, symbol = excluded.symbol, created = excluded.created,
+                    expires = excluded.expires, reason = excluded.reason, value = excluded.value,
+                    size = excluded.size, accessed = excluded.accessed
+            """, params)
+            conn.execute("COMMIT")
+            written: Dict[str, int] = {}
+            for row in params:
+                written[row[1] or "unknown"] = written.get(row[1] or "unknown", 0) + row[7]
+            for data_type, size in written.items():
+                CACHE_BYTES_WRITTEN.inc(data_type, amount=size)
+            return True
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            print(f"캐시 저장 실패: {e}")
+            return False
+
+    def delete(self, key: str, created: float = None):
+        self.delete_many([key], None if created is None else [created])
+
+    def delete_many(self, keys: List[str], created: List[float] = None):
+        # 저장 시각 조건을 같은 문장에 넣어 확인과 삭제를 원자적으로 처리
+        try:
+            if created is None:
+                self._conn().executemany("DELETE FROM cache WHERE key = ?", [(key,) for key in keys])
+            else:
+                self._conn().executemany(
+                    "DELETE FROM cache WHERE key = ? AND created = ?", list(zip(keys, created))
+                )
+        except sqlite3.Error as e:
+            print(f"캐시 삭제 실패: {e}")
+
+    def delete_symbol(self, symbol: str, data_type: str = None) -> int:
+        try:
+            if data_type:
+                cursor = self._conn().execute("DELETE FROM cache WHERE symbol = ? AND data_type = ?", (symbol, data_type))
+            else:
+                cursor = self._conn().execute("DELETE FROM cache WHERE symbol = ?", (symbol,))
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"캐시 삭제 실패: {e}")
+            return 0
+
+    def purge_expired(self, max_age_hours: float) -> int:
+        now = time.time()
+        conn = self._conn()
+        removed = conn.execute("DELETE FROM cache WHERE expires < ?", (now,)).rowcount
+        removed += conn.execute(
+            "DELETE FROM cache WHERE expires IS NULL AND created < ?", (now - max_age_hours * 3600,)
+        ).rowcount
+        return removed
+
+    def touch_many(self, keys: List[str], accessed: List[float]):
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "UPDATE cache SET accessed = ? WHERE key = ? AND (accessed IS NULL OR accessed < ?)",
+                [(at, key, at) for key, at in zip(keys, accessed)]
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            print(f"캐시 접근 기록 실패: {e}")
+
+    def usage(self) -> Tuple[int, int]:
+        row = self._conn().execute("SELECT bytes, entries FROM cache_stats WHERE id = 0").fetchone()
+        return (row[0], row[1]) if row else (0, 0)
+
+    def evict(self, max_bytes: int, target_ratio: float = 0.9) -> int:
+        # 합계는 cache_stats 한 행, 삭제 대상은 accessed 인덱스 앞쪽만 읽으므로 항목 수와 무관하게 삭제량에 비례
+        if self.usage()[0] <= max_bytes:
+            return 0
+        removed = 0
+        conn = self._conn()
+        while True:
+            excess = self.usage()[0] - max_bytes * target_ratio
+            if excess <= 0:
+                break
+            keys = []
+            for key, size in conn.execute(
+                "SELECT key, size FROM cache ORDER BY accessed LIMIT ?", (self.BATCH_SIZE,)
+            ):
+                keys.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            if not keys:
+                break
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany("DELETE FROM cache WHERE key = ?", keys)
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            removed += len(keys)
+        return removed
+
+    def migrate_files(self, files_dir: str = None) -> int:
+        """
+        키당 파일 형식(예전 .json, FileBackend의 .bin)의 캐시를 한 번에 옮김 (옮긴 파일과 읽을 수 없는 파일은 삭제).
+        파일 이름이 곧 키(md5)이므로 키 체계는 그대로 유지된다.
+        종류·종목이 기록되지 않은 예전 .json 항목도 종류·종목 없이(NULL) 옮긴다. 종목 단위 invalidate()로는 지울 수 없으므로
+        만료 시각 없이 예전처럼 조회 시 max_age로만 만료되게 두고, 영구 보관(ttl=inf)으로 기록된 경우도 max_age를 따르게 한다.
+        서버 시작 시에는 호출하지 않으며 `python -m utils.cache_backend migrate`로 한 번 실행한다.
+        :return: 옮긴 항목 수
+        """
+        paths = _cache_files(files_dir or self.cache_dir)
+        if not paths:
+            return 0
+
+        rows, legacy = [], 0
+        for path in paths:
+            try:
+                entry, data_type, symbol = _read_cache_file(path)
+            except Exception:
+                continue
+            if not data_type or not symbol:
+                legacy += 1
+                data_type, symbol = data_type or None, symbol or None
+                if entry[3] is not None and math.isinf(entry[3]):
+                    entry = entry[:3] + (None,)
+            rows.append((os.path.splitext(os.path.basename(path))[0], entry, data_type, symbol))
+        if rows and not self.put_many(rows):
+            return 0  # 저장에 실패하면 파일을 남겨 두고 다음 실행에서 다시 시도
+
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        print(f"파일 캐시 {len(rows)}개를 {self.path}로 옮겼습니다 "
+              f"(종류·종목 정보가 없는 예전 항목 {legacy}개 포함, 읽을 수 없는 파일 {len(paths) - len(rows)}개 삭제).")
+        return len(rows)
+
+
+def create_cache_backend(name: str = None, cache_dir: str = "cache") -> CacheBackend:
+    """
+    디스크 캐시 저장소 생성
+    :param name: sqlite (기본값, 단일 파일) / file (키당 파일 하나, 예전 이름 json도 허용). 없으면 CACHE_BACKEND 환경변수
+    """
+    name = (name or os.getenv("CACHE_BACKEND", "sqlite")).lower()
+    if name in ("file", "json"):
+        return FileBackend(cache_dir)
+    if name == "sqlite":
+        # 예전 파일 캐시 이전은 시작 경로에서 하지 않음 (python -m utils.cache_backend migrate)
+        return SqliteBackend(cache_dir)
+    raise ValueError(f"알 수 없는 캐시 저장소: {name}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="디스크 캐시 관리")
+    parser.add_argument("command", choices=["migrate"], help="migrate: 키당 파일 캐시(.json/.bin)를 SQLite 캐시로 한 번에 옮김")
+    parser.add_argument("--cache-dir", default="cache", help="캐시 디렉토리 (기본값: cache)")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        if _cache_files(args.cache_dir):
+            SqliteBackend(args.cache_dir).migrate_files()
+        else:
+            print("옮길 파일 캐시가 없습니다.")
@@ -0,0 +1,270 @@
+import json
+import math
+import struct
+from typing import Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 캐시 값 이진 형식: 매직(4) + 스키마 버전(1) + 값
+# 값: 종류(1) + 본문
+#   None / bool / int64 / float64 / str / JSON(dict, list) / ndarray / DataFrame / Series
+#   NumPy·pandas 값이 들어 있는 dict(문자열 키)와 list는 항목별로 재귀 저장
+#   DataFrame/Series 인덱스는 이름 + pandas dtype(날짜는 단위·시간대 포함) + 값
+# 형식을 바꾸면 CODEC_VERSION을 올리고, 읽을 수 없는 버전은 캐시 미적중으로 처리한다.
+MAGIC = b"FMC\x00"
+CODEC_VERSION = 2
+
+_NONE, _BOOL, _INT, _FLOAT, _STR, _JSON, _NDARRAY, _FRAME, _SERIES, _DICT, _LIST = range(11)
+
+_U8 = struct.Struct("<B")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_ENTRY_HEADER = struct.Struct("<dd")  # 저장 시각, 유지 시간(None이면 NaN)
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+class CodecError(ValueError):
+    """캐시 값을 해석할 수 없음 (손상되었거나 지원하지 않는 버전)"""
+
+
+def _require(buf: memoryview, end: int):
+    if end > len(buf):
+        raise CodecError("캐시 값이 잘렸습니다")
+
+
+def _write_str(out: list, value: Optional[str]):
+    """길이(u32) + utf-8. None은 0xFFFFFFFF"""
+    if value is None:
+        out.append(_U32.pack(0xFFFFFFFF))
+        return
+    data = value.encode("utf-8")
+    out.append(_U32.pack(len(data)))
+    out.append(data)
+
+
+def _read_str(buf: memoryview, pos: int) -> Tuple[Optional[str], int]:
+    (length,) = _U32.unpack_from(buf, pos)
+    pos += 4
+    if length == 0xFFFFFFFF:
+        return None, pos
+    _require(buf, pos + length)
+    return bytes(buf[pos:pos + length]).decode("utf-8"), pos + length
+
+
+def _write_array(out: list, array: np.ndarray):
+    """dtype + shape + 원시 바이트 (object 배열은 지원하지 않음)"""
+    if array.dtype.hasobject:
+        raise TypeError("object dtype 배열은 캐시할 수 없습니다")
+    array = np.ascontiguousarray(array)
+    _write_str(out, array.dtype.str)
+    out.append(_U8.pack(array.ndim))
+    for dim in array.shape:
+        out.append(_I64.pack(dim))
+    out.append(_I64.pack(array.nbytes))
+    out.append(array.tobytes())
+
+
+def _read_array(buf: memoryview, pos: int) -> Tuple[np.ndarray, int]:
+    dtype, pos = _read_str(buf, pos)
+    (ndim,) = _U8.unpack_from(buf, pos)
+    pos += 1
+    shape = struct.unpack_from(f"<{ndim}q", buf, pos)
+    pos += 8 * ndim
+    (nbytes,) = _I64.unpack_from(buf, pos)
+    pos += 8
+    _require(buf, pos + nbytes)
+    # 캐시 값은 여러 호출자가 공유하므로 읽기 전용 배열로 돌려줌
+    array = np.frombuffer(buf[pos:pos + nbytes], dtype=np.dtype(dtype)).reshape(shape)
+    return array, pos + nbytes
+
+
+def _write_index(out: list, index: pd.Index):
+    """
+    이름 + pandas dtype 문자열 + 값.
+    날짜 인덱스는 dtype 문자열에 단위·시간대(예: datetime64[ns, Asia/Seoul])가 들어가고 값은 UTC 기준으로 저장한다.
+    """
+    _write_str(out, None if index.name is None else str(index.name))
+    _write_str(out, str(index.dtype))
+    if isinstance(index, pd.DatetimeIndex) and index.tz is not None:
+        index = index.tz_convert(None)
+    _write_array(out, index.to_numpy())
+
+
+def _read_index(buf: memoryview, pos: int) -> Tuple[pd.Index, int]:
+    name, pos = _read_str(buf, pos)
+    dtype, pos = _read_str(buf, pos)
+    values, pos = _read_array(buf, pos)
+    if values.dtype.kind != "M":
+        return pd.Index(values, name=name), pos
+
+    # 저장할 때의 단위·시간대로 되돌림 (pandas 버전에 따라 기본 단위가 달라도 같은 인덱스가 나옴)
+    dtype = pd.api.types.pandas_dtype(dtype)
+    index = pd.DatetimeIndex(values, name=name).as_unit(np.datetime_data(values.dtype)[0])
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return index.as_unit(dtype.unit).tz_localize("UTC").tz_convert(dtype.tz), pos
+    return index.as_unit(np.datetime_data(dtype)[0]), pos
+
+
+def _write_json(out: list, value: Any) -> bool:
+    """
+    JSON으로 표현되는 dict/list는 JSON 본문으로 저장 (C 파서라 작은 값은 직접 풀어 쓰는 것보다 빠르게 읽힘).
+    NumPy/pandas 값이 섞여 있으면 False를 돌려 항목별 이진 형식으로 저장하게 한다.
+    """
+    try:
+        text = _JSON_ENCODER.encode(value)
+    except TypeError:
+        return False
+    out.append(_U8.pack(_JSON))
+    _write_str(out, text)
+    return True
+
+
+def _write_value(out: list, value: Any):
+    if value is None:
+        out.append(_U8.pack(_NONE))
+    elif isinstance(value, (bool, np.bool_)):
+        out.append(_U8.pack(_BOOL) + _U8.pack(bool(value)))
+    elif isinstance(value, (int, np.integer)) and -2 ** 63 <= value < 2 ** 63:
+        out.append(_U8.pack(_INT) + _I64.pack(int(value)))
+    elif isinstance(value, (float, np.floating)):
+        out.append(_U8.pack(_FLOAT) + _F64.pack(float(value)))
+    elif isinstance(value, str):
+        out.append(_U8.pack(_STR))
+        _write_str(out, value)
+    elif isinstance(value, (dict, list, tuple)) and _write_json(out, value):
+        pass
+    elif isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        out.append(_U8.pack(_DICT) + _U32.pack(len(value)))
+        for key, item in value.items():
+            _write_str(out, key)
+            _write_value(out, item)
+    elif isinstance(value, (list, tuple)):
+        out.append(_U8.pack(_LIST) + _U32.pack(len(value)))
+        for item in value:
+            _write_value(out, item)
+    elif isinstance(value, np.ndarray):
+        out.append(_U8.pack(_NDARRAY))
+        _write_array(out, value)
+    elif isinstance(value, pd.DataFrame):
+        out.append(_U8.pack(_FRAME))
+        _write_index(out, value.index)
+        out.append(_U32.pack(value.shape[1]))
+        for column in value.columns:
+            if not isinstance(column, str):
+                raise TypeError(f"DataFrame 컬럼 이름은 문자열이어야 합니다: {column!r}")
+            _write_str(out, column)
+            _write_array(out, value[column].to_numpy())
+    elif isinstance(value, pd.Series):
+        out.append(_U8.pack(_SERIES))
+        _write_str(out, None if value.name is None else str(value.name))
+        _write_index(out, value.index)
+        _write_array(out, value.to_numpy())
+    else:
+        out.append(_U8.pack(_JSON))
+        _write_str(out, _JSON_ENCODER.encode(value))
+
+
+def _read_value(buf: memoryview, pos: int) -> Tuple[Any, int]:
+    (kind,) = _U8.unpack_from(buf, pos)
+    pos += 1
+    if kind == _NONE:
+        return None, pos
+    if kind == _BOOL:
+        return bool(buf[pos]), pos + 1
+    if kind == _INT:
+        return _I64.unpack_from(buf, pos)[0], pos + 8
+    if kind == _FLOAT:
+        return _F64.unpack_from(buf, pos)[0], pos + 8
+    if kind == _STR:
+        return _read_str(buf, pos)
+    if kind == _DICT:
+        (count,) = _U32.unpack_from(buf, pos)
+        pos += 4
+        result = {}
+        for _ in range(count):
+            key, pos = _read_str(buf, pos)
+            result[key], pos = _read_value(buf, pos)
+        return result, pos
+    if kind == _LIST:
+        (count,) = _U32.unpack_from(buf, pos)
+        pos += 4
+        result = []
+        for _ in range(count):
+            item, pos = _read_value(buf, pos)
+            result.append(item)
+        return result, pos
+    if kind == _JSON:
+        text, pos = _read_str(buf, pos)
+        return json.loads(text), pos
+    if kind == _NDARRAY:
+        return _read_array(buf, pos)
+    if kind == _FRAME:
+        index, pos = _read_index(buf, pos)
+        (count,) = _U32.unpack_from(buf, pos)
+        pos += 4
+        columns = {}
+        for _ in range(count):
+            name, pos = _read_str(buf, pos)
+            columns[name], pos = _read_array(buf, pos)
+        return pd.DataFrame(columns, index=index), pos
+    if kind == _SERIES:
+        name, pos = _read_str(buf, pos)
+        index, pos = _read_index(buf, pos)
+        values, pos = _read_array(buf, pos)
+        return pd.Series(values, index=index, name=name), pos
+    raise CodecError(f"알 수 없는 값 종류: {kind}")
+
+
+def _check_header(buf: memoryview) -> int:
+    if bytes(buf[:4]) != MAGIC:
+        raise CodecError("캐시 형식이 아닙니다")
+    if buf[4] != CODEC_VERSION:
+        raise CodecError(f"지원하지 않는 캐시 버전: {buf[4]}")
+    return 5
+
+
+def encode(value: Any) -> bytes:
+    """값을 버전 헤더가 붙은 이진 형식으로 직렬화 (지원하지 않는 값이면 TypeError)"""
+    out = [MAGIC, _U8.pack(CODEC_VERSION)]
+    _write_value(out, value)
+    return b"".join(out)
+
+
+def decode(data) -> Any:
+    """encode의 역변환. 예전 형식(JSON 문자열)도 읽는다"""
+    if isinstance(data, str):
+        return json.loads(data)
+    buf = memoryview(data)
+    try:
+        return _read_value(buf, _check_header(buf))[0]
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise CodecError(f"손상된 캐시 값: {e}") from e
+
+
+def encode_entry(entry: tuple, data_type: str = None, symbol: str = None) -> bytes:
+    """캐시 항목 전체(저장 시각, 유지 시간, 음수 사유, 종류, 종목, 값)를 직렬화 (파일 저장소용)"""
+    created, data, reason, ttl = entry
+    out = [MAGIC, _U8.pack(CODEC_VERSION), _ENTRY_HEADER.pack(created, math.nan if ttl is None else ttl)]
+    _write_str(out, reason)
+    _write_str(out, data_type)
+    _write_str(out, symbol)
+    _write_value(out, data)
+    return b"".join(out)
+
+
+def decode_entry(data: bytes) -> Tuple[tuple, Optional[str], Optional[str]]:
+    """encode_entry의 역변환 -> (항목, 종류, 종목)"""
+    buf = memoryview(data)
+    try:
+        pos = _check_header(buf)
+        created, ttl = _ENTRY_HEADER.unpack_from(buf, pos)
+        pos += _ENTRY_HEADER.size
+        reason, pos = _read_str(buf, pos)
+        data_type, pos = _read_str(buf, pos)
+        symbol, pos = _read_str(buf, pos)
+        value, _ = _read_value(buf, pos)
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise CodecError(f"손상된 캐시 항목: {e}") from e
+    return (created, value, reason, None if math.isnan(ttl) else ttl), data_type, symbol
@@ -1,18 +1,132 @@
+import copy
 import json
+import math
 import os
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
 import hashlib
+from dotenv import load_dotenv
+from utils.cache_backend import CACHE_BYTES_WRITTEN, create_cache_backend
+from utils.cache_policy import FreshnessPolicy
+from utils.metrics import metrics
+from core.trading_calendar import krx_calendar
+
+load_dotenv()
+
+# 음수 캐시(데이터 없음) 사유별 유지 시간 (시간). 일반 캐시보다 짧게 두어 새로 생긴 데이터를 곧 다시 확인한다.
+NEGATIVE_TTL_HOURS = {
+    "empty": 6,          # 공급자가 빈 응답을 돌려줌 (상장폐지, 거래정지, 신규상장 전 구간 등)
+    "insufficient": 6,   # 지표 계산에 필요한 일봉 수 부족
+    "no_bar": 1,         # 지정일 이후 봉이 아직 없음
+    "error": 0.25,       # 다운로드/계산 오류 (일시적일 수 있어 가장 짧게)
+}
+
+# 캐시 지표 (종류별, 프로세스 단위 누적). /stats와 /metrics로 노출된다.
+CACHE_HITS = metrics.counter("cache_hits_total", "Cache hits by data type and tier", ("data_type", "tier"))
+CACHE_MISSES = metrics.counter("cache_misses_total", "Cache misses (including expired entries) by data type", ("data_type",))
+CACHE_EXPIRED = metrics.counter("cache_expired_total", "Expired cache entries found on read by data type", ("data_type",))
+CACHE_NEGATIVE_HITS = metrics.counter("cache_negative_hits_total", "Negative (no data) cache hits by data type", ("data_type",))
+CACHE_READ_SECONDS = metrics.histogram("cache_read_seconds", "Disk cache read latency by data type and operation", ("data_type", "op"))
+CACHE_EVICTED = metrics.counter("cache_evicted_total", "Disk cache entries removed by the background evictor")
+
+# lookup() 결과 상태
+HIT, NEGATIVE, MISS = "hit", "negative", "miss"
+
+_IMMUTABLE_TYPES = (str, int, float, bool, bytes, type(None))
+
+
+def _copy_value(value: Any) -> Any:
+    """
+    메모리 단계에 둔 값을 호출한 쪽이 바꾸지 못하도록 복사본 반환.
+    불변 값은 그대로, 스칼라 값만 담은 dict(지표 결과)는 얕은 복사, 그 밖의 값은 깊은 복사.
+    """
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    if type(value) is dict and all(isinstance(item, _IMMUTABLE_TYPES) for item in value.values()):
+        return dict(value)
+    return copy.deepcopy(value)
+
+class LRUCache:
+    """
+    크기 제한이 있는 스레드 안전 메모리 LRU.
+    항목은 (저장 시각, 데이터, 음수 사유, 유지 시간(초)) 튜플이며 만료 판단은 CacheManager가 한다.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[tuple]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, entry: tuple):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            # 가장 오래 쓰지 않은 항목부터 제거
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def remove_if(self, predicate) -> int:
+        """키가 조건에 맞는 항목을 모두 제거 후 제거 수 반환"""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
 
 class CacheManager:
-    def __init__(self, cache_dir: str = "cache"):
+    """
+    2단 캐시: 프로세스 메모리 LRU + 디스크 저장소(기본값은 cache/cache.db 단일 SQLite 파일).
+    조회는 메모리에서 먼저 찾고 없을 때만 디스크를 읽어 메모리에 올리며(read-through),
+    저장은 메모리와 디스크에 함께 쓴다(write-through).
+    메모리 단계의 값은 복사본으로 넣고 꺼내므로 호출한 쪽이 결과를 바꿔도 캐시에는 영향이 없다
+    (메모리 적중 한 번은 잠금·지표 기록·복사를 포함해 수 µs).
+    정책(FreshnessPolicy)이 있으면 저장할 때 항목이 설명하는 날짜로 유지 시간을 정한다
+    (확정된 과거 거래일은 영구). 정책이 정하지 못한 항목만 조회 시 max_age_hours로 만료를 판단한다.
+    """
+
+    def __init__(self, cache_dir: str = "cache", memory_entries: int = 10000, backend: str = None,
+                 policy: FreshnessPolicy = None, max_bytes: int = None, evict_interval: float = 60):
+        """
+        :param cache_dir: 디스크 캐시 디렉토리
+        :param memory_entries: 메모리 LRU 최대 항목 수 (0이면 메모리 단계 사용 안 함)
+        :param backend: 디스크 저장소 sqlite / file (없으면 CACHE_BACKEND 환경변수, 기본값 sqlite)
+        :param policy: 날짜별 유지 시간 정책 (없으면 모든 항목에 조회 시 max_age_hours 적용)
+        :param max_bytes: 디스크 캐시 용량 한도 (주어지면 백그라운드 정리 작업이 오래 안 쓴 항목부터 삭제)
+        :param evict_interval: 백그라운드 정리 주기 (초)
+        """
         self.cache_dir = cache_dir
-        self._ensure_cache_dir()
-    
-    def _ensure_cache_dir(self):
-        """캐시 디렉토리가 없으면 생성"""
-        if not os.path.exists(self.cache_dir):
-            os.makedirs(self.cache_dir)
+        self.policy = policy
+        self.memory = LRUCache(memory_entries) if memory_entries > 0 else None
+        self.backend = create_cache_backend(backend, cache_dir)
+        self.max_bytes = max_bytes
+        self.evict_interval = evict_interval
+        # 조회된 항목의 마지막 접근 시각 (정리 작업이 모아서 목록에 반영, _accessed_lock으로 보호)
+        self._accessed: Dict[tuple, float] = {}
+        self._accessed_lock = threading.Lock()
+        self._evictor: Optional[threading.Thread] = None
+        self._evictor_pid = None
+        self._evictor_lock = threading.Lock()
     
     def _get_cache_key(self, data_type: str, symbol: str, date: str, **kwargs) -> str:
         """캐시 키 생성"""
@@ -25,70 +139,307 @@ class CacheManager:
         key_str = json.dumps(key_data, sort_keys=True)
         return hashlib.md5(key_str.encode()).hexdigest()
     
-    def _get_cache_path(self, cache_key: str) -> str:
-        """캐시 파일 경로 반환"""
-        return os.path.join(self.cache_dir, f"{cache_key}.json")
+    def _memory_key(self, data_type: str, symbol: str, date: str, kwargs: dict) -> tuple:
+        """메모리 단계 키 (해시 계산 없이 튜플로)"""
+        return (data_type, symbol, date, tuple(sorted(kwargs.items())) if kwargs else ())
     
-    def get(self, data_type: str, symbol: str, date: str, max_age_hours: int = 24, **kwargs) -> Optional[Any]:
-        """캐시에서 데이터 조회"""
-        cache_key = self._get_cache_key(data_type, symbol, date, **kwargs)
-        cache_path = self._get_cache_path(cache_key)
-        
-        if not os.path.exists(cache_path):
-            return None
+    def _lookup(self, data_type: str, symbol: str, date: str, max_age_hours: float, kwargs: dict,
+                record: bool = True) -> Optional[tuple]:
+        """
+        메모리 → 디스크 순으로 만료되지 않은 항목 조회 (만료된 항목은 삭제)
+        :param record: 적중/미적중 지표 기록 여부
+        """
+        memory_key = self._memory_key(data_type, symbol, date, kwargs)
+        entry = self.memory.get(memory_key) if self.memory is not None else None
+        cache_key = None
+        tier = "memory"
         
-        try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-            
-            # 캐시 만료 확인
-            cached_time = datetime.fromisoformat(cache_data['timestamp'])
-            if datetime.now() - cached_time > timedelta(hours=max_age_hours):
-                os.remove(cache_path)  # 만료된 캐시 삭제
+        if entry is None:
+            tier = "disk"
+            cache_key = self._get_cache_key(data_type, symbol, date, **kwargs)
+            started = time.perf_counter()
+            entry = self.backend.get(cache_key)
+            CACHE_READ_SECONDS.observe(time.perf_counter() - started, data_type, "get")
+            if entry is None:
+                if record:
+                    CACHE_MISSES.inc(data_type)
                 return None
-            
-            return cache_data['data']
+            if self.memory is not None:
+                self.memory.put(memory_key, entry)
         
-        except Exception:
+        # 캐시 만료 확인 (음수 항목은 자체 유지 시간, 일반 항목은 max_age_hours)
+        ttl = entry[3]
+        now = time.time()
+        if now - entry[0] > (ttl if ttl is not None else max_age_hours * 3600):
+            if self.memory is not None:
+                self.memory.pop(memory_key)
+            # 그 사이 다른 프로세스가 새로 쓴 항목은 지우지 않도록 저장 시각 조건으로 삭제
+            self.backend.delete(cache_key or self._get_cache_key(data_type, symbol, date, **kwargs), entry[0])
+            if record:
+                CACHE_EXPIRED.inc(data_type)
+                CACHE_MISSES.inc(data_type)
             return None
+        if self.max_bytes is not None:
+            with self._accessed_lock:
+                self._accessed[memory_key] = now
+        if record:
+            if entry[2] is None:
+                CACHE_HITS.inc(data_type, tier)
+            else:
+                CACHE_NEGATIVE_HITS.inc(data_type)
+        return entry
+    
+    def lookup(self, data_type: str, symbol: str, date: str, max_age_hours: int = 24, **kwargs) -> Tuple[str, Any]:
+        """
+        한 번의 조회로 적중/음수/미적중을 함께 판단
+        :return: (HIT, 데이터 복사본) / (NEGATIVE, 음수 사유) / (MISS, None)
+        """
+        entry = self._lookup(data_type, symbol, date, max_age_hours, kwargs)
+        if entry is None:
+            return MISS, None
+        if entry[2] is not None:
+            return NEGATIVE, entry[2]
+        return HIT, _copy_value(entry[1])
+    
+    def get(self, data_type: str, symbol: str, date: str, max_age_hours: int = 24, **kwargs) -> Optional[Any]:
+        """캐시에서 데이터 조회 (음수 항목은 None)"""
+        state, value = self.lookup(data_type, symbol, date, max_age_hours, **kwargs)
+        return value if state == HIT else None
+    
+    def get_negative(self, data_type: str, symbol: str, date: str, **kwargs) -> Optional[str]:
+        """데이터가 없다고 기록된 항목이면 사유 반환, 아니면 None"""
+        entry = self._lookup(data_type, symbol, date, math.inf, kwargs, record=False)
+        if entry is None:
+            return None
+        return entry[2]
+    
+    def get_many(self, data_type: str, symbols: Iterable[str], date: str, max_age_hours: int = 24,
+                 **kwargs) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        여러 종목을 한 번에 조회 (메모리에 없는 종목만 디스크에서 한 번에 읽음)
+        :return: (종목 → 데이터, 종목 → 음수 사유). 둘 다 없는 종목이 다운로드 대상
+        """
+        symbols = list(dict.fromkeys(symbols))
+        hits, negatives = {}, {}
+        now = time.time()
+        pending = {}
+        memory_hits = expired_count = 0
+        
+        for symbol in symbols:
+            memory_key = self._memory_key(data_type, symbol, date, kwargs)
+            entry = self.memory.get(memory_key) if self.memory is not None else None
+            if entry is None:
+                pending[self._get_cache_key(data_type, symbol, date, **kwargs)] = memory_key
+                continue
+            if self._classify(memory_key, entry, now, max_age_hours, hits, negatives):
+                memory_hits += entry[2] is None
+            else:
+                expired_count += 1
+        
+        if pending:
+            expired, expired_created = [], []
+            started = time.perf_counter()
+            found = self.backend.get_many(list(pending))
+            CACHE_READ_SECONDS.observe(time.perf_counter() - started, data_type, "get_many")
+            for cache_key, entry in found.items():
+                memory_key = pending[cache_key]
+                if self._classify(memory_key, entry, now, max_age_hours, hits, negatives):
+                    if self.memory is not None:
+                        self.memory.put(memory_key, entry)
+                else:
+                    expired.append(cache_key)
+                    expired_created.append(entry[0])
+            if expired:
+                self.backend.delete_many(expired, expired_created)
+            expired_count += len(expired)
+        
+        if memory_hits:
+            CACHE_HITS.inc(data_type, "memory", amount=memory_hits)
+        if len(hits) > memory_hits:
+            CACHE_HITS.inc(data_type, "disk", amount=len(hits) - memory_hits)
+        if negatives:
+            CACHE_NEGATIVE_HITS.inc(data_type, amount=len(negatives))
+        if expired_count:
+            CACHE_EXPIRED.inc(data_type, amount=expired_count)
+        misses = len(symbols) - len(hits) - len(negatives)
+        if misses:
+            CACHE_MISSES.inc(data_type, amount=misses)
+        return hits, negatives
+    
+    def _classify(self, memory_key: tuple, entry: tuple, now: float, max_age_hours: float,
+                  hits: dict, negatives: dict) -> bool:
+        """만료되지 않은 항목을 hits/negatives로 나눔 (만료됐으면 False)"""
+        ttl = entry[3]
+        if now - entry[0] > (ttl if ttl is not None else max_age_hours * 3600):
+            return False
+        if self.max_bytes is not None:
+            with self._accessed_lock:
+                self._accessed[memory_key] = now
+        symbol = memory_key[1]
+        if entry[2] is None:
+            hits[symbol] = _copy_value(entry[1])
+        else:
+            negatives[symbol] = entry[2]
+        return True
+    
+    def _write(self, data_type: str, symbol: str, date: str, kwargs: dict, entry: tuple):
+        """메모리와 디스크에 함께 저장 (write-through)"""
+        self._ensure_evictor()
+        if self.memory is not None:
+            self.memory.put(self._memory_key(data_type, symbol, date, kwargs), (entry[0], _copy_value(entry[1]), entry[2], entry[3]))
+        self.backend.put(self._get_cache_key(data_type, symbol, date, **kwargs), entry, data_type, symbol)
+    
+    def _ttl(self, date: str) -> Optional[float]:
+        """정책에 따른 일반 항목 유지 시간 (초, 영구면 inf, 정책이 없거나 정하지 못하면 None)"""
+        return self.policy.ttl(date) if self.policy is not None else None
     
     def set(self, data_type: str, symbol: str, date: str, data: Any, **kwargs):
         """캐시에 데이터 저장"""
-        cache_key = self._get_cache_key(data_type, symbol, date, **kwargs)
-        cache_path = self._get_cache_path(cache_key)
-        
-        cache_data = {
-            'timestamp': datetime.now().isoformat(),
-            'data': data
+        self._write(data_type, symbol, date, kwargs, (time.time(), data, None, self._ttl(date)))
+    
+    def set_negative(self, data_type: str, symbol: str, date: str, reason: str, ttl_hours: float = None, **kwargs):
+        """
+        데이터가 없다는 사실을 사유와 함께 저장 (음수 캐시)
+        :param reason: NEGATIVE_TTL_HOURS의 사유 코드 ("empty", "insufficient", "no_bar", "error")
+        :param ttl_hours: 유지 시간 (없으면 사유별 기본값)
+        """
+        if ttl_hours is None:
+            ttl_hours = NEGATIVE_TTL_HOURS.get(reason, 1)
+        self._write(data_type, symbol, date, kwargs, (time.time(), None, reason, ttl_hours * 3600))
+    
+    def _write_many(self, data_type: str, date: str, kwargs: dict, entries: Dict[str, tuple]):
+        """여러 종목 항목을 메모리와 디스크에 함께 저장 (디스크는 한 번에)"""
+        self._ensure_evictor()
+        rows = []
+        for symbol, entry in entries.items():
+            if self.memory is not None:
+                self.memory.put(self._memory_key(data_type, symbol, date, kwargs), (entry[0], _copy_value(entry[1]), entry[2], entry[3]))
+            rows.append((self._get_cache_key(data_type, symbol, date, **kwargs), entry, data_type, symbol))
+        if rows:
+            self.backend.put_many(rows)
+    
+    def set_many(self, data_type: str, values: Dict[str, Any], date: str, **kwargs):
+        """여러 종목 데이터를 한 번에 저장 (종목 → 데이터)"""
+        now, ttl = time.time(), self._ttl(date)
+        self._write_many(data_type, date, kwargs, {symbol: (now, data, None, ttl) for symbol, data in values.items()})
+    
+    def set_negative_many(self, data_type: str, reasons: Dict[str, str], date: str, **kwargs):
+        """여러 종목의 음수 항목을 한 번에 저장 (종목 → 사유)"""
+        now = time.time()
+        self._write_many(data_type, date, kwargs, {
+            symbol: (now, None, reason, NEGATIVE_TTL_HOURS.get(reason, 1) * 3600)
+            for symbol, reason in reasons.items()
+        })
+    
+    def invalidate(self, symbol: str, data_type: str = None) -> int:
+        """
+        종목의 캐시를 모두 삭제 (수정주가 반영 등으로 과거 값이 바뀐 경우, 영구 항목 포함)
+        :param data_type: 지정하면 그 종류만 삭제
+        :return: 디스크에서 삭제한 항목 수
+        """
+        if self.memory is not None:
+            self.memory.remove_if(lambda key: key[1] == symbol and (data_type is None or key[0] == data_type))
+        return self.backend.delete_symbol(symbol, data_type)
+    
+    def _ensure_evictor(self):
+        """용량 한도가 있으면 프로세스마다 백그라운드 정리 스레드를 하나 띄움 (fork된 자식에서도 다시 띄움)"""
+        if self.max_bytes is None or self._evictor_pid == os.getpid():
+            return
+        with self._evictor_lock:
+            if self._evictor_pid == os.getpid():
+                return
+            # fork된 자식은 부모가 잡고 있던 잠금을 물려받을 수 있으므로 새로 만듦
+            self._accessed_lock = threading.Lock()
+            self._accessed = {}
+            self._evictor = threading.Thread(target=self._evict_loop, name="cache-evictor", daemon=True)
+            self._evictor.start()
+            self._evictor_pid = os.getpid()
+    
+    def _evict_loop(self):
+        while True:
+            time.sleep(self.evict_interval)
+            try:
+                self.run_eviction()
+            except Exception as e:
+                print(f"캐시 정리 실패: {e}")
+    
+    def flush_access(self):
+        """모아 둔 접근 시각을 디스크 캐시 목록에 한 번에 반영"""
+        # 요청 스레드가 기록하는 중에 순회하지 않도록 잠금 안에서 통째로 바꿔 치움
+        with self._accessed_lock:
+            accessed, self._accessed = self._accessed, {}
+        if not accessed:
+            return
+        keys, times = [], []
+        for (data_type, symbol, date, params), at in accessed.items():
+            keys.append(self._get_cache_key(data_type, symbol, date, **dict(params)))
+            times.append(at)
+        self.backend.touch_many(keys, times)
+    
+    def run_eviction(self, max_age_hours: int = 24) -> int:
+        """
+        접근 기록 반영 → 만료 항목 삭제 → 용량 한도를 넘으면 오래 안 쓴 항목부터 삭제 (백그라운드 작업이 주기적으로 호출)
+        :return: 삭제한 항목 수
+        """
+        self.flush_access()
+        removed = self.backend.purge_expired(max_age_hours)
+        if self.max_bytes is not None:
+            removed += self.backend.evict(self.max_bytes)
+        if removed:
+            CACHE_EVICTED.inc(amount=removed)
+        return removed
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 현황 (프로세스 시작 이후 누적)
+        :return: {"memory_entries", "disk_bytes", "disk_entries", "types": 종류 → 적중/미적중/만료/음수 적중/쓴 바이트/적중률/디스크 읽기 지연}
+        """
+        types: Dict[str, Dict[str, Any]] = {}
+
+        def counters(data_type: str) -> Dict[str, Any]:
+            return types.setdefault(data_type, {
+                "hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0,
+                "expired": 0, "negative_hits": 0, "bytes_written": 0
+            })
+
+        for (data_type, tier), count in CACHE_HITS.samples().items():
+            counters(data_type)["hits"] += count
+            counters(data_type)[f"{tier}_hits"] += count
+        for metric, field in ((CACHE_MISSES, "misses"), (CACHE_EXPIRED, "expired"),
+                              (CACHE_NEGATIVE_HITS, "negative_hits"), (CACHE_BYTES_WRITTEN, "bytes_written")):
+            for (data_type,), count in metric.samples().items():
+                counters(data_type)[field] += count
+        for (data_type, op), sample in CACHE_READ_SECONDS.samples().items():
+            reads = counters(data_type).setdefault("disk_reads", {})
+            reads[op] = {"count": sample["count"], "avg_ms": round(sample["sum"] / sample["count"] * 1000, 3)}
+
+        for item in types.values():
+            lookups = item["hits"] + item["negative_hits"] + item["misses"]
+            item["hit_rate"] = round((item["hits"] + item["negative_hits"]) / lookups, 4) if lookups else None
+
+        disk_bytes, disk_entries = self.backend.usage()
+        return {
+            "memory_entries": len(self.memory) if self.memory is not None else 0,
+            "disk_bytes": disk_bytes,
+            "disk_entries": disk_entries,
+            "types": types
         }
-        
-        try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"캐시 저장 실패: {e}")
     
     def clear_expired(self, max_age_hours: int = 24):
-        """만료된 캐시 파일들 삭제"""
-        if not os.path.exists(self.cache_dir):
-            return
-        
-        current_time = datetime.now()
-        for filename in os.listdir(self.cache_dir):
-            if filename.endswith('.json'):
-                file_path = os.path.join(self.cache_dir, filename)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                    
-                    cached_time = datetime.fromisoformat(cache_data['timestamp'])
-                    if current_time - cached_time > timedelta(hours=max_age_hours):
-                        os.remove(file_path)
-                        print(f"만료된 캐시 삭제: {filename}")
-                
-                except Exception:
-                    # 손상된 캐시 파일 삭제
-                    try:
-                        os.remove(file_path)
-                    except:
-                        pass 
\ No newline at end of file
+        """만료된 캐시 삭제 (메모리 단계는 조회할 때 만료를 확인하므로 디스크만 정리)"""
+        removed = self.backend.purge_expired(max_age_hours)
+        if removed:
+            print(f"만료된 캐시 {removed}개 삭제")
+
+
+# 프로세스 공용 캐시 (모든 에이전트와 api/yfinance_api가 같은 메모리 LRU를 공유)
+cache_manager = CacheManager(
+    memory_entries=int(os.getenv("CACHE_MEMORY_ENTRIES", "10000")),
+    policy=FreshnessPolicy(krx_calendar),
+    max_bytes=int(float(os.getenv("CACHE_MAX_MB", "512")) * 1024 * 1024) or None,
+    evict_interval=float(os.getenv("CACHE_EVICT_INTERVAL", "60"))
+)
+metrics.gauge("cache_memory_entries", "Entries in the in-process memory tier",
+              lambda: len(cache_manager.memory) if cache_manager.memory is not None else 0)
+metrics.gauge("cache_disk_bytes", "Bytes stored in the disk tier", lambda: cache_manager.backend.usage()[0])
+metrics.gauge("cache_disk_entries", "Entries stored in the disk tier", lambda: cache_manager.backend.usage()[1])
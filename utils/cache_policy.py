@@ -0,0 +1,63 @@
+import math
+from datetime import date, datetime, time
+from typing import Optional
+
+from core.trading_calendar import KST
+
+SESSION_OPEN = time(9, 0)     # 정규장 시작
+SESSION_CLOSE = time(15, 30)  # 정규장 마감
+SETTLE_TIME = time(18, 0)     # 시간외 단일가 종료 (이후 당일 일봉 확정)
+
+
+class FreshnessPolicy:
+    """
+    캐시 항목이 설명하는 날짜로 유지 시간을 정하는 정책.
+    값은 지정일(휴장일이면 다음 거래일) 봉으로 계산되므로 그 봉이 확정된 뒤에 만든 항목은 바뀌지 않는다.
+    - 확정된 과거 거래일: 영구 보관 (math.inf)
+    - 당일 장 시작 전: 장 시작까지
+    - 당일 장중: intraday_ttl초
+    - 당일 장 마감 후 확정 전: 확정 시각까지
+    수정주가 반영처럼 과거 값이 바뀌는 경우는 CacheManager.invalidate로 명시적으로 지운다.
+    """
+
+    def __init__(self, calendar, intraday_ttl: float = 300):
+        """
+        :param calendar: 거래일 달력 (core.trading_calendar.TradingCalendar)
+        :param intraday_ttl: 장중 항목 유지 시간 (초)
+        """
+        self.calendar = calendar
+        self.intraday_ttl = intraday_ttl
+
+    def ttl(self, date_str: str, now: datetime = None) -> Optional[float]:
+        """
+        지금 저장하는 date_str 항목의 유지 시간 (초).
+        :return: 영구면 math.inf, 날짜로 해석할 수 없으면 None (조회하는 쪽의 max_age_hours 적용)
+        """
+        try:
+            target = date.fromisoformat(str(date_str)[:10])
+        except ValueError:
+            return None
+
+        bar_day = self.calendar.next_trading_day(target)
+        if bar_day is None:
+            return None
+
+        now = now or datetime.now(KST)
+        today = now.date()
+        if bar_day < today:
+            return math.inf
+        if bar_day > today:
+            return self._seconds_until(now, bar_day, SESSION_OPEN)
+
+        moment = now.time()
+        if moment < SESSION_OPEN:
+            return self._seconds_until(now, today, SESSION_OPEN)
+        if moment < SESSION_CLOSE:
+            return self.intraday_ttl
+        if moment < SETTLE_TIME:
+            return self._seconds_until(now, today, SETTLE_TIME)
+        return math.inf
+
+    @staticmethod
+    def _seconds_until(now: datetime, day: date, moment: time) -> float:
+        return max((datetime.combine(day, moment, tzinfo=KST) - now).total_seconds(), 1.0)
@@ -0,0 +1,183 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+
+# 지연 시간 히스토그램 기본 구간 (초): 캐시 조회(수십 µs)부터 외부 다운로드(수 초)까지
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _format_labels(names: Tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{str(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """레이블별 누적 카운터 (레이블 값은 labelnames 순서의 위치 인자로 전달)"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Dict[tuple, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in sorted(self.samples().items())]
+
+
+class Histogram:
+    """레이블별 누적 구간 히스토그램 (Prometheus histogram 형식)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 레이블 → [구간별 개수..., +Inf 개수], 합계
+        self._counts: Dict[tuple, List[int]] = {}
+        self._sums: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(labels)
+            if counts is None:
+                counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+                self._sums[labels] = 0.0
+            counts[index] += 1
+            self._sums[labels] += value
+
+    @contextmanager
+    def time(self, *labels):
+        """with 블록 실행 시간을 기록 (예외가 나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def samples(self) -> Dict[tuple, dict]:
+        """레이블 → {count, sum, buckets: {상한: 누적 개수}}"""
+        with self._lock:
+            items = [(labels, list(counts), self._sums[labels]) for labels, counts in self._counts.items()]
+        result = {}
+        for labels, counts, total in items:
+            cumulative, running = {}, 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                running += count
+                cumulative[bound] = running
+            result[labels] = {"count": running, "sum": total, "buckets": cumulative}
+        return result
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, sample in sorted(self.samples().items()):
+            for bound, count in sample["buckets"].items():
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {sample['sum']!r}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {sample['count']}")
+        return lines
+
+
+class Gauge:
+    """읽을 때마다 함수를 호출해 값을 구하는 게이지 (디스크 사용량 등)"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, fn: Callable[[], float]):
+        self.name = name
+        self.help = help_text
+        self.fn = fn
+
+    def samples(self) -> Dict[tuple, float]:
+        try:
+            return {(): self.fn()}
+        except Exception:
+            return {}
+
+    def render(self) -> List[str]:
+        return [f"{self.name} {_format_value(value)}" for value in self.samples().values()]
+
+
+class MetricsRegistry:
+    """프로세스 공용 지표 모음 (/stats JSON과 /metrics Prometheus 텍스트로 내보냄)"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            # 같은 이름은 한 번만 등록 (모듈을 다시 불러와도 기존 지표 유지)
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def gauge(self, name: str, help_text: str, fn: Callable[[], float]) -> Gauge:
+        with self._lock:
+            # 게이지는 마지막에 등록한 함수를 사용
+            gauge = self._metrics[name] = Gauge(name, help_text, fn)
+        return gauge
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def snapshot(self) -> dict:
+        """지표 이름 → 레이블 문자열 → 값 (히스토그램은 count/sum/buckets)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        result = {}
+        for metric in metrics:
+            samples = {}
+            for labels, value in metric.samples().items():
+                key = ",".join(f"{name}={label}" for name, label in zip(getattr(metric, "labelnames", ()), labels))
+                if isinstance(value, dict):
+                    value = {**value, "buckets": {_format_value(bound): count for bound, count in value["buckets"].items()}}
+                samples[key or "total"] = value
+            result[metric.name] = samples
+        return result
+
+    def render_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식 (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 전역 지표 모음
+metrics = MetricsRegistry()
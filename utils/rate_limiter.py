@@ -0,0 +1,103 @@
+import asyncio
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 공급자가 요청 제한에 걸렸을 때 돌려주는 메시지 패턴
+THROTTLE_PATTERNS = ("too many requests", "rate limit", "ratelimit", "429")
+
+
+def is_throttle_error(error) -> bool:
+    """요청 제한(429) 계열 오류인지 판단"""
+    if error is None:
+        return False
+    if type(error).__name__ == "YFRateLimitError":
+        return True
+    message = str(error).lower()
+    return any(pattern in message for pattern in THROTTLE_PATTERNS)
+
+
+class RateLimiter:
+    """
+    프로세스 공용 토큰 버킷 레이트 리미터.
+    초당 rate개의 토큰이 쌓이고 최대 burst개까지 모아둘 수 있다.
+    스레드에서는 acquire(), 코루틴에서는 await acquire_async()로 사용한다.
+    공급자가 요청 제한 오류를 돌려주면 report_throttled()로 지수 백오프를 건다.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 50, max_backoff: float = 60.0):
+        """
+        :param rate: 초당 허용 요청 수
+        :param burst: 한 번에 몰아서 보낼 수 있는 최대 요청 수
+        :param max_backoff: 요청 제한 시 최대 대기 시간 (초)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_backoff = max_backoff
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._backoff = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int = 1) -> float:
+        """토큰 tokens개를 예약하고 사용 가능해질 때까지 기다려야 할 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # 토큰을 미리 빼두고(음수 허용) 부족분만큼 대기 → 대기 순서대로 공정하게 배분
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self, tokens: int = 1):
+        """
+        토큰을 얻을 때까지 현재 스레드를 대기
+        :param tokens: 이번 호출이 실제로 보내는 요청 수
+        """
+        wait = self._reserve(max(1, tokens))
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 1):
+        """토큰을 얻을 때까지 이벤트 루프를 막지 않고 대기"""
+        wait = self._reserve(max(1, tokens))
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def split(self, parts: int):
+        """
+        여러 프로세스가 같은 한도를 나눠 쓰도록 이 인스턴스의 몫을 1/parts로 줄임
+        (각 프로세스에서 한 번씩 호출하면 전체 요청 속도가 원래 한도를 넘지 않음)
+        """
+        if parts <= 1:
+            return
+        with self._lock:
+            self.rate = self.rate / parts
+            self.burst = max(1, self.burst // parts)
+            self._tokens = min(self._tokens, float(self.burst))
+
+    def report_throttled(self):
+        """요청 제한 응답을 받았을 때 호출 → 백오프 시간을 두 배씩 늘리며 전체 요청을 멈춤"""
+        with self._lock:
+            self._backoff = min(self.max_backoff, self._backoff * 2 if self._backoff else 1.0)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + self._backoff)
+
+    def report_success(self):
+        """정상 응답을 받으면 백오프 초기화"""
+        if self._backoff:
+            with self._lock:
+                self._backoff = 0.0
+
+
+# Yahoo Finance 호출 전역 리미터 (환경변수로 조정).
+# 종목별 요청마다 토큰 하나를 쓰므로 기본 버스트는 다종목 요청 한 묶음(50종목)을 바로 보낼 수 있는 크기
+yf_rate_limiter = RateLimiter(
+    rate=float(os.getenv("YF_RATE_LIMIT_RPS", "10")),
+    burst=int(os.getenv("YF_RATE_LIMIT_BURST", "50"))
+)
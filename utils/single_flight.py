@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """실행 중인 호출 하나 (리더가 결과를 채우고 나머지는 기다림)"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    같은 키의 호출이 동시에 여러 번 들어오면 하나만 실제로 실행하고 나머지는 그 결과를 함께 받는 중복 제거기.
+    스레드에서는 do(), 코루틴에서는 await do_async()로 사용한다.
+    실행이 끝나면 키를 지우므로 결과를 캐시하지 않는다 (동시에 겹친 호출만 합침).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[tuple, asyncio.Future] = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """key로 실행 중인 호출이 있으면 끝날 때까지 기다려 같은 결과(또는 예외)를 받고, 없으면 직접 실행"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    async def do_async(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """
+        do()의 코루틴 버전 (fn은 코루틴 함수).
+        공유 작업은 별도 태스크로 실행하므로 기다리던 호출 하나가 취소돼도 나머지는 계속 결과를 받는다.
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = self._tasks[task_key] = loop.create_task(fn(*args, **kwargs))
+                task.add_done_callback(lambda done: self._forget(task_key, done))
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        return await asyncio.shield(task)
+
+    def _forget(self, task_key: tuple, task: asyncio.Future):
+        with self._lock:
+            if self._tasks.get(task_key) is task:
+                del self._tasks[task_key]
+        # 기다리는 쪽이 모두 취소된 경우에도 예외가 회수되지 않았다는 경고가 남지 않도록 확인
+        if not task.cancelled():
+            task.exception()